@@ -1,7 +1,16 @@
+import os
+import uuid
 import streamlit as st
 from news_fetcher import NewsFetcher
+from news_sources import NewsAggregator, sources_from_env
 from llm_summarizer import LLMSummarizer
-from fake_news_detector import FakeNewsDetector
+from detector_registry import detector_from_env
+from news_pipeline import NewsPipeline
+from chat_history import ChatHistory
+from conversation_state import ConversationState
+from semantic_index import SemanticIndex
+from warmup import warm_up_in_background
+from story_tracker import StoryTracker
 from datetime import datetime
 
 # Page configuration
@@ -50,13 +59,57 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_semantic_index():
+    """One local article index per server process, shared by all sessions"""
+    return SemanticIndex()
+
+@st.cache_resource
+def get_news_aggregator():
+    """NewsAPI plus any RSS_FEEDS / LOCAL_FEED_PATH sources, shared by all sessions"""
+    return NewsAggregator(sources_from_env(NewsFetcher()))
+
+@st.cache_resource
+def get_fake_detector():
+    """One fake news model (or cascade) per server process; concurrent sessions share its batches"""
+    return detector_from_env()
+
+@st.cache_resource
+def get_story_tracker():
+    """One watchlist and polling worker per server process, shared by all sessions"""
+    tracker = StoryTracker(max_requests_per_day=int(os.getenv('TRACKER_MAX_REQUESTS_PER_DAY', 24)))
+    tracker.start(get_news_aggregator(), poll_interval=float(os.getenv('TRACKER_POLL_SECONDS', 900)))
+    return tracker
+
 # Initialize session state
 if 'news_fetcher' not in st.session_state:
-    st.session_state.news_fetcher = NewsFetcher()
+    st.session_state.news_fetcher = get_news_aggregator()
     st.session_state.summarizer = LLMSummarizer()
-    st.session_state.fake_detector = FakeNewsDetector()
-    st.session_state.chat_history = []
+    st.session_state.fake_detector = get_fake_detector()
+    st.session_state.pipeline = NewsPipeline(
+        st.session_state.news_fetcher,
+        st.session_state.summarizer,
+        st.session_state.fake_detector,
+        semantic_index=get_semantic_index(),
+        story_tracker=get_story_tracker()
+    )
+    st.session_state.user_id = str(uuid.uuid4())
+    st.session_state.story_alerts = []
+    # Keeps the latest messages in memory and moves older ones to disk
+    st.session_state.chat_history = ChatHistory(max_messages=100)
     st.session_state.current_articles = []
+    # Theme and screened articles of the current topic, reused by follow-up questions
+    st.session_state.conversation = ConversationState()
+    
+    # Clients and models load on first use; warm them up while the user reads the page
+    if os.getenv('WARM_UP_ON_START', 'true').lower() != 'false':
+        warm_up_in_background(
+            st.session_state.news_fetcher,
+            st.session_state.summarizer,
+            st.session_state.fake_detector,
+            st.session_state.pipeline.quality_filter,
+            get_semantic_index()
+        )
 
 # Title
 st.markdown('<h1 class="main-header">🤖 AI News Chatbot</h1>', unsafe_allow_html=True)
@@ -84,18 +137,82 @@ with st.sidebar:
         help="Select the region for news search"
     )
     
+    # End-to-end latency budget per chat turn
+    time_budget = st.slider("Response time budget (seconds)", 5, 60, 15,
+                            help="Slow stages fall back to faster, simpler results when the budget runs out")
+    
+    # Answer mode
+    answer_mode = st.radio(
+        "Answer mode",
+        ["llm", "extractive"],
+        format_func=lambda x: {
+            "llm": "🤖 AI answer (Groq)",
+            "extractive": "⚡ Fast local summary"
+        }[x],
+        help="The fast mode quotes the most relevant article sentences without calling the LLM"
+    )
+    
+    # Offline retrieval from previously fetched articles
+    offline = st.checkbox(
+        "📚 Search saved articles only",
+        help=f"Answer from the {len(get_semantic_index())} articles already fetched, without calling NewsAPI"
+    )
+    
+    st.markdown("---")
+    
+    # Followed topics and alerts
+    st.subheader("🔔 Followed Topics")
+    tracker = get_story_tracker()
+    # Watches of sessions that stop rerunning (closed or refreshed tabs) expire
+    tracker.touch(st.session_state.user_id)
+    
+    new_topic = st.text_input("Follow a topic", placeholder="e.g., Tesla stock",
+                              label_visibility="collapsed")
+    if st.button("➕ Follow", use_container_width=True) and new_topic:
+        if tracker.follow(st.session_state.user_id, new_topic) is None:
+            st.warning("Please enter a more specific topic.")
+    
+    for watch in tracker.watchlist.for_user(st.session_state.user_id):
+        topic_col, remove_col = st.columns([4, 1])
+        topic_col.markdown(f"• {watch['topic']}")
+        if remove_col.button("✖", key=f"unfollow_{watch['id']}"):
+            tracker.unfollow(watch['id'])
+            st.rerun()
+    
+    st.session_state.story_alerts = (
+        tracker.notifications.drain(st.session_state.user_id)[::-1] + st.session_state.story_alerts
+    )[:20]
+    if st.session_state.story_alerts:
+        with st.expander(f"📬 {len(st.session_state.story_alerts)} new stories on your topics"):
+            for alert in st.session_state.story_alerts:
+                article = alert['article']
+                st.markdown(f"**{alert['topic']}** · [{article['title']}]({article.get('url', '')})")
+                st.caption(f"{article['source']} · {alert['matched_at'].strftime('%I:%M %p')}")
+    
+    # Per-source health
+    sources = get_news_aggregator().stats()
+    if len(sources) > 1:
+        with st.expander(f"📡 {len(sources)} news sources"):
+            for name, stats in sources.items():
+                latency = f"{stats['avg_seconds'] * 1000:.0f} ms avg" if stats['avg_seconds'] is not None else "not used yet"
+                st.caption(f"**{name}** · {stats['articles']} articles · {latency} · "
+                           f"{stats['errors']} errors · {stats['timeouts']} timeouts · {stats['busy']} busy")
+    
     st.markdown("---")
     
     # Chat history management
     st.subheader("💬 Chat Management")
     
     if st.button("🗑️ Clear Chat History", use_container_width=True):
-        st.session_state.chat_history = []
+        st.session_state.chat_history.clear()
         st.session_state.current_articles = []
+        st.session_state.conversation.clear()
         st.rerun()
     
     if st.session_state.chat_history:
         st.info(f"💬 {len(st.session_state.chat_history)} messages in history")
+        if st.session_state.chat_history.spilled_count:
+            st.caption(f"🗄️ {st.session_state.chat_history.spilled_count} older messages archived to disk")
     
     st.markdown("---")
     
@@ -136,6 +253,22 @@ with chat_container:
                 # Show fake news filtering info
                 if msg.get('fake_filtered', 0) > 0:
                     st.info(f"🛡️ Filtered out {msg['fake_filtered']} fake news article(s)")
+                low_quality = msg.get('low_quality_filtered')
+                if low_quality:
+                    st.caption("🧹 Skipped " + ", ".join(f"{count} {reason.replace('_', ' ')}"
+                                                          for reason, count in low_quality.items())
+                               + " article(s)")
+                follow_up = msg.get('follow_up')
+                if follow_up:
+                    st.caption(f"↪️ Follow-up: reused {follow_up['reused_articles']} article(s), "
+                               f"fetched {follow_up['new_articles']} new")
+                
+                # Show stages that fell back to a degraded result
+                degradations = msg.get('metadata', {}).get('degradations')
+                if degradations:
+                    st.warning("⏱️ Answered within the time budget using fallbacks: " + "; ".join(
+                        f"{d['stage']} ({d['reason']})" for d in degradations
+                    ))
                 
                 # Show articles used
                 if 'articles' in msg and msg['articles']:
@@ -205,55 +338,35 @@ if send_button and user_input:
         'timestamp': datetime.now()
     })
     
-    # Show processing status
-    with st.spinner("🔍 Extracting theme..."):
-        # Extract theme from query
-        theme = st.session_state.summarizer.extract_theme(user_input)
-        st.toast(f"Searching for: {theme}", icon="🔍")
-    
-    with st.spinner("📰 Fetching news articles..."):
-        # Fetch news based on theme
-        articles = st.session_state.news_fetcher.search_news(
-            query=theme,
-            page_size=num_articles * 2  # Fetch more to account for filtering
+    with st.spinner("🔍 Searching the news and generating an answer..."):
+        result = st.session_state.pipeline.run(
+            user_input,
+            num_articles=num_articles,
+            country=country,
+            budget_seconds=time_budget,
+            mode=answer_mode,
+            offline=offline,
+            conversation=st.session_state.conversation
         )
-        
-        if not articles:
-            # Try getting top headlines if search fails
-            articles = st.session_state.news_fetcher.get_top_headlines(
-                query=theme,
-                country=country,
-                page_size=num_articles * 2
-            )
-        
-        st.toast(f"Found {len(articles)} articles", icon="📰")
     
-    with st.spinner("🛡️ Filtering fake news..."):
-        # Filter out fake news
-        real_articles, fake_count, _ = st.session_state.fake_detector.filter_fake_articles(articles)
-        
-        if fake_count > 0:
-            st.toast(f"🚫 Filtered out {fake_count} fake news articles", icon="🛡️")
-        
-        # Limit to requested number
-        real_articles = real_articles[:num_articles]
-        
-        if not real_articles:
-            st.error("❌ No reliable news articles found after filtering. Try a different topic.")
-            st.stop()
+    if result['fake_filtered'] > 0:
+        st.toast(f"🚫 Filtered out {result['fake_filtered']} fake news articles", icon="🛡️")
     
-    with st.spinner("🤖 Analyzing news and generating answer..."):
-        # Generate AI response using only real news
-        answer = st.session_state.summarizer.answer_from_news(user_input, real_articles)
-        
-        # Add assistant response to chat
-        st.session_state.chat_history.append({
-            'role': 'assistant',
-            'content': answer,
-            'articles': real_articles,
-            'timestamp': datetime.now(),
-            'fake_filtered': fake_count
-        })
+    if not result['articles']:
+        st.error("❌ No reliable news articles found after filtering. Try a different topic.")
+        st.stop()
+    
+    # Add assistant response to chat
+    st.session_state.chat_history.append({
+        'role': 'assistant',
+        'content': result['answer'],
+        'articles': result['articles'],
+        'timestamp': datetime.now(),
+        'fake_filtered': result['fake_filtered'],
+        'low_quality_filtered': result['low_quality_filtered'],
+        'follow_up': result['follow_up'],
+        'metadata': result['metadata']
+    })
     
     st.rerun()
 
@@ -0,0 +1,56 @@
+"""
+Nightly news archive: stream every article for a search into a JSON Lines file
+Pages are fetched one ahead of the writer and written as they arrive, so memory
+use stays flat however many results there are. The output can be read back with
+news_sources.JSONLSource (LOCAL_FEED_PATH).
+
+Usage:
+    python archive_news.py "climate change" [--out archive.jsonl] [--max-results 1000] [--max-requests 10]
+    python archive_news.py --headlines --category technology
+"""
+
+import argparse
+import json
+import sys
+import time
+from news_fetcher import NewsFetcher
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('query', nargs='?', help="Search query (optional with --headlines)")
+    parser.add_argument('--headlines', action='store_true', help="Archive top headlines instead of a search")
+    parser.add_argument('--category', help="Headline category")
+    parser.add_argument('--country', default='us', help="Headline country (default: us)")
+    parser.add_argument('--out', default='news_archive.jsonl', help="Output file, appended to")
+    parser.add_argument('--max-results', type=int, help="Stop after this many articles")
+    parser.add_argument('--max-requests', type=int, help="Stop after this many API requests")
+    args = parser.parse_args()
+
+    if not args.query and not args.headlines:
+        parser.error("a query is required unless --headlines is given")
+
+    fetcher = NewsFetcher()
+    limits = dict(max_results=args.max_results, max_requests=args.max_requests, raise_errors=True)
+    if args.headlines:
+        stream = fetcher.iter_top_headlines(query=args.query, category=args.category,
+                                            country=args.country, **limits)
+    else:
+        stream = fetcher.iter_search_news(args.query, **limits)
+
+    started = time.perf_counter()
+    count = 0
+    try:
+        with open(args.out, 'a', encoding='utf-8') as f:
+            for article in stream:
+                f.write(json.dumps(article.to_dict(), ensure_ascii=False) + "\n")
+                count += 1
+    except Exception as e:
+        print(f"❌ Archive stopped after {count} articles: {e}")
+        sys.exit(1)
+
+    print(f"✅ Archived {count} articles to {args.out} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
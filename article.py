@@ -0,0 +1,81 @@
+import sys
+
+
+class Article:
+    """
+    Compact news article record
+
+    Uses __slots__ instead of a per-instance dict and interns source names, which
+    repeat across almost every fetch. Supports the dict-style access
+    (article['title'], article.get('url')) the rest of the app already uses.
+    """
+
+    FIELDS = ('title', 'description', 'content', 'source', 'author', 'url',
+              'publishedAt', 'urlToImage')
+    __slots__ = FIELDS
+
+    def __init__(self, title=None, description=None, content=None, source=None, author=None,
+                 url=None, publishedAt=None, urlToImage=None):
+        self.title = title
+        self.description = description
+        self.content = content
+        self.source = sys.intern(source) if isinstance(source, str) else source
+        self.author = author
+        self.url = url
+        self.publishedAt = publishedAt
+        self.urlToImage = urlToImage
+
+    @classmethod
+    def from_newsapi(cls, article):
+        """Normalize a raw NewsAPI-style article (source is a {'name': ...} dict)"""
+        return cls(
+            title=article.get('title', 'No title'),
+            description=article.get('description', 'No description'),
+            content=article.get('content', 'No content'),
+            source=(article.get('source') or {}).get('name', 'Unknown'),
+            author=article.get('author', 'Unknown'),
+            url=article.get('url', ''),
+            publishedAt=article.get('publishedAt', ''),
+            urlToImage=article.get('urlToImage', '')
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build an article from a dict with the _format_articles keys"""
+        return cls(**{field: data.get(field) for field in cls.FIELDS})
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    @property
+    def key(self):
+        """Identity used to store the article once: its URL, or source + title"""
+        return self.url or f"{self.source}|{self.title}"
+
+    def __getitem__(self, field):
+        if field not in self.FIELDS:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def get(self, field, default=None):
+        if field not in self.FIELDS:
+            return default
+        return getattr(self, field)
+
+    def __contains__(self, field):
+        return field in self.FIELDS
+
+    def keys(self):
+        return self.FIELDS
+
+    def __eq__(self, other):
+        if isinstance(other, Article):
+            return all(getattr(self, f) == getattr(other, f) for f in self.FIELDS)
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Article(title={self.title!r}, source={self.source!r}, url={self.url!r})"
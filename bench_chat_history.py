@@ -0,0 +1,109 @@
+"""
+Benchmark: chat history memory over long sessions
+Simulates a 500-turn session where each answer cites freshly fetched articles
+(follow-up questions often return the same stories) and compares the memory held
+by the old list-of-dicts history with ChatHistory.
+
+Usage:
+    python bench_chat_history.py [--turns 500] [--articles 5]
+"""
+
+import argparse
+import json
+import random
+import shutil
+import tempfile
+import tracemalloc
+from datetime import datetime
+from chat_history import ChatHistory
+from news_fetcher import NewsFetcher
+
+SOURCES = ["Reuters", "Associated Press", "BBC News", "The Verge", "CNN", "Bloomberg"]
+
+
+def raw_article(i):
+    """A NewsAPI-style article, serialized like an HTTP response body"""
+    return json.dumps({
+        'source': {'id': None, 'name': SOURCES[i % len(SOURCES)]},
+        'author': f"Reporter {i % 40}",
+        'title': f"Story {i}: officials respond to developing situation in region {i % 17}",
+        'description': f"Officials said on Tuesday that story {i} is still developing. " * 3,
+        'url': f"https://news.example.com/2024/story-{i}",
+        'urlToImage': f"https://cdn.example.com/images/story-{i}-large.jpg",
+        'publishedAt': "2024-05-01T12:00:00Z",
+        'content': f"Story {i} full text excerpt with several sentences of detail. " * 4 + "[+3120 chars]"
+    })
+
+
+def legacy_format(article):
+    """The dict record _format_articles produced before Article existed"""
+    return {
+        'title': article.get('title', 'No title'),
+        'description': article.get('description', 'No description'),
+        'content': article.get('content', 'No content'),
+        'source': article.get('source', {}).get('name', 'Unknown'),
+        'author': article.get('author', 'Unknown'),
+        'url': article.get('url', ''),
+        'publishedAt': article.get('publishedAt', ''),
+        'urlToImage': article.get('urlToImage', '')
+    }
+
+
+def simulate(history, turns, per_turn, formatter, seed=7):
+    """Fill a history the way app.py does; articles are re-parsed every turn"""
+    rng = random.Random(seed)
+    story = 0
+    for turn in range(turns):
+        # Half the turns are follow-ups that hit the same stories again
+        if rng.random() < 0.5:
+            story += per_turn
+        ids = [story + rng.randrange(per_turn * 2) for _ in range(per_turn)]
+        articles = [formatter(json.loads(raw_article(i))) for i in ids]
+        history.append({'role': 'user', 'content': f"Question {turn}", 'timestamp': datetime.now()})
+        history.append({'role': 'assistant', 'content': "Answer text " * 40, 'articles': articles,
+                        'timestamp': datetime.now(), 'fake_filtered': 0})
+    return history
+
+
+def measure(make_history, turns, per_turn, formatter):
+    tracemalloc.start()
+    history = simulate(make_history(), turns, per_turn, formatter)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return history, current, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--turns', type=int, default=500)
+    parser.add_argument('--articles', type=int, default=5)
+    args = parser.parse_args()
+
+    fetcher = NewsFetcher()
+    spill_dir = tempfile.mkdtemp(prefix='bench_history_')
+    try:
+        cases = [
+            ("list of dicts (old)", list, legacy_format),
+            ("ChatHistory, uncapped", lambda: ChatHistory(max_messages=10 ** 9),
+             lambda a: fetcher._format_articles([a])[0]),
+            ("ChatHistory, 100 msgs + spill", lambda: ChatHistory(max_messages=100, spill_dir=spill_dir),
+             lambda a: fetcher._format_articles([a])[0]),
+        ]
+
+        print(f"🧠 Chat history memory: {args.turns} turns, {args.articles} articles per answer")
+        print("=" * 72)
+        print(f"{'history':<32}{'retained KiB':>14}{'peak KiB':>12}{'articles':>12}")
+        print("-" * 72)
+        for name, make_history, formatter in cases:
+            history, current, peak = measure(make_history, args.turns, args.articles, formatter)
+            if isinstance(history, ChatHistory):
+                articles = history.article_count()
+            else:
+                articles = sum(len(m.get('articles', [])) for m in history)
+            print(f"{name:<32}{current / 1024:>14.0f}{peak / 1024:>12.0f}{articles:>12}")
+    finally:
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
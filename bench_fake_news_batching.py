@@ -0,0 +1,108 @@
+"""
+Benchmark: fake-news scoring throughput with many concurrent callers
+Each thread stands in for a session scoring one article at a time. Compares a
+direct model call per article with the micro-batcher merging concurrent calls.
+
+Uses the shipped model in 'fake news/' when it loads, otherwise a TF-IDF +
+logistic regression model trained on synthetic headlines. The score cache is
+disabled so every call reaches the model.
+
+Usage:
+    python bench_fake_news_batching.py [--threads 1 8 32] [--requests 200] [--max-wait-ms 5]
+"""
+
+import argparse
+import random
+import threading
+import time
+from fake_news_detector import FakeNewsDetector
+from micro_batcher import MicroBatcher
+
+WORDS = ("government officials confirm budget report study scientists shocking miracle cure secret "
+         "insiders reveal election market rates bank climate weather storm vaccine aliens trick "
+         "doctors hate unbelievable leaked video court ruling minister announces").split()
+
+
+def headlines(count, rng):
+    return [" ".join(rng.choices(WORDS, k=rng.randint(8, 20))) for _ in range(count)]
+
+
+def make_detector(rng):
+    detector = FakeNewsDetector(use_cache=False)
+    try:
+        detector.warm_up()
+        detector._predict(["model check"])
+        return detector, "shipped model"
+    except Exception:
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.linear_model import LogisticRegression
+        texts = headlines(2000, rng)
+        labels = [int(any(w in t.split() for w in ("shocking", "miracle", "aliens"))) for t in texts]
+        detector.vectorizer = TfidfVectorizer(ngram_range=(1, 2)).fit(texts)
+        detector.model = LogisticRegression(max_iter=500).fit(detector.vectorizer.transform(texts), labels)
+        return detector, "synthetic TF-IDF + logistic regression"
+
+
+def run(detector, threads, per_thread, texts):
+    """Each thread scores per_thread articles one by one; returns (seconds, latencies)"""
+    latencies = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(offset):
+        own = []
+        barrier.wait()
+        for i in range(per_thread):
+            started = time.perf_counter()
+            detector.score_many([texts[(offset + i) % len(texts)]])
+            own.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(own)
+
+    pool = [threading.Thread(target=worker, args=(n * per_thread,)) for n in range(threads)]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    return time.perf_counter() - started, sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--requests', type=int, default=200, help="Articles scored per thread")
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    detector, label = make_detector(rng)
+    texts = headlines(5000, rng)
+
+    print(f"🧪 Fake-news scoring under concurrency ({label}, {args.requests} articles per thread)")
+    print("=" * 92)
+    print(f"{'threads':>7}  {'mode':<9}{'articles/s':>12}{'p50 ms':>9}{'p95 ms':>9}"
+          f"{'avg batch':>11}{'max batch':>11}{'avg queue':>11}{'speedup':>10}")
+    print("-" * 92)
+    for threads in args.threads:
+        detector.batcher = None
+        seconds, latencies = run(detector, threads, args.requests, texts)
+        direct = threads * args.requests / seconds
+        print(f"{threads:>7}  {'direct':<9}{direct:>12.0f}{latencies[len(latencies) // 2] * 1000:>9.2f}"
+              f"{latencies[int(len(latencies) * 0.95)] * 1000:>9.2f}{1:>11.1f}{1:>11}{'-':>11}{'1.0x':>10}")
+
+        detector.batcher = MicroBatcher(lambda batch: detector._predict(batch),
+                                        args.max_batch_size, args.max_wait_ms)
+        seconds, latencies = run(detector, threads, args.requests, texts)
+        stats = detector.batcher.stats()
+        detector.batcher.close()
+        batched = threads * args.requests / seconds
+        print(f"{threads:>7}  {'batched':<9}{batched:>12.0f}{latencies[len(latencies) // 2] * 1000:>9.2f}"
+              f"{latencies[int(len(latencies) * 0.95)] * 1000:>9.2f}{stats['avg_batch_size']:>11.1f}"
+              f"{stats['max_batch_size']:>11}{stats['avg_queue_depth']:>11.1f}{batched / direct:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Benchmark: cascade of fake-news models vs the single TF-IDF model path
+Trains a cheap hashing-vectorizer model and a richer TF-IDF model on synthetic
+headlines into a temporary registry, then scores the same articles with the
+TF-IDF model alone and with the cascade (hashing first, TF-IDF for the rest).
+
+Reports throughput against the shipped model that filter_fake_articles() uses
+today (tfidf:legacy, the pickles in 'fake news/'), the share of articles the
+cheap model settles, and how often the cascade's filter decision matches the
+TF-IDF model's. The score cache is disabled so every article reaches a model.
+
+The synthetic models stand in for a hashing model trained on real articles with
+train_fake_news_model.py; the legacy row is the baseline the speedups refer to.
+
+Usage:
+    python bench_fake_news_cascade.py [--articles 20000] [--batch 50] [--low 0.2 --high 0.8]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from detector_registry import CascadeDetector, DetectorRegistry, ShadowDetector
+
+REAL = ("officials confirm budget report study scientists publish election results market rates "
+        "bank climate weather storm court ruling minister announces hospital council").split()
+FAKE = ("shocking miracle cure secret insiders reveal aliens trick doctors hate unbelievable "
+        "leaked video exposed hoax banned truth").split()
+
+
+def headlines(count, rng):
+    """Synthetic headlines; fake ones mix in a few sensational words"""
+    texts, labels = [], []
+    for _ in range(count):
+        label = rng.random() < 0.3
+        words = rng.choices(REAL, k=rng.randint(8, 16))
+        if label:
+            words += rng.choices(FAKE, k=rng.randint(1, 4))
+        elif rng.random() < 0.1:
+            words += rng.choices(FAKE, k=1)
+        rng.shuffle(words)
+        texts.append(" ".join(words))
+        labels.append(int(label))
+    return texts, labels
+
+
+def train(registry, rng):
+    from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import FeatureUnion
+
+    texts, labels = headlines(5000, rng)
+    cheap = HashingVectorizer(n_features=2 ** 16, alternate_sign=False, norm='l2')
+    registry.save("hashing", "v1", LogisticRegression(max_iter=500).fit(cheap.transform(texts), labels), cheap)
+
+    rich = FeatureUnion([('words', TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True)),
+                         ('chars', TfidfVectorizer(analyzer='char_wb', ngram_range=(2, 5), sublinear_tf=True))])
+    vectors = rich.fit_transform(texts)
+    registry.save("tfidf", "v1", LogisticRegression(max_iter=1000).fit(vectors, labels), rich)
+
+
+def throughput(detector, texts, batch):
+    started = time.perf_counter()
+    scores = []
+    for start in range(0, len(texts), batch):
+        scores.extend(detector.score_many(texts[start:start + batch]))
+    return len(texts) / (time.perf_counter() - started), scores
+
+
+def legacy_baseline(registry, texts, batch):
+    """Throughput of the shipped model, or None with the reason it can't load"""
+    legacy = registry.get("tfidf:legacy")
+    try:
+        legacy.warm_up()
+        legacy._predict([legacy.preprocess_text(texts[0])])
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+    return throughput(legacy, texts, batch)[0], None
+
+
+def decisions(detector, scores):
+    return [bool(s and s[0] and s[1] >= detector.threshold) for s in scores]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--articles', type=int, default=20000)
+    parser.add_argument('--batch', type=int, default=50, help="Articles per score_many call (one chat turn)")
+    parser.add_argument('--low', type=float, default=0.2, help="Cheap model settles 'real' at or below")
+    parser.add_argument('--high', type=float, default=0.8, help="Cheap model settles 'fake' at or above")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    registry = DetectorRegistry(tempfile.mkdtemp(), detector_options={'use_cache': False})
+    train(registry, rng)
+    texts, labels = headlines(args.articles, rng)
+
+    tfidf, cheap = registry.get("tfidf"), registry.get("hashing")
+    tfidf.warm_up()
+    cheap.warm_up()
+    cascade = CascadeDetector([(cheap, args.low, args.high), (tfidf, None, None)])
+
+    legacy_rate, legacy_error = legacy_baseline(registry, texts, args.batch)
+    single_rate, single_scores = throughput(tfidf, texts, args.batch)
+    baseline = legacy_rate or single_rate
+    cheap_rate, cheap_scores = throughput(cheap, texts, args.batch)
+    cascade_rate, cascade_scores = throughput(cascade, texts, args.batch)
+
+    reference = decisions(tfidf, single_scores)
+    cheap_decisions = decisions(cheap, cheap_scores)
+    cascade_decisions = decisions(cascade, cascade_scores)
+
+    def agreement(scored):
+        return sum(a == b for a, b in zip(reference, scored)) / len(texts)
+
+    def accuracy(scored):
+        return sum(d == bool(label) for d, label in zip(scored, labels)) / len(texts)
+
+    print(f"🧪 Fake-news model cascade ({args.articles} synthetic articles, {args.batch} per call)")
+    print("=" * 72)
+    print(f"{'path':<28}{'articles/s':>12}{'speedup':>10}{'accuracy':>11}{'agrees':>11}")
+    print("-" * 72)
+    if legacy_rate:
+        print(f"{'tfidf:legacy (current path)':<28}{legacy_rate:>12.0f}{'1.0x':>10}{'':>11}{'':>11}")
+    print(f"{'tfidf (synthetic)':<28}{single_rate:>12.0f}{single_rate / baseline:>9.1f}x"
+          f"{accuracy(reference):>11.1%}{'-':>11}")
+    print(f"{'hashing only':<28}{cheap_rate:>12.0f}{cheap_rate / baseline:>9.1f}x"
+          f"{accuracy(cheap_decisions):>11.1%}{agreement(cheap_decisions):>11.1%}")
+    print(f"{'cascade hashing -> tfidf':<28}{cascade_rate:>12.0f}{cascade_rate / baseline:>9.1f}x"
+          f"{accuracy(cascade_decisions):>11.1%}{agreement(cascade_decisions):>11.1%}")
+    if legacy_rate:
+        print("\nℹ️ tfidf:legacy was trained on real articles, so its accuracy on the synthetic labels is not shown")
+    if legacy_error:
+        print(f"\n⚠️ tfidf:legacy could not be loaded ({legacy_error}); speedups are against synthetic tfidf")
+
+    print("\n🔀 Cascade stages")
+    for stage in cascade.stats():
+        print(f"  {stage['model']:<14} settled {stage['settled']:>7} ({stage['share']:.1%})  {stage['seconds']:.2f}s")
+
+    shadow = ShadowDetector(tfidf, cheap)
+    throughput(shadow, texts[:5000], args.batch)
+    shadow.flush()
+    stats = shadow.stats()
+    print(f"\n👥 Shadow scoring hashing against tfidf: {stats['agreement']:.1%} agreement over "
+          f"{stats['compared']} articles (tfidf-only fake {stats['primary_only_fake']}, "
+          f"hashing-only fake {stats['candidate_only_fake']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark: article quality pre-filter throughput
+Builds a mixed stream from the fixture articles plus the junk NewsAPI returns in
+practice ("[Removed]" entries, missing descriptions, one-line snippets, paywall
+boilerplate, other languages) and filters it in batches of several sizes.
+
+Usage:
+    python bench_quality_filter.py [--articles 50000] [--batches 50 1000 50000]
+"""
+
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+from quality_filter import LANGUAGE_SAMPLES, QualityFilter
+
+FIXTURES = Path(__file__).parent / "fixtures" / "news_topics.json"
+
+
+def make_stream(count, rng):
+    topics = json.loads(FIXTURES.read_text())
+    good = [article for topic in topics for article in topic['articles']]
+    foreign = [sentence for language, text in LANGUAGE_SAMPLES.items() if language != 'en'
+               for sentence in text.split(". ")]
+    junk = [
+        lambda: {'title': '[Removed]', 'description': '[Removed]', 'url': 'https://removed.com'},
+        lambda: {'title': rng.choice(good)['title'], 'description': 'No description'},
+        lambda: {'title': rng.choice(good)['title'],
+                 'description': 'Subscribe now to continue reading. Sign up for our newsletter.'},
+        lambda: {'title': rng.choice(foreign)[:50], 'description': rng.choice(foreign)},
+    ]
+    stream = []
+    for i in range(count):
+        if rng.random() < 0.25:
+            stream.append(rng.choice(junk)())
+        else:
+            article = dict(rng.choice(good))
+            article['url'] = f"{article.get('url', 'https://example.com/')}?v={i}"
+            stream.append(article)
+    return stream
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--articles', type=int, default=50000)
+    parser.add_argument('--batches', type=int, nargs='+', default=[50, 1000, 50000])
+    args = parser.parse_args()
+
+    stream = make_stream(args.articles, random.Random(0))
+
+    print(f"🧹 Quality pre-filter ({args.articles} articles, ~25% junk)")
+    print("=" * 60)
+    print(f"{'batch size':>10}{'articles/s':>14}{'µs/article':>14}{'dropped':>12}")
+    print("-" * 60)
+    quality = None
+    for batch in args.batches:
+        quality = QualityFilter()
+        quality.warm_up()
+        started = time.perf_counter()
+        dropped = 0
+        for start in range(0, len(stream), batch):
+            dropped += len(quality.filter(stream[start:start + batch])[1])
+        seconds = time.perf_counter() - started
+        print(f"{batch:>10}{len(stream) / seconds:>14.0f}{seconds / len(stream) * 1e6:>14.1f}{dropped:>12}")
+
+    print("\n📊 Drops by reason (last run)")
+    for reason, count in quality.stats().items():
+        print(f"  {reason:<12}{count:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark: cold start and time-to-first-interaction
+Each scenario runs in a fresh interpreter so nothing is cached in sys.modules.
+
+Scenarios:
+    lazy        import the app modules and construct every component the way
+                app.py does (aggregator, registry detector, story tracker, ...)
+                before its first screen is usable
+    eager       the same, then load everything synchronously (the old startup path)
+    background  lazy startup plus warm-up in a background thread; reports when the
+                first screen is usable and when the warm-up finished
+
+Usage:
+    python bench_startup.py [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+CHILD = r"""
+import json, os, sys, time
+started = time.perf_counter()
+# Same imports and construction as app.py, minus streamlit itself
+from news_fetcher import NewsFetcher
+from news_sources import NewsAggregator, sources_from_env
+from llm_summarizer import LLMSummarizer
+from detector_registry import detector_from_env
+from news_pipeline import NewsPipeline
+from chat_history import ChatHistory
+from conversation_state import ConversationState
+from semantic_index import SemanticIndex
+from warmup import warm_up_in_background
+from story_tracker import StoryTracker
+
+aggregator = NewsAggregator(sources_from_env(NewsFetcher()))
+index = SemanticIndex()
+tracker = StoryTracker(max_requests_per_day=int(os.getenv('TRACKER_MAX_REQUESTS_PER_DAY', 24)))
+tracker.start(aggregator, poll_interval=float(os.getenv('TRACKER_POLL_SECONDS', 900)))
+summarizer = LLMSummarizer()
+detector = detector_from_env()
+pipeline = NewsPipeline(aggregator, summarizer, detector, semantic_index=index, story_tracker=tracker)
+ChatHistory(max_messages=100)
+ConversationState()
+components = [aggregator, summarizer, detector, pipeline.quality_filter, index]
+scenario = sys.argv[1]
+if scenario == 'eager':
+    for component in components:
+        component.warm_up()
+thread = warm_up_in_background(*components) if scenario == 'background' else None
+ready = time.perf_counter() - started
+if thread is not None:
+    thread.join()
+warm = time.perf_counter() - started
+print(json.dumps({'ready': ready, 'warm': warm,
+                  'heavy': sorted(m for m in ('groq', 'sklearn', 'requests') if m in sys.modules)}))
+"""
+
+
+def run(scenario, env):
+    started = time.perf_counter()
+    output = subprocess.run([sys.executable, "-W", "ignore", "-c", CHILD, scenario], env=env,
+                            capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+    wall = time.perf_counter() - started
+    result = json.loads(output.strip().splitlines()[-1])
+    result['wall'] = wall
+    return result
+
+
+def import_time(module, env):
+    """Seconds to import one module in a fresh interpreter"""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    output = subprocess.run([sys.executable, "-W", "ignore", "-c", code], env=env,
+                            capture_output=True, text=True)
+    return float(output.stdout.strip()) if output.returncode == 0 else None
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp()
+    env = dict(os.environ, GROQ_API_KEY=os.getenv('GROQ_API_KEY', 'benchmark-key'),
+               WARM_UP_ON_START='false', SEMANTIC_INDEX_DIR=os.path.join(scratch, "index"),
+               FAKE_NEWS_CACHE_PATH=os.path.join(scratch, "scores.sqlite3"))
+
+    print(f"🚀 Startup benchmark (median of {args.runs} runs, fresh interpreter each)")
+    print("=" * 78)
+    print(f"{'scenario':<12}{'first screen ms':>17}{'fully warm ms':>15}{'process ms':>13}  heavy modules loaded")
+    print("-" * 78)
+    for scenario in ('lazy', 'eager', 'background'):
+        results = [run(scenario, env) for _ in range(args.runs)]
+        ready = median(r['ready'] for r in results) * 1000
+        warm = median(r['warm'] for r in results) * 1000
+        wall = median(r['wall'] for r in results) * 1000
+        heavy = ", ".join(results[-1]['heavy']) or "none"
+        print(f"{scenario:<12}{ready:>17.0f}{warm:>15.0f}{wall:>13.0f}  {heavy}")
+
+    print("\n📦 Import cost of the dependencies that are now deferred")
+    print("-" * 78)
+    for module in ('requests', 'groq', 'sklearn.feature_extraction.text', 'streamlit'):
+        seconds = import_time(module, env)
+        print(f"{module:<36}{'not importable' if seconds is None else f'{seconds * 1000:.0f} ms':>16}")
+
+
+if __name__ == "__main__":
+    main()
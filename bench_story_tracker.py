@@ -0,0 +1,75 @@
+"""
+Benchmark: story tracking throughput on one core
+Matches a synthetic article stream against thousands of watched topics with the
+anchored inverted index, and against a naive scan over every watch.
+
+Usage:
+    python bench_story_tracker.py [--watches 5000] [--articles 20000]
+"""
+
+import argparse
+import random
+import time
+from story_tracker import StoryTracker, normalize_terms
+
+
+def vocabulary(size, rng):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choices(letters, k=rng.randint(4, 9))) for _ in range(size)]
+
+
+def make_articles(count, words, rng):
+    # Zipf-like word frequencies, like real headlines
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    return [{
+        'title': " ".join(rng.choices(words, weights, k=10)),
+        'description': " ".join(rng.choices(words, weights, k=30)),
+        'url': f"https://news.example.com/{i}",
+        'source': "Example"
+    } for i in range(count)]
+
+
+def naive_matches(watches, articles):
+    matches = 0
+    for article in articles:
+        terms = normalize_terms(f"{article['title']} {article['description']}")
+        matches += sum(1 for watch in watches if watch <= terms)
+    return matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--watches', type=int, default=5000)
+    parser.add_argument('--articles', type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    words = vocabulary(20000, rng)
+    articles = make_articles(args.articles, words, rng)
+
+    tracker = StoryTracker()
+    for i in range(args.watches):
+        tracker.follow(f"user{i % 500}", " ".join(rng.sample(words[:5000], rng.randint(1, 3))))
+
+    started = time.perf_counter()
+    queued = tracker.process(articles)
+    indexed = time.perf_counter() - started
+
+    watches = [w['terms'] for w in tracker.watchlist.watches.values()]
+    sample = articles[:max(1, args.articles // 20)]
+    started = time.perf_counter()
+    naive = naive_matches(watches, sample)
+    naive_rate = len(sample) / (time.perf_counter() - started)
+    indexed_sample = sum(len(tracker.watchlist.match(normalize_terms(f"{a['title']} {a['description']}")))
+                         for a in sample)
+    assert indexed_sample == naive, "inverted index and naive scan disagree"
+
+    print(f"🔔 Story tracker: {args.watches} watches, {args.articles} articles, one core")
+    print("=" * 64)
+    print(f"{'inverted index':<20}{args.articles / indexed:>12.0f} articles/s{queued:>10} alerts")
+    print(f"{'naive scan':<20}{naive_rate:>12.0f} articles/s{naive:>10} alerts (first {len(sample)}, same as index)")
+    print(f"{'speed-up':<20}{(args.articles / indexed) / naive_rate:>12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: local extractive summarizer vs LLM summaries
+Reports latency and unigram/bigram overlap (ROUGE-1/ROUGE-2 F1) against the
+reference LLM summaries in fixtures/news_topics.json.
+
+Usage:
+    python bench_summarizers.py            # extractive methods vs stored references
+    python bench_summarizers.py --live     # also time live Groq summaries (needs GROQ_API_KEY)
+"""
+
+import argparse
+import json
+import re
+import time
+from collections import Counter
+from pathlib import Path
+from extractive_summarizer import ExtractiveSummarizer
+
+FIXTURES = Path(__file__).parent / "fixtures" / "news_topics.json"
+
+
+def ngrams(text, n):
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    return Counter(tuple(words[i:i + n]) for i in range(len(words) - n + 1))
+
+
+def overlap_f1(candidate, reference, n=1):
+    """ROUGE-N style F1 between two texts"""
+    cand, ref = ngrams(candidate, n), ngrams(reference, n)
+    matches = sum((cand & ref).values())
+    if not matches:
+        return 0.0
+    precision = matches / sum(cand.values())
+    recall = matches / sum(ref.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def time_call(func, repeats):
+    """Median wall time of func() in milliseconds, plus its last result"""
+    timings = []
+    result = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2], result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeats', type=int, default=20)
+    parser.add_argument('--live', action='store_true', help="Also call the Groq LLM")
+    args = parser.parse_args()
+
+    topics = json.loads(FIXTURES.read_text())
+    summarizers = {method: ExtractiveSummarizer(method=method) for method in ExtractiveSummarizer.METHODS}
+
+    llm = None
+    if args.live:
+        from llm_summarizer import LLMSummarizer
+        llm = LLMSummarizer()
+
+    print("📊 Summarizer benchmark")
+    print("=" * 72)
+    print(f"{'topic':<20}{'method':<12}{'median ms':>10}{'ROUGE-1':>10}{'ROUGE-2':>10}")
+    print("-" * 72)
+
+    totals = {}
+    for topic in topics:
+        articles = topic['articles']
+        references = {'reference': topic['reference_summary']}
+
+        if llm is not None:
+            ms, summary = time_call(lambda: llm.summarize_articles(articles, mode='llm'), 1)
+            references['live'] = summary
+            print(f"{topic['topic']:<20}{'llm':<12}{ms:>10.1f}{'':>10}{'':>10}")
+
+        for method, summarizer in summarizers.items():
+            ms, summary = time_call(lambda: summarizer.summarize_articles(articles), args.repeats)
+            for name, reference in references.items():
+                r1 = overlap_f1(summary, reference, 1)
+                r2 = overlap_f1(summary, reference, 2)
+                label = method if name == 'reference' else f"{method}*"
+                print(f"{topic['topic']:<20}{label:<12}{ms:>10.2f}{r1:>10.3f}{r2:>10.3f}")
+                if name == 'reference':
+                    stats = totals.setdefault(method, [0.0, 0.0, 0.0])
+                    stats[0] += ms
+                    stats[1] += r1
+                    stats[2] += r2
+
+    print("-" * 72)
+    for method, (ms, r1, r2) in totals.items():
+        n = len(topics)
+        print(f"{'average':<20}{method:<12}{ms / n:>10.2f}{r1 / n:>10.3f}{r2 / n:>10.3f}")
+    if llm is not None:
+        print("* overlap against the live LLM summary instead of the stored reference")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+import json
+import os
+import tempfile
+import time
+import weakref
+from collections import deque
+from datetime import datetime
+from article import Article
+
+# Spill files of every session live here, so abandoned ones can be found and removed
+SPILL_DIR = os.path.join(tempfile.gettempdir(), 'news_agent_chat_history')
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def remove_stale_spills(spill_dir=SPILL_DIR, max_age=86400):
+    """
+    Delete spill files not written to for max_age seconds (sessions that are gone)
+
+    Returns:
+        int: Number of files removed
+    """
+    removed = 0
+    cutoff = time.time() - max_age
+    try:
+        entries = list(os.scandir(spill_dir))
+    except OSError:
+        return 0
+    for entry in entries:
+        if not (entry.name.startswith('chat_history_') and entry.name.endswith('.jsonl')):
+            continue
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+class ChatHistory:
+    """
+    Bounded chat history for one session
+
+    Articles are stored once, keyed by URL, and messages reference them by key.
+    Only the most recent `max_messages` stay in memory; older messages are
+    appended to a JSONL spill file on disk (or dropped if spilling is disabled).
+    The file is removed when the history is cleared or garbage collected, and
+    files left behind by sessions that ended without either expire after
+    max_spill_age.
+    """
+
+    def __init__(self, max_messages=100, spill_to_disk=True, spill_dir=None, max_spill_age=86400):
+        """
+        Args:
+            max_messages (int): Messages kept in memory
+            spill_to_disk (bool): Write evicted messages to disk instead of dropping them
+            spill_dir (str): Directory for the spill file (default: SPILL_DIR)
+            max_spill_age (float): Seconds after its last write before any spill
+                file in spill_dir is treated as abandoned and deleted
+        """
+        self.max_messages = max_messages
+        self.spill_to_disk = spill_to_disk
+        self.spill_dir = spill_dir or SPILL_DIR
+        self.max_spill_age = max_spill_age
+        self.spill_path = None
+        self._cleanup = None
+        self._messages = deque()
+        self._articles = {}
+        self._refcounts = {}
+        self._spilled = 0
+
+    def append(self, message):
+        """
+        Add a message; its 'articles' list is stored by reference
+
+        Args:
+            message (dict): role, content, timestamp and optionally articles
+        """
+        stored = {key: value for key, value in message.items() if key != 'articles'}
+        if 'articles' in message:
+            stored['article_ids'] = [self._store_article(a) for a in message['articles']]
+        self._messages.append(stored)
+
+        while len(self._messages) > self.max_messages:
+            self._evict(self._messages.popleft())
+
+    def _store_article(self, article):
+        if not isinstance(article, Article):
+            article = Article.from_dict(article)
+        key = article.key
+        if key not in self._articles:
+            self._articles[key] = article
+            self._refcounts[key] = 0
+        self._refcounts[key] += 1
+        return key
+
+    def _evict(self, message):
+        if self.spill_to_disk:
+            self._spill(message)
+        for key in message.get('article_ids', ()):
+            self._refcounts[key] -= 1
+            if not self._refcounts[key]:
+                del self._refcounts[key]
+                del self._articles[key]
+
+    def _spill(self, message):
+        if self.spill_path is None:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            remove_stale_spills(self.spill_dir, self.max_spill_age)
+            fd, self.spill_path = tempfile.mkstemp(prefix='chat_history_', suffix='.jsonl',
+                                                   dir=self.spill_dir)
+            os.close(fd)
+            self._cleanup = weakref.finalize(self, _remove_file, self.spill_path)
+        record = self._resolve(message)
+        if isinstance(record.get('timestamp'), datetime):
+            record['timestamp'] = record['timestamp'].isoformat()
+        if 'articles' in record:
+            record['articles'] = [article.to_dict() for article in record['articles']]
+        with open(self.spill_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, default=str) + "\n")
+        self._spilled += 1
+
+    def _resolve(self, message):
+        resolved = {key: value for key, value in message.items() if key != 'article_ids'}
+        if 'article_ids' in message:
+            resolved['articles'] = [self._articles[key] for key in message['article_ids']]
+        return resolved
+
+    def __iter__(self):
+        """Iterate in-memory messages with their articles resolved"""
+        for message in list(self._messages):
+            yield self._resolve(message)
+
+    def __len__(self):
+        """Total number of messages, including those spilled to disk"""
+        return len(self._messages) + self._spilled
+
+    def __bool__(self):
+        return len(self) > 0
+
+    @property
+    def spilled_count(self):
+        return self._spilled
+
+    def load_spilled(self):
+        """
+        Read messages that were moved to disk, oldest first
+
+        Returns:
+            list: Messages with datetime timestamps and Article records
+        """
+        if not self.spill_path or not os.path.exists(self.spill_path):
+            return []
+        messages = []
+        with open(self.spill_path, encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                if record.get('timestamp'):
+                    record['timestamp'] = datetime.fromisoformat(record['timestamp'])
+                if 'articles' in record:
+                    record['articles'] = [Article.from_dict(a) for a in record['articles']]
+                messages.append(record)
+        return messages
+
+    def article_count(self):
+        """Number of distinct articles held in memory"""
+        return len(self._articles)
+
+    def clear(self):
+        """Forget all messages and remove the spill file"""
+        self._messages.clear()
+        self._articles.clear()
+        self._refcounts.clear()
+        self._spilled = 0
+        if self._cleanup is not None:
+            self._cleanup()
+            self._cleanup = None
+        self.spill_path = None
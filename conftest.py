@@ -0,0 +1,37 @@
+"""
+Shared pytest fixtures
+Tiny labelled corpus and model-call spy used by the fake-news detector tests
+"""
+
+import pytest
+
+TRAIN = [
+    ("officials confirm new budget figures in parliament", 0),
+    ("central bank raises interest rates by a quarter point", 0),
+    ("scientists publish peer reviewed climate study", 0),
+    ("shocking miracle cure doctors hate revealed", 1),
+    ("aliens secretly control the government insiders say", 1),
+    ("you won t believe this one weird trick", 1),
+]
+
+
+@pytest.fixture
+def labelled_headlines():
+    """(text, label) pairs, 1 marking fake news"""
+    return list(TRAIN)
+
+
+@pytest.fixture
+def predict_spy():
+    """
+    Wraps a detector's _predict to record every batch sent to the model
+
+    Returns:
+        function: spy(detector) -> list that collects each batch of texts
+    """
+    def spy(detector):
+        calls = []
+        predict = detector._predict
+        detector._predict = lambda texts: calls.append(list(texts)) or predict(texts)
+        return calls
+    return spy
@@ -0,0 +1,139 @@
+import re
+import time
+from llm_summarizer import STOPWORDS
+from story_tracker import normalize_terms
+
+# Openers that continue the previous question rather than start a new one
+FOLLOW_UP_OPENERS = re.compile(
+    r"(?:and|but|so|also|what about|how about|what else|why|how come|tell me more|more on|"
+    r"more about|any more|anything else|elaborate|explain|details?|what happened next|in)\b",
+    re.IGNORECASE)
+
+# Pronouns that point back at something already discussed ("is it safe?")
+REFERENCES = re.compile(r"\b(?:it|its|they|them|their|he|she|his|her)\b", re.IGNORECASE)
+
+# Question and filler words that say nothing about the topic: the summarizer's
+# keyword stopwords ('today', 'current', 'show', ...) plus conversational ones
+QUESTION_WORDS = STOPWORDS | {
+    'why', 'when', 'where', 'who', 'which', 'more', 'else', 'did', 'think', 'explain', 'elaborate',
+    'detail', 'mean', 'so', 'but', 'also', 'they', 'them', 'their', 'these', 'those', 'he', 'she',
+    'his', 'her', 'we', 'could', 'would', 'should', 'happened', 'next', 'now', 'then', 'again',
+    'know', 'say', 'said', 'being', 'been', 'have', 'had', 'get', 'got', 'still', 'really', 'up',
+    'down', 'yesterday', 'tonight', 'right'
+}
+
+
+def query_terms(text):
+    """Topic words of a question in the order they appear, without question words"""
+    terms = (term for word in text.split() for term in normalize_terms(word))
+    return [term for term in dict.fromkeys(terms) if term not in QUESTION_WORDS]
+
+
+def article_key(article):
+    return article.get('url') or f"{article.get('source')}|{article.get('title')}"
+
+
+class ConversationState:
+    """
+    What the previous chat turns already found, so follow-ups can reuse it
+
+    Keeps the theme, the screened articles and the last answer. A question that
+    only uses words the conversation already covers is a follow-up when it opens
+    like one ("why?", "tell me more") or refers to the topic. A question with new
+    words ("bitcoin", "super bowl") must also name the current topic, or point
+    back with a pronoun and add a single word ("is it safe?"); otherwise it starts
+    a new topic, however it opens. The new words are the aspect to fetch.
+    """
+
+    def __init__(self, max_articles=30, max_age=900, max_new_terms=2):
+        """
+        Args:
+            max_articles (int): Articles kept across turns, newest first
+            max_age (float): Seconds after which the stored articles are not reused
+            max_new_terms (int): Most unseen words a follow-up may add
+        """
+        self.max_articles = max_articles
+        self.max_age = max_age
+        self.max_new_terms = max_new_terms
+        self.clear()
+
+    def clear(self):
+        self.theme = None
+        self.articles = []
+        self.answer = None
+        self.queries = []
+        self.topic_terms = set()
+        self.vocabulary = set()
+        self.updated_at = None
+
+    def follow_up(self, user_query):
+        """
+        Decide locally whether a question continues the conversation
+
+        Args:
+            user_query (str): The new question
+
+        Returns:
+            dict: theme (previous theme plus the new aspect) and new_terms, or
+                  None if the question starts a new topic or the context is stale
+        """
+        if not self.articles or self.updated_at is None or time.time() - self.updated_at > self.max_age:
+            return None
+
+        user_query = user_query.strip()
+        terms = query_terms(user_query)
+        new_terms = [term for term in terms if term not in self.vocabulary]
+        if len(new_terms) > self.max_new_terms:
+            return None
+
+        known = set(terms) & self.vocabulary
+        on_topic = bool(known & self.topic_terms)
+        refers_back = REFERENCES.search(user_query) is not None
+        if new_terms:
+            # New content words need the topic named, or a pronoun plus one word
+            if not (on_topic or (refers_back and len(new_terms) == 1)):
+                return None
+        elif not (FOLLOW_UP_OPENERS.match(user_query) or refers_back or on_topic or len(known) >= 2):
+            return None
+
+        theme = " ".join([self.theme] + new_terms) if new_terms else self.theme
+        return {'theme': theme, 'new_terms': new_terms}
+
+    def rank(self, user_query, articles):
+        """
+        Order articles by how many of the question's words they mention
+
+        Ties keep their order, so callers list fresh articles first.
+        """
+        terms = set(query_terms(user_query))
+        if not terms:
+            return list(articles)
+
+        def overlap(article):
+            return len(terms & normalize_terms(f"{article.get('title') or ''} {article.get('description') or ''}"))
+
+        return sorted(articles, key=overlap, reverse=True)
+
+    def update(self, user_query, theme, articles, answer):
+        """Remember a finished turn; its articles go in front of the older ones"""
+        merged = []
+        seen = set()
+        for article in list(articles) + self.articles:
+            key = article_key(article)
+            if key not in seen:
+                seen.add(key)
+                merged.append(article)
+        self.articles = merged[:self.max_articles]
+        self.theme = theme
+        self.answer = answer
+        self.queries = (self.queries + [user_query])[-5:]
+        self.updated_at = time.time()
+
+        self.topic_terms = normalize_terms(" ".join([theme or ''] + self.queries)) - QUESTION_WORDS
+        vocabulary = set(self.topic_terms)
+        for article in self.articles:
+            vocabulary |= normalize_terms(f"{article.get('title') or ''} {article.get('description') or ''}")
+        self.vocabulary = vocabulary - QUESTION_WORDS
+
+    def known_keys(self):
+        return {article_key(article) for article in self.articles}
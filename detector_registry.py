@@ -0,0 +1,301 @@
+import json
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from fake_news_detector import ArticleScorer, FakeNewsDetector
+
+# The model that shipped before the registry existed
+LEGACY_NAME = 'tfidf'
+LEGACY_VERSION = 'legacy'
+
+
+def _version_key(version):
+    """Sort versions naturally, so v10 comes after v9"""
+    digits = ''.join(c for c in version if c.isdigit())
+    return (int(digits) if digits else -1, version)
+
+
+class DetectorRegistry:
+    """
+    Versioned fake-news models on disk
+
+    Layout: <root>/<name>/<version>/{model.pkl, vector.pkl, meta.json}, where
+    meta.json may set the model's filter "threshold". The original model in
+    'fake news/' is always available as tfidf:legacy. Detectors are loaded once
+    and shared; their pickles still load lazily on first use.
+    """
+
+    def __init__(self, root=None, detector_options=None):
+        """
+        Args:
+            root (str): Models directory (default: FAKE_NEWS_MODELS_DIR or 'fake news/models')
+            detector_options (dict): Extra FakeNewsDetector arguments (e.g. batching=True)
+        """
+        self.root = Path(root or os.getenv('FAKE_NEWS_MODELS_DIR') or Path(__file__).parent / "fake news" / "models")
+        self.detector_options = detector_options or {}
+        self._detectors = {}
+        self._lock = threading.Lock()
+
+    def names(self):
+        names = {LEGACY_NAME}
+        if self.root.is_dir():
+            names.update(p.name for p in self.root.iterdir() if p.is_dir())
+        return sorted(names)
+
+    def versions(self, name):
+        """Versions of a model, oldest first"""
+        directory = self.root / name
+        versions = []
+        if directory.is_dir():
+            versions = [p.name for p in directory.iterdir()
+                        if (p / "model.pkl").exists() and (p / "vector.pkl").exists()]
+        if name == LEGACY_NAME:
+            versions.append(LEGACY_VERSION)
+        return sorted(versions, key=_version_key)
+
+    def get(self, spec):
+        """
+        Load a model by "name" (latest version) or "name:version"
+
+        Returns:
+            FakeNewsDetector: Shared detector for that version
+        """
+        name, _, version = spec.partition(':')
+        if not version:
+            versions = [v for v in self.versions(name) if v != LEGACY_VERSION] or self.versions(name)
+            if not versions:
+                raise KeyError(f"No fake-news model named '{name}' in {self.root}")
+            version = versions[-1]
+
+        with self._lock:
+            key = (name, version)
+            if key not in self._detectors:
+                if (name, version) == (LEGACY_NAME, LEGACY_VERSION):
+                    detector = FakeNewsDetector(**self.detector_options)
+                else:
+                    model_dir = self.root / name / version
+                    if not model_dir.is_dir():
+                        raise KeyError(f"No fake-news model '{name}:{version}' in {self.root}")
+                    meta_path = model_dir / "meta.json"
+                    meta = json.loads(meta_path.read_text()) if meta_path.exists() else {}
+                    detector = FakeNewsDetector(model_dir=model_dir, threshold=meta.get('threshold'),
+                                                **self.detector_options)
+                detector.name = f"{name}:{version}"
+                self._detectors[key] = detector
+            return self._detectors[key]
+
+    def save(self, name, version, model, vectorizer, threshold=None, **meta):
+        """
+        Store a trained model and vectorizer as a new version
+
+        Returns:
+            Path: The version directory
+        """
+        model_dir = self.root / name / version
+        model_dir.mkdir(parents=True, exist_ok=True)
+        with open(model_dir / "model.pkl", 'wb') as f:
+            pickle.dump(model, f)
+        with open(model_dir / "vector.pkl", 'wb') as f:
+            pickle.dump(vectorizer, f)
+        if threshold is not None:
+            meta['threshold'] = threshold
+        (model_dir / "meta.json").write_text(json.dumps(meta, indent=2))
+        return model_dir
+
+
+class CascadeDetector(ArticleScorer):
+    """
+    Runs models cheapest first; each settles the articles it is sure about
+
+    An article leaves the cascade at the first stage whose fake confidence is at
+    or below that stage's `low` (real) or at or above its `high` (fake). Only the
+    uncertain rest is scored by the next, more expensive model; the last model
+    decides whatever is left.
+    """
+
+    def __init__(self, stages, threshold=None):
+        """
+        Args:
+            stages (list): (detector, low, high) tuples, cheapest first; the last
+                stage's bounds are ignored
+            threshold (float): Filter threshold (default: the last model's)
+        """
+        if not stages:
+            raise ValueError("A cascade needs at least one model")
+        self.stages = [tuple(stage) for stage in stages]
+        self.threshold = threshold if threshold is not None else self.stages[-1][0].threshold
+        self.name = " -> ".join(getattr(stage[0], 'name', type(stage[0]).__name__) for stage in self.stages)
+        self._stats_lock = threading.Lock()
+        self._settled = [0] * len(self.stages)
+        self._seconds = [0.0] * len(self.stages)
+
+    def warm_up(self):
+        for detector, _, _ in self.stages:
+            detector.warm_up()
+
+    def score_many(self, texts):
+        results = [None] * len(texts)
+        pending = list(range(len(texts)))
+        for position, (detector, low, high) in enumerate(self.stages):
+            if not pending:
+                break
+            last = position == len(self.stages) - 1
+            started = time.monotonic()
+            scores = detector.score_many([texts[i] for i in pending])
+            elapsed = time.monotonic() - started
+
+            undecided = []
+            settled = 0
+            for i, score in zip(pending, scores):
+                if score is not None and (last or score[1] <= low or score[1] >= high):
+                    results[i] = score
+                    settled += 1
+                elif not last:
+                    # Failed or uncertain: the next model tries
+                    undecided.append(i)
+            with self._stats_lock:
+                self._settled[position] += settled
+                self._seconds[position] += elapsed
+            pending = undecided
+        return results
+
+    def stats(self):
+        """
+        Articles settled and time spent per stage
+
+        Returns:
+            list: dicts with model name, settled count and share, total seconds
+        """
+        with self._stats_lock:
+            total = sum(self._settled) or 1
+            return [{'model': getattr(detector, 'name', type(detector).__name__),
+                     'settled': settled, 'share': settled / total, 'seconds': seconds}
+                    for (detector, _, _), settled, seconds in zip(self.stages, self._settled, self._seconds)]
+
+
+class ShadowDetector(ArticleScorer):
+    """
+    Serves the primary model's scores while a candidate model scores the same texts
+
+    The candidate runs on a background thread, so it adds no latency to the
+    caller; its agreement with the primary model is collected for comparison
+    before the candidate is promoted.
+    """
+
+    def __init__(self, primary, candidate, sample_rate=1.0):
+        """
+        Args:
+            primary (ArticleScorer): Model whose scores are returned
+            candidate (ArticleScorer): Model being evaluated
+            sample_rate (float): Share of calls also sent to the candidate
+        """
+        self.primary = primary
+        self.candidate = candidate
+        self.sample_rate = sample_rate
+        self.threshold = primary.threshold
+        self.name = f"{getattr(primary, 'name', 'primary')} (shadow: {getattr(candidate, 'name', 'candidate')})"
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='shadow-scoring')
+        self._sample_credit = 0.0
+        self._stats_lock = threading.Lock()
+        self._stats = {'compared': 0, 'agree': 0, 'primary_only_fake': 0, 'candidate_only_fake': 0,
+                       'confidence_diff_total': 0.0, 'candidate_errors': 0, 'candidate_seconds': 0.0}
+
+    def warm_up(self):
+        self.primary.warm_up()
+        self.candidate.warm_up()
+
+    def score_many(self, texts):
+        scores = self.primary.score_many(texts)
+        # Evenly spaced sampling: every 1/sample_rate-th call is shadowed
+        with self._stats_lock:
+            self._sample_credit += self.sample_rate
+            sampled = self._sample_credit >= 1
+            if sampled:
+                self._sample_credit -= 1
+        if sampled:
+            self._executor.submit(self._compare, list(texts), scores)
+        return scores
+
+    def _compare(self, texts, primary_scores):
+        started = time.monotonic()
+        try:
+            candidate_scores = self.candidate.score_many(texts)
+        except Exception as e:
+            print(f"Shadow model failed: {e}")
+            candidate_scores = [None] * len(texts)
+        elapsed = time.monotonic() - started
+
+        with self._stats_lock:
+            stats = self._stats
+            stats['candidate_seconds'] += elapsed
+            for primary, candidate in zip(primary_scores, candidate_scores):
+                if primary is None:
+                    continue
+                if candidate is None:
+                    stats['candidate_errors'] += 1
+                    continue
+                primary_fake = primary[0] and primary[1] >= self.primary.threshold
+                candidate_fake = candidate[0] and candidate[1] >= self.candidate.threshold
+                stats['compared'] += 1
+                stats['agree'] += primary_fake == candidate_fake
+                stats['primary_only_fake'] += primary_fake and not candidate_fake
+                stats['candidate_only_fake'] += candidate_fake and not primary_fake
+                stats['confidence_diff_total'] += abs(primary[1] - candidate[1])
+
+    def flush(self):
+        """Wait for queued shadow comparisons to finish"""
+        self._executor.submit(lambda: None).result()
+
+    def stats(self):
+        """
+        Agreement between the primary and candidate filter decisions
+
+        Returns:
+            dict: compared, agreement rate, disagreements in each direction,
+                  mean absolute confidence difference, candidate errors and time
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        compared = stats['compared'] or 1
+        return {
+            'compared': stats['compared'],
+            'agreement': stats['agree'] / compared,
+            'primary_only_fake': stats['primary_only_fake'],
+            'candidate_only_fake': stats['candidate_only_fake'],
+            'mean_confidence_diff': stats['confidence_diff_total'] / compared,
+            'candidate_errors': stats['candidate_errors'],
+            'candidate_seconds': stats['candidate_seconds']
+        }
+
+
+def detector_from_env(registry=None):
+    """
+    Fake news detector configured through the environment
+
+    FAKE_NEWS_MODELS lists models for a cascade, cheapest first, as
+    name[:version][@low-high] (e.g. "hashing@0.1-0.9,tfidf"); FAKE_NEWS_SHADOW
+    names a candidate model to shadow-score. Without either, the original
+    single model is used.
+
+    Returns:
+        ArticleScorer: Detector for NewsPipeline
+    """
+    registry = registry or DetectorRegistry(detector_options={'batching': True})
+    specs = [s.strip() for s in os.getenv('FAKE_NEWS_MODELS', '').split(',') if s.strip()]
+    if not specs:
+        detector = registry.get(f"{LEGACY_NAME}:{LEGACY_VERSION}")
+    else:
+        stages = []
+        for spec in specs:
+            spec, _, bounds = spec.partition('@')
+            low, _, high = bounds.partition('-')
+            stages.append((registry.get(spec), float(low or 0.1), float(high or 0.9)))
+        detector = stages[0][0] if len(stages) == 1 else CascadeDetector(stages)
+
+    candidate = os.getenv('FAKE_NEWS_SHADOW')
+    if candidate:
+        detector = ShadowDetector(detector, registry.get(candidate))
+    return detector
@@ -0,0 +1,197 @@
+import re
+import numpy as np
+from lazy_imports import sklearn_text
+
+
+class ExtractiveSummarizer:
+    """Local extractive summarizer: ranks article sentences over TF-IDF vectors"""
+
+    METHODS = ('textrank', 'centroid')
+
+    def __init__(self, method='textrank', damping=0.85, max_iter=100, tol=1e-6,
+                 redundancy_threshold=0.6):
+        """
+        Args:
+            method (str): 'textrank' (graph centrality) or 'centroid' (similarity to the mean)
+            damping (float): TextRank damping factor
+            max_iter (int): Maximum power iterations for TextRank
+            tol (float): Convergence tolerance for TextRank
+            redundancy_threshold (float): Skip sentences this similar to an already picked one
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown method '{method}', expected one of {self.METHODS}")
+        self.method = method
+        self.damping = damping
+        self.max_iter = max_iter
+        self.tol = tol
+        self.redundancy_threshold = redundancy_threshold
+
+    def warm_up(self):
+        """Import scikit-learn ahead of the first summary"""
+        sklearn_text.load()
+
+    def split_sentences(self, articles):
+        """
+        Split articles into candidate sentences
+
+        Args:
+            articles (list): List of news articles
+
+        Returns:
+            tuple: (sentences, sources) - parallel lists
+        """
+        sentences = []
+        sources = []
+        seen = set()
+        for article in articles:
+            text = " ".join(
+                part for part in (article.get('description'), article.get('content'))
+                if part and part not in ('No description', 'No content')
+            )
+            # NewsAPI truncates content with "... [+1234 chars]"
+            text = re.sub(r'\s*(…|\.\.\.)?\s*\[\+\d+ chars\]', '', text)
+            if not text:
+                text = article.get('title') or ''
+            for sentence in re.split(r'(?<=[.!?])\s+', text):
+                sentence = sentence.strip()
+                key = sentence.lower()
+                if len(sentence.split()) < 4 or key in seen:
+                    continue
+                seen.add(key)
+                sentences.append(sentence)
+                sources.append(article.get('source', 'Unknown'))
+        return sentences, sources
+
+    def rank_sentences(self, sentences, query=None):
+        """
+        Score sentences by importance
+
+        Args:
+            sentences (list): Candidate sentences
+            query (str): Optional question to bias the ranking towards
+
+        Returns:
+            tuple: (scores, vectors) - numpy array of scores and the L2-normalized
+                   sparse TF-IDF matrix of the sentences
+        """
+        vectorizer = sklearn_text.TfidfVectorizer(stop_words='english', sublinear_tf=True)
+        try:
+            matrix = vectorizer.fit_transform(sentences + ([query] if query else []))
+        except ValueError:
+            # Only stop words - every sentence is equally (un)informative
+            return np.ones(len(sentences)), None
+        vectors = matrix[:len(sentences)]
+        query_vector = matrix[len(sentences):] if query else None
+
+        bias = None
+        if query_vector is not None and query_vector.nnz:
+            bias = np.asarray((vectors @ query_vector.T).todense()).ravel()
+            if not bias.any():
+                bias = None
+
+        if self.method == 'centroid':
+            centroid = np.asarray(vectors.mean(axis=0)).ravel()
+            norm = np.linalg.norm(centroid)
+            scores = vectors @ (centroid / norm) if norm else np.zeros(len(sentences))
+            if bias is not None:
+                scores = 0.5 * scores + 0.5 * bias
+            return np.asarray(scores).ravel(), vectors
+
+        return self._textrank(vectors, bias), vectors
+
+    def _textrank(self, vectors, bias=None):
+        """Power iteration over the cosine-similarity graph of the sentences"""
+        n = vectors.shape[0]
+        similarity = (vectors @ vectors.T).toarray()
+        np.fill_diagonal(similarity, 0.0)
+        out_degree = similarity.sum(axis=1, keepdims=True)
+        # Sentences with no neighbours jump uniformly
+        transition = np.divide(similarity, out_degree,
+                               out=np.full_like(similarity, 1.0 / n), where=out_degree > 0)
+
+        if bias is not None:
+            teleport = bias / bias.sum()
+        else:
+            teleport = np.full(n, 1.0 / n)
+
+        scores = np.full(n, 1.0 / n)
+        for _ in range(self.max_iter):
+            updated = (1 - self.damping) * teleport + self.damping * (transition.T @ scores)
+            if np.abs(updated - scores).sum() < self.tol:
+                return updated
+            scores = updated
+        return scores
+
+    def select_sentences(self, articles, num_sentences=4, query=None):
+        """
+        Pick the top sentences, skipping near-duplicates
+
+        Args:
+            articles (list): List of news articles
+            num_sentences (int): Number of sentences to return
+            query (str): Optional question to bias the ranking towards
+
+        Returns:
+            list: (sentence, source) tuples, best first
+        """
+        sentences, sources = self.split_sentences(articles)
+        if not sentences:
+            return []
+
+        scores, vectors = self.rank_sentences(sentences, query)
+        picked = []
+        for index in np.argsort(-scores, kind='stable'):
+            if vectors is not None and picked:
+                overlap = (vectors[picked] @ vectors[index].T).toarray().max()
+                if overlap > self.redundancy_threshold:
+                    continue
+            picked.append(index)
+            if len(picked) == num_sentences:
+                break
+        return [(sentences[i], sources[i]) for i in picked]
+
+    def summarize_articles(self, articles, summary_type="brief"):
+        """
+        Summarize multiple news articles
+
+        Args:
+            articles (list): List of news articles
+            summary_type (str): Type of summary ('brief', 'detailed')
+
+        Returns:
+            str: Summary of the articles
+        """
+        if not articles:
+            return "No articles to summarize."
+
+        num_sentences = 4 if summary_type == "brief" else 8
+        picked = self.select_sentences(articles[:10], num_sentences)
+        if not picked:
+            return "No articles to summarize."
+        return " ".join(sentence for sentence, _ in picked)
+
+    def answer_from_news(self, user_query, articles, num_sentences=4):
+        """
+        Answer a question with the article sentences most relevant to it
+
+        Args:
+            user_query (str): User's question
+            articles (list): List of news articles
+            num_sentences (int): Number of sentences to quote
+
+        Returns:
+            str: Markdown bullet list of sentences with their sources
+        """
+        if not articles:
+            return "I couldn't find any recent news articles related to your query. Please try a different topic."
+
+        picked = self.select_sentences(articles[:5], num_sentences, query=user_query)
+        if not picked:
+            # Nothing long enough to quote; list the headlines instead
+            picked = [(article['title'], article.get('source', 'Unknown'))
+                      for article in articles[:num_sentences] if article.get('title')]
+        if not picked:
+            return "I couldn't find any recent news articles related to your query. Please try a different topic."
+        lines = ["Here's what the latest coverage says:"]
+        lines.extend(f"- {sentence} ({source})" for sentence, source in picked)
+        return "\n".join(lines)
@@ -1,28 +1,21 @@
 import pickle
 import os
 import re
+import threading
 from pathlib import Path
+from micro_batcher import MicroBatcher
+from score_cache import ScoreCache, file_fingerprint
 
-class FakeNewsDetector:
-    """Detects fake news using pre-trained ML model"""
+class ArticleScorer:
+    """
+    Article-level filtering on top of score_many()
     
-    def __init__(self):
-        # Get the directory where this file is located
-        current_dir = Path(__file__).parent
-        model_dir = current_dir / "fake news"
-        
-        # Load the model and vectorizer
-        model_path = model_dir / "model.pkl"
-        vector_path = model_dir / "vector.pkl"
-        
-        if not model_path.exists() or not vector_path.exists():
-            raise FileNotFoundError(f"Model files not found in {model_dir}")
-        
-        with open(model_path, 'rb') as f:
-            self.model = pickle.load(f)
-        
-        with open(vector_path, 'rb') as f:
-            self.vectorizer = pickle.load(f)
+    Shared by the single-model FakeNewsDetector and the multi-model detectors
+    in detector_registry.py; subclasses only implement score_many().
+    """
+    
+    # Fake confidence at or above which filter_fake_articles() drops an article
+    threshold = 0.7
     
     def preprocess_text(self, text):
         """Preprocess text for prediction"""
@@ -38,6 +31,18 @@ class FakeNewsDetector:
         
         return text
     
+    def score_many(self, texts):
+        """
+        Score several texts
+        
+        Args:
+            texts (list): News article texts (title + description)
+            
+        Returns:
+            list: (is_fake, confidence) per text, or None where scoring failed
+        """
+        raise NotImplementedError
+    
     def is_fake(self, text):
         """
         Predict if the news text is fake or real
@@ -51,27 +56,9 @@ class FakeNewsDetector:
         if not text:
             return False
         
-        # Preprocess the text
-        processed_text = self.preprocess_text(text)
-        
-        if not processed_text:
-            return False
-        
-        try:
-            # Vectorize the text
-            text_vector = self.vectorizer.transform([processed_text])
-            
-            # Predict
-            prediction = self.model.predict(text_vector)[0]
-            
-            # Model trained with: 0 = Real, 1 = Fake
-            # Return True if fake (prediction == 1)
-            return prediction == 1
-            
-        except Exception as e:
-            print(f"Error in fake news detection: {e}")
-            # In case of error, assume it's real to avoid false positives
-            return False
+        score = self.score_many([text])[0]
+        # In case of error, assume it's real to avoid false positives
+        return score[0] if score is not None else False
     
     def get_confidence(self, text):
         """
@@ -86,35 +73,17 @@ class FakeNewsDetector:
         if not text:
             return 0.0
         
-        processed_text = self.preprocess_text(text)
-        
-        if not processed_text:
-            return 0.0
-        
-        try:
-            text_vector = self.vectorizer.transform([processed_text])
-            
-            # Get probability if model supports it
-            if hasattr(self.model, 'predict_proba'):
-                probabilities = self.model.predict_proba(text_vector)[0]
-                # Return probability of being fake
-                return probabilities[1] if len(probabilities) > 1 else probabilities[0]
-            else:
-                # If no probability, return binary prediction
-                prediction = self.model.predict(text_vector)[0]
-                return float(prediction)
-                
-        except Exception as e:
-            print(f"Error getting confidence: {e}")
-            return 0.0
+        score = self.score_many([text])[0]
+        return score[1] if score is not None else 0.0
     
-    def filter_fake_articles(self, articles, threshold=0.7, max_filter_percentage=50):
+    def filter_fake_articles(self, articles, threshold=None, max_filter_percentage=50):
         """
         Filter out fake news articles from a list
         
         Args:
             articles (list): List of article dictionaries
             threshold (float): Confidence threshold (0-1) - higher is stricter
+                (default: the model's own threshold)
             max_filter_percentage (int): Maximum percentage of articles to filter (safety)
             
         Returns:
@@ -122,30 +91,32 @@ class FakeNewsDetector:
         """
         if not articles:
             return [], 0, []
+        if threshold is None:
+            threshold = self.threshold
         
         real_articles = []
         filtered_articles = []
         fake_count = 0
         
-        for article in articles:
-            # Combine title and description for analysis
-            text = f"{article.get('title', '')} {article.get('description', '')}"
-            
-            # Check if fake with confidence
-            try:
-                confidence = self.get_confidence(text)
-                is_fake_prediction = self.is_fake(text)
-                
-                # Only filter if we're confident it's fake
-                if is_fake_prediction and confidence >= threshold:
-                    fake_count += 1
-                    filtered_articles.append(article)
-                    print(f"🚫 Filtered fake news (confidence: {confidence:.2f}): {article.get('title', 'Unknown')[:50]}...")
-                else:
-                    real_articles.append(article)
-            except Exception as e:
+        # Combine title and description for analysis
+        texts = [f"{article.get('title', '')} {article.get('description', '')}" for article in articles]
+        scores = self.score_many(texts)
+        
+        for article, score in zip(articles, scores):
+            if score is None:
                 # If error, keep the article (benefit of doubt)
                 real_articles.append(article)
+                continue
+            
+            is_fake_prediction, confidence = score
+            
+            # Only filter if we're confident it's fake
+            if is_fake_prediction and confidence >= threshold:
+                fake_count += 1
+                filtered_articles.append(article)
+                print(f"🚫 Filtered fake news (confidence: {confidence:.2f}): {article.get('title', 'Unknown')[:50]}...")
+            else:
+                real_articles.append(article)
         
         # Safety check: if we filtered too many, something might be wrong
         total = len(articles)
@@ -156,3 +127,169 @@ class FakeNewsDetector:
             return articles, 0, []
         
         return real_articles, fake_count, filtered_articles
+
+
+class FakeNewsDetector(ArticleScorer):
+    """Detects fake news using pre-trained ML model"""
+    
+    def __init__(self, cache_path=None, use_cache=True, batching=False, max_batch_size=64, max_wait_ms=5,
+                 model_dir=None, threshold=None):
+        """
+        Args:
+            cache_path (str): Score cache database (default: FAKE_NEWS_CACHE_PATH
+                or 'fake news/score_cache.sqlite3' for the default model, otherwise
+                score_cache.sqlite3 next to the model)
+            use_cache (bool): Reuse scores across sessions and processes
+            batching (bool): Merge concurrent callers' texts into shared model calls
+                (for one detector shared by many sessions or threads)
+            max_batch_size (int): Most texts per batched model call
+            max_wait_ms (float): How long a text waits for others to batch with
+            model_dir (str): Directory with model.pkl and vector.pkl (default: 'fake news/')
+            threshold (float): Default filter threshold for this model
+        """
+        default_model = model_dir is None
+        model_dir = Path(__file__).parent / "fake news" if default_model else Path(model_dir)
+        if threshold is not None:
+            self.threshold = threshold
+        
+        # Load the model and vectorizer
+        model_path = model_dir / "model.pkl"
+        vector_path = model_dir / "vector.pkl"
+        
+        if not model_path.exists() or not vector_path.exists():
+            raise FileNotFoundError(f"Model files not found in {model_dir}")
+        
+        # Unpickling imports scikit-learn, so the models are loaded on first use
+        self.model_path = model_path
+        self.vector_path = vector_path
+        self._model = None
+        self._vectorizer = None
+        self._load_lock = threading.Lock()
+        
+        # Scores are keyed by the model files' content, so replacing either
+        # pickle invalidates every cached score
+        self.model_version = file_fingerprint(model_path, vector_path)
+        self.cache = None
+        if use_cache:
+            # One cache file per model directory: opening a cache prunes other versions' scores
+            if cache_path is None and default_model:
+                cache_path = os.getenv('FAKE_NEWS_CACHE_PATH')
+            cache_path = cache_path or model_dir / "score_cache.sqlite3"
+            try:
+                self.cache = ScoreCache(cache_path, self.model_version)
+            except Exception as e:
+                print(f"Score cache unavailable, scoring without it: {e}")
+        
+        # Looked up on every batch so _predict can be swapped after construction
+        self.batcher = MicroBatcher(lambda texts: self._predict(texts), max_batch_size, max_wait_ms,
+                                    name="fake-news-batcher") if batching else None
+    
+    def _load_models(self):
+        with self._load_lock:
+            if self._model is None:
+                with open(self.model_path, 'rb') as f:
+                    self._model = pickle.load(f)
+            if self._vectorizer is None:
+                with open(self.vector_path, 'rb') as f:
+                    self._vectorizer = pickle.load(f)
+    
+    @property
+    def model(self):
+        if self._model is None:
+            self._load_models()
+        return self._model
+    
+    @model.setter
+    def model(self, model):
+        self._model = model
+    
+    @property
+    def vectorizer(self):
+        if self._vectorizer is None:
+            self._load_models()
+        return self._vectorizer
+    
+    @vectorizer.setter
+    def vectorizer(self, vectorizer):
+        self._vectorizer = vectorizer
+    
+    def warm_up(self):
+        """Load the model and vectorizer ahead of the first article"""
+        self._load_models()
+    
+    def _predict(self, processed_texts):
+        """
+        Score preprocessed texts in one vectorized call
+        
+        Returns:
+            list: (is_fake, confidence) per text
+        """
+        # Vectorize the text
+        text_vectors = self.vectorizer.transform(processed_texts)
+        
+        # Model trained with: 0 = Real, 1 = Fake
+        predictions = self.model.predict(text_vectors)
+        
+        # Get probability if model supports it
+        if hasattr(self.model, 'predict_proba'):
+            probabilities = self.model.predict_proba(text_vectors)
+            # Probability of being fake
+            confidences = [p[1] if len(p) > 1 else p[0] for p in probabilities]
+        else:
+            # If no probability, use the binary prediction
+            confidences = [float(p) for p in predictions]
+        
+        return [(prediction == 1, float(confidence))
+                for prediction, confidence in zip(predictions, confidences)]
+    
+    def score_many(self, texts):
+        """
+        Score several texts, using the persistent cache where possible
+        
+        Args:
+            texts (list): News article texts (title + description)
+            
+        Returns:
+            list: (is_fake, confidence) per text, or None where scoring failed
+        """
+        processed = [self.preprocess_text(text) for text in texts]
+        results = [(False, 0.0) if not p else None for p in processed]
+        pending = {i: p for i, p in enumerate(processed) if p}
+        
+        keys = {}
+        if self.cache is not None and pending:
+            keys = {i: self.cache.key(p) for i, p in pending.items()}
+            try:
+                cached = self.cache.get_many(keys.values())
+            except Exception as e:
+                print(f"Error reading score cache: {e}")
+                cached = {}
+            for i in list(pending):
+                if keys[i] in cached:
+                    results[i] = cached[keys[i]]
+                    del pending[i]
+        
+        if pending:
+            indices = list(pending)
+            try:
+                texts_to_score = [pending[i] for i in indices]
+                if self.batcher is not None:
+                    scores = self.batcher(texts_to_score)
+                else:
+                    scores = self._predict(texts_to_score)
+            except Exception as e:
+                print(f"Error in fake news detection: {e}")
+                scores = [None] * len(indices)
+            
+            new_entries = {}
+            for i, score in zip(indices, scores):
+                results[i] = score
+                if score is not None and i in keys:
+                    new_entries[keys[i]] = score
+            if new_entries:
+                try:
+                    self.cache.put_many(new_entries)
+                except Exception as e:
+                    print(f"Error writing score cache: {e}")
+        
+        return results
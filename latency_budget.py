@@ -0,0 +1,73 @@
+import time
+
+
+class LatencyBudget:
+    """End-to-end latency budget for a single chat turn"""
+
+    # Share of the total budget each stage may use
+    DEFAULT_SLICES = {
+        'theme': 0.15,
+        'fetch': 0.35,
+        'filter': 0.10,
+        'answer': 0.40
+    }
+
+    def __init__(self, total_seconds=15.0, slices=None):
+        """
+        Args:
+            total_seconds (float): Time allowed for the whole turn
+            slices (dict): Optional stage name -> fraction of the total budget
+        """
+        self.total_seconds = float(total_seconds)
+        self.slices = dict(self.DEFAULT_SLICES)
+        if slices:
+            self.slices.update(slices)
+        self.started_at = time.monotonic()
+        self.degradations = []
+        self.stage_timings = {}
+
+    def elapsed(self):
+        """Seconds spent since the turn started"""
+        return time.monotonic() - self.started_at
+
+    def remaining(self):
+        """Seconds left before the deadline (never negative)"""
+        return max(0.0, self.total_seconds - self.elapsed())
+
+    def expired(self):
+        """True once the deadline has passed"""
+        return self.remaining() <= 0.0
+
+    def stage_timeout(self, stage, minimum=0.5):
+        """
+        Time a stage may spend, capped by what is left of the whole budget
+
+        Args:
+            stage (str): Stage name (see DEFAULT_SLICES)
+            minimum (float): Floor so a stage still gets a usable timeout
+
+        Returns:
+            float: Timeout in seconds, or 0.0 if the budget is exhausted
+        """
+        remaining = self.remaining()
+        if remaining <= 0.0:
+            return 0.0
+        share = self.slices.get(stage, 0.0) * self.total_seconds
+        return min(remaining, max(share, minimum))
+
+    def degrade(self, stage, reason):
+        """Record that a stage returned its degraded result"""
+        self.degradations.append({'stage': stage, 'reason': reason})
+
+    def record(self, stage, seconds):
+        """Record how long a stage took"""
+        self.stage_timings[stage] = round(seconds, 3)
+
+    def metadata(self):
+        """Summary of the turn for the response metadata"""
+        return {
+            'budget_seconds': self.total_seconds,
+            'elapsed_seconds': round(self.elapsed(), 3),
+            'stage_timings': dict(self.stage_timings),
+            'degradations': list(self.degradations)
+        }
@@ -0,0 +1,31 @@
+import importlib
+
+
+class LazyModule:
+    """
+    Stands in for a slow-to-import module and imports it on first attribute access
+
+    requests and scikit-learn each add hundreds of milliseconds to startup, and
+    most sessions reach the first screen long before they need either.
+    """
+
+    def __init__(self, name):
+        """
+        Args:
+            name (str): Module to import, e.g. 'sklearn.feature_extraction.text'
+        """
+        self._name = name
+        self._module = None
+
+    def load(self):
+        """Import the module now (used by warm_up methods)"""
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+
+requests = LazyModule('requests')
+sklearn_text = LazyModule('sklearn.feature_extraction.text')
@@ -1,25 +1,119 @@
 import os
-from groq import Groq
+import re
+import json
+import threading
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Words dropped when keywords have to be pulled from the raw query
+STOPWORDS = {
+    'a', 'about', 'any', 'are', 'is', 'the', 'on', 'in', 'of', 'with', 'for',
+    'to', 'and', 'or', 'me', 'tell', 'what', 'whats', 'what\'s', 'how', 'latest',
+    'news', 'recent', 'updates', 'update', 'happening', 'going', 'there',
+    'anything', 'give', 'show', 'please', 'can', 'you', 'i', 'my', 'do', 'does',
+    'new', 'today', 'current', 'some', 'at', 'by', 'from', 'it', 'this', 'that'
+}
+
 class LLMSummarizer:
     """LLM-based summarizer and query analyzer using Groq"""
     
-    def __init__(self):
+    MODES = ('llm', 'extractive', 'auto')
+    
+    def __init__(self, mode='llm'):
+        """
+        Args:
+            mode (str): Default summarization mode
+                'llm' - always use the remote model
+                'extractive' - always use the local extractive summarizer
+                'auto' - local for brief summaries, remote for everything else
+                The local summarizer is also the fallback when the LLM fails
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown mode '{mode}', expected one of {self.MODES}")
         self.api_key = os.getenv('GROQ_API_KEY')
         if not self.api_key:
             raise ValueError("GROQ_API_KEY not found in environment variables")
-        self.client = Groq(api_key=self.api_key)
         self.model = "llama-3.3-70b-versatile"  # Updated to current model
+        self.mode = mode
+        # groq and scikit-learn are slow to import; both are loaded on first use
+        self._client = None
+        self._extractive = None
+        self._lock = threading.Lock()
+        
+    @property
+    def client(self):
+        """Groq client, created on first use"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from groq import Groq
+                    self._client = Groq(api_key=self.api_key)
+        return self._client
+    
+    @client.setter
+    def client(self, client):
+        self._client = client
+    
+    @property
+    def extractive(self):
+        """Local extractive summarizer, created on first use"""
+        if self._extractive is None:
+            from extractive_summarizer import ExtractiveSummarizer
+            self._extractive = ExtractiveSummarizer()
+        return self._extractive
+    
+    def warm_up(self):
+        """Import the heavy dependencies and build the client ahead of the first query"""
+        self.client
+        self.extractive.warm_up()
+        
+    def _complete(self, messages, temperature, max_tokens, timeout=None, **kwargs):
+        """Run a chat completion; with a timeout, retries are disabled so the deadline holds"""
+        client = self.client
+        if timeout is not None:
+            client = client.with_options(timeout=timeout, max_retries=0)
+        response = client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs
+        )
+        return response.choices[0].message.content.strip()
+    
+    @staticmethod
+    def _articles_context(articles):
+        """Format the top 5 articles as the context block sent to the LLM"""
+        return "\n\n".join([
+            f"Article {i+1}:\nTitle: {article['title']}\nSource: {article['source']}\nPublished: {article.get('publishedAt', article.get('published_at', 'Unknown'))}\nContent: {article['description']}"
+            for i, article in enumerate(articles[:5])  # Limit to top 5 articles
+        ])
+    
+    @staticmethod
+    def keywords_from_query(user_query, max_words=5):
+        """
+        Pull search keywords out of the raw query without calling the LLM
         
-    def extract_theme(self, user_query):
+        Args:
+            user_query (str): User's question or query
+            max_words (int): Maximum number of keywords to keep
+            
+        Returns:
+            str: Keywords for news search (the query itself if nothing is left)
+        """
+        words = re.findall(r"[A-Za-z0-9][A-Za-z0-9'\-]*", user_query or "")
+        keywords = [w for w in words if w.lower() not in STOPWORDS]
+        return " ".join(keywords[:max_words]) or (user_query or "").strip()
+    
+    def extract_theme(self, user_query, timeout=None, raise_errors=False):
         """
         Extract the main theme/keywords from user query for news search
         
         Args:
             user_query (str): User's question or query
+            timeout (float): Request timeout in seconds
+            raise_errors (bool): Re-raise API errors instead of falling back
             
         Returns:
             str: Extracted theme/keywords for news search
@@ -38,30 +132,33 @@ Examples:
 Keywords:"""
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
+            theme = self._complete(
+                [
                     {"role": "system", "content": "You are a helpful assistant that extracts search keywords from queries."},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.3,
-                max_tokens=50
+                max_tokens=50,
+                timeout=timeout
             )
-            
-            theme = response.choices[0].message.content.strip().strip('"').strip()
-            return theme
+            return theme.strip('"').strip()
             
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"Error extracting theme: {e}")
             return user_query
     
-    def answer_from_news(self, user_query, articles):
+    def answer_from_news(self, user_query, articles, timeout=None, raise_errors=False, mode=None):
         """
         Generate an answer to user's query based on fetched news articles
         
         Args:
             user_query (str): User's original question
             articles (list): List of news articles
+            timeout (float): Request timeout in seconds
+            raise_errors (bool): Re-raise API errors instead of falling back to an extractive answer
+            mode (str): Overrides the default mode ('llm', 'extractive')
             
         Returns:
             str: AI-generated answer based on the news
@@ -69,11 +166,11 @@ Keywords:"""
         if not articles:
             return "I couldn't find any recent news articles related to your query. Please try a different topic."
         
+        if (mode or self.mode) == 'extractive':
+            return self.extractive.answer_from_news(user_query, articles)
+        
         # Format articles for the LLM
-        articles_text = "\n\n".join([
-            f"Article {i+1}:\nTitle: {article['title']}\nSource: {article['source']}\nPublished: {article.get('publishedAt', article.get('published_at', 'Unknown'))}\nContent: {article['description']}"
-            for i, article in enumerate(articles[:5])  # Limit to top 5 articles
-        ])
+        articles_text = self._articles_context(articles)
         
         prompt = f"""You are a helpful news assistant. Based on the following recent news articles, answer the user's question in a comprehensive yet concise way.
 
@@ -92,29 +189,33 @@ Instructions:
 Answer:"""
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
+            return self._complete(
+                [
                     {"role": "system", "content": "You are a knowledgeable news assistant that provides accurate information based on recent news articles."},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.7,
-                max_tokens=500
+                max_tokens=500,
+                timeout=timeout
             )
             
-            return response.choices[0].message.content.strip()
-            
         except Exception as e:
-            print(f"Error generating answer: {e}")
-            return "I encountered an error while processing the news articles. Please try again."
+            if raise_errors:
+                raise
+            print(f"Error generating answer, falling back to extractive answer: {e}")
+            return self.extractive.answer_from_news(user_query, articles)
     
-    def summarize_articles(self, articles, summary_type="brief"):
+    def summarize_articles(self, articles, summary_type="brief", timeout=None, raise_errors=False,
+                           mode=None):
         """
         Summarize multiple news articles
         
         Args:
             articles (list): List of news articles
             summary_type (str): Type of summary ('brief', 'detailed')
+            timeout (float): Request timeout in seconds
+            raise_errors (bool): Re-raise API errors instead of falling back to an extractive summary
+            mode (str): Overrides the default mode ('llm', 'extractive', 'auto')
             
         Returns:
             str: Summary of the articles
@@ -122,6 +223,10 @@ Answer:"""
         if not articles:
             return "No articles to summarize."
         
+        mode = mode or self.mode
+        if mode == 'extractive' or (mode == 'auto' and summary_type == "brief"):
+            return self.extractive.summarize_articles(articles, summary_type)
+        
         articles_text = "\n\n".join([
             f"- {article['title']} ({article['source']}, {article.get('publishedAt', article.get('published_at', 'Unknown'))}): {article['description']}"
             for article in articles[:10]
@@ -141,21 +246,21 @@ Summary:"""
 Summary:"""
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
+            return self._complete(
+                [
                     {"role": "system", "content": "You are a professional news summarizer."},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.5,
-                max_tokens=300 if summary_type == "brief" else 600
+                max_tokens=300 if summary_type == "brief" else 600,
+                timeout=timeout
             )
             
-            return response.choices[0].message.content.strip()
-            
         except Exception as e:
-            print(f"Error summarizing articles: {e}")
-            return "Error generating summary."
+            if raise_errors:
+                raise
+            print(f"Error summarizing articles, falling back to extractive summary: {e}")
+            return self.extractive.summarize_articles(articles, summary_type)
     
     def answer_question(self, question, articles):
         """
@@ -169,3 +274,73 @@ Summary:"""
             str: Answer to the question
         """
         return self.answer_from_news(question, articles)
+    
+    def answer_questions(self, questions, articles, batch_size=8, timeout=None, raise_errors=False):
+        """
+        Answer many questions about the same articles
+        
+        The article context is sent once per batch of questions instead of once
+        per question, and comes first in the prompt so every batch shares the
+        same prefix. Each batch is one JSON-mode completion.
+        
+        Args:
+            questions (list): Questions to answer
+            articles (list): List of news articles shared by all questions
+            batch_size (int): Maximum questions per LLM call
+            timeout (float): Request timeout in seconds, per batch
+            raise_errors (bool): Re-raise API errors instead of falling back to extractive answers
+            
+        Returns:
+            list: Answers, in the same order as the questions
+        """
+        if not questions:
+            return []
+        if not articles:
+            return [self.answer_from_news(question, articles) for question in questions]
+        if self.mode == 'extractive':
+            return [self.extractive.answer_from_news(question, articles) for question in questions]
+        
+        articles_text = self._articles_context(articles)
+        answers = []
+        for start in range(0, len(questions), batch_size):
+            batch = questions[start:start + batch_size]
+            answers.extend(self._answer_batch(batch, articles, articles_text, timeout, raise_errors))
+        return answers
+    
+    def _answer_batch(self, questions, articles, articles_text, timeout=None, raise_errors=False):
+        """One structured completion answering several questions"""
+        numbered = "\n".join(f"{i+1}. {question}" for i, question in enumerate(questions))
+        prompt = f"""Recent News Articles:
+{articles_text}
+
+Based only on the articles above, answer each of the following questions in a concise, conversational way (2-4 sentences each). Reference specific information and mention sources when relevant. If the articles don't answer a question, say what information is available.
+
+Questions:
+{numbered}
+
+Respond with a JSON object of the form {{"answers": ["answer to question 1", "answer to question 2", ...]}} containing exactly {len(questions)} answers in order."""
+
+        try:
+            content = self._complete(
+                [
+                    {"role": "system", "content": "You are a knowledgeable news assistant that provides accurate information based on recent news articles."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.5,
+                max_tokens=min(250 * len(questions), 4000),
+                timeout=timeout,
+                response_format={"type": "json_object"}
+            )
+            answers = json.loads(content).get('answers', [])
+        except Exception as e:
+            if raise_errors:
+                raise
+            print(f"Error answering questions, falling back to extractive answers: {e}")
+            answers = []
+        
+        # Anything missing or malformed gets a local extractive answer
+        return [
+            answers[i].strip() if i < len(answers) and isinstance(answers[i], str) and answers[i].strip()
+            else self.extractive.answer_from_news(question, articles)
+            for i, question in enumerate(questions)
+        ]
@@ -1,5 +1,7 @@
 from news_fetcher import NewsFetcher
 from llm_summarizer import LLMSummarizer
+from warmup import warm_up_in_background
+import os
 import sys
 
 class NewschatBot:
@@ -9,6 +11,8 @@ class NewschatBot:
         self.news_fetcher = NewsFetcher()
         self.summarizer = LLMSummarizer()
         self.current_articles = []
+        if os.getenv('WARM_UP_ON_START', 'true').lower() != 'false':
+            warm_up_in_background(self.news_fetcher, self.summarizer)
         
     def display_menu(self):
         """Display main menu"""
@@ -21,7 +25,8 @@ class NewschatBot:
         print("3. Get news by category")
         print("4. Summarize current news")
         print("5. Ask a question about current news")
-        print("6. Exit")
+        print("6. Ask several questions at once (FAQ briefing)")
+        print("7. Exit")
         print("-"*60)
         
     def display_categories(self):
@@ -122,13 +127,41 @@ class NewschatBot:
             return
         
         print("\n🤖 Thinking...")
-        answer = self.summarizer.answer_question(self.current_articles, question)
+        answer = self.summarizer.answer_question(question, self.current_articles)
         print("\n" + "="*60)
         print("💬 AI ANSWER")
         print("="*60)
         print(answer)
         print("="*60)
         
+    def ask_questions(self):
+        """Answer several questions about current articles in one batch"""
+        if not self.current_articles:
+            print("\n❌ No articles loaded. Please fetch news first.")
+            return
+        
+        print("\n❓ Enter your questions, one per line (empty line to finish):")
+        questions = []
+        while True:
+            question = input(f"  {len(questions) + 1}. ").strip()
+            if not question:
+                break
+            questions.append(question)
+        
+        if not questions:
+            print("❌ Please enter at least one question.")
+            return
+        
+        print(f"\n🤖 Answering {len(questions)} questions...")
+        answers = self.summarizer.answer_questions(questions, self.current_articles)
+        print("\n" + "="*60)
+        print("💬 AI BRIEFING")
+        print("="*60)
+        for i, (question, answer) in enumerate(zip(questions, answers), 1):
+            print(f"\nQ{i}: {question}")
+            print(f"A{i}: {answer}")
+        print("="*60)
+        
     def _display_articles(self):
         """Display fetched articles"""
         if not self.current_articles:
@@ -156,7 +189,7 @@ class NewschatBot:
         
         while True:
             self.display_menu()
-            choice = input("\nEnter your choice (1-6): ").strip()
+            choice = input("\nEnter your choice (1-7): ").strip()
             
             if choice == '1':
                 self.get_top_headlines()
@@ -169,17 +202,19 @@ class NewschatBot:
             elif choice == '5':
                 self.ask_question()
             elif choice == '6':
+                self.ask_questions()
+            elif choice == '7':
                 print("\n👋 Thank you for using News Chatbot! Goodbye!")
                 sys.exit(0)
             else:
-                print("\n❌ Invalid choice. Please select 1-6.")
+                print("\n❌ Invalid choice. Please select 1-7.")
             
             input("\n⏎ Press Enter to continue...")
 
 
 if __name__ == "__main__":
     try:
-        bot = NewshatBot()
+        bot = NewschatBot()
         bot.run()
     except KeyboardInterrupt:
         print("\n\n👋 Goodbye!")
@@ -0,0 +1,173 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """
+    Dynamic batching for a vectorized predict function
+
+    Callers from any thread submit single items and get futures back. A worker
+    thread collects whatever arrives within max_wait_ms of the first queued item
+    (or until max_batch_size items are queued), runs predict once on the whole
+    batch and resolves every caller's future with its own result. Under load the
+    per-call overhead of the model is paid once per batch instead of once per item.
+
+    Callers that block in __call__ are counted: once all of them have their
+    items in the batch nobody else can add to it, so it runs without waiting
+    out max_wait_ms. A lone caller therefore pays no batching delay.
+    """
+
+    def __init__(self, predict, max_batch_size=64, max_wait_ms=5, name="micro-batcher"):
+        """
+        Args:
+            predict (callable): list of items -> list of results, same order and length
+            max_batch_size (int): Largest batch passed to predict
+            max_wait_ms (float): How long the first item of a batch waits for company
+            name (str): Worker thread name
+        """
+        self.predict = predict
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.name = name
+        self._queue = queue.Queue()
+        self._worker = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+        self._waiting_callers = 0
+        self._callers_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {'batches': 0, 'items': 0, 'max_batch_size': 0, 'max_queue_depth': 0,
+                       'queue_depth_total': 0, 'wait_seconds_total': 0.0, 'predict_seconds_total': 0.0,
+                       'errors': 0}
+
+    def submit(self, item):
+        """
+        Queue one item for scoring
+
+        Returns:
+            Future: Resolves to predict's result for the item
+        """
+        return self.submit_many([item])[0]
+
+    def submit_many(self, items, caller=None):
+        """Queue several items; they may be split across batches or share one with other callers"""
+        if self._closed:
+            raise RuntimeError(f"{self.name} is closed")
+        self._ensure_worker()
+        futures = []
+        now = time.monotonic()
+        for item in items:
+            future = Future()
+            self._queue.put((item, future, now, caller))
+            futures.append(future)
+        return futures
+
+    def __call__(self, items, timeout=None):
+        """Score items through the shared batches and wait for the results"""
+        caller = object()
+        with self._callers_lock:
+            self._waiting_callers += 1
+        try:
+            return [future.result(timeout) for future in self.submit_many(items, caller)]
+        finally:
+            with self._callers_lock:
+                self._waiting_callers -= 1
+
+    def _ensure_worker(self):
+        if self._worker is not None:
+            return
+        with self._start_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            callers = {first[3]}
+            depth = self._queue.qsize() + 1
+            deadline = time.monotonic() + self.max_wait
+            stop = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if None not in callers and len(callers) >= self._waiting_callers and self._queue.empty():
+                    # Every blocked caller is already in this batch
+                    remaining = 0
+                try:
+                    entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stop = True
+                    break
+                batch.append(entry)
+                callers.add(entry[3])
+            self._run_batch(batch, depth)
+            if stop:
+                return
+
+    def _run_batch(self, batch, depth):
+        started = time.monotonic()
+        items = [entry[0] for entry in batch]
+        try:
+            results = self.predict(items)
+            if len(results) != len(items):
+                raise ValueError(f"predict returned {len(results)} results for {len(items)} items")
+            error = None
+        except Exception as e:
+            results, error = None, e
+        finished = time.monotonic()
+
+        for i, (_, future, _, _) in enumerate(batch):
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(results[i])
+
+        with self._stats_lock:
+            stats = self._stats
+            stats['batches'] += 1
+            stats['items'] += len(batch)
+            stats['max_batch_size'] = max(stats['max_batch_size'], len(batch))
+            stats['max_queue_depth'] = max(stats['max_queue_depth'], depth)
+            stats['queue_depth_total'] += depth
+            stats['wait_seconds_total'] += sum(started - entry[2] for entry in batch)
+            stats['predict_seconds_total'] += finished - started
+            stats['errors'] += error is not None
+
+    def stats(self):
+        """
+        Batching metrics since start
+
+        Returns:
+            dict: batches, items, avg/max batch size, avg/max queue depth when a
+                  batch was formed, avg queueing delay and avg predict time per batch
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        batches = stats['batches'] or 1
+        return {
+            'batches': stats['batches'],
+            'items': stats['items'],
+            'errors': stats['errors'],
+            'avg_batch_size': stats['items'] / batches,
+            'max_batch_size': stats['max_batch_size'],
+            'avg_queue_depth': stats['queue_depth_total'] / batches,
+            'max_queue_depth': stats['max_queue_depth'],
+            'avg_wait_ms': stats['wait_seconds_total'] / (stats['items'] or 1) * 1000,
+            'avg_predict_ms': stats['predict_seconds_total'] / batches * 1000,
+            'queue_depth': self._queue.qsize()
+        }
+
+    def close(self):
+        """Finish the queued items, then stop the worker"""
+        self._closed = True
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join()
+            self._worker = None
@@ -1,7 +1,10 @@
-import requests
 import os
+import threading
+import time
 from datetime import datetime
 from dotenv import load_dotenv
+from article import Article
+from lazy_imports import requests
 
 load_dotenv()
 
@@ -11,8 +14,15 @@ class NewsFetcher:
     def __init__(self):
         self.api_key = os.getenv('NEWS_API_KEY')
         self.base_url = 'https://newsapi.org/v2'
+        self.timeout = 10  # Default request timeout in seconds
+        # Last successful results, served as stale articles when a request fails
+        # (shared by chat sessions and the story tracker thread, hence the lock)
+        self._cache = {}
+        self._cache_size = 50
+        self._cache_lock = threading.Lock()
         
-    def get_top_headlines(self, query=None, category=None, country='us', page_size=5):
+    def get_top_headlines(self, query=None, category=None, country='us', page_size=5,
+                          timeout=None, raise_errors=False):
         """
         Fetch top headlines from NewsAPI
         
@@ -21,6 +31,8 @@ class NewsFetcher:
             category (str): Category of news (business, entertainment, general, health, science, sports, technology)
             country (str): 2-letter ISO 3166-1 code of the country (default: 'us')
             page_size (int): Number of results to return (default: 5, max: 100)
+            timeout (float): Request timeout in seconds (default: self.timeout)
+            raise_errors (bool): Re-raise request errors instead of returning []
             
         Returns:
             list: List of news articles
@@ -39,19 +51,15 @@ class NewsFetcher:
             params['category'] = category
             
         try:
-            response = requests.get(endpoint, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data['status'] == 'ok':
-                return self._format_articles(data['articles'])
-            else:
-                return []
+            return self._request(endpoint, params, timeout)
         except requests.exceptions.RequestException as e:
+            if raise_errors:
+                raise
             print(f"Error fetching news: {e}")
             return []
     
-    def search_news(self, query, language='en', sort_by='publishedAt', page_size=5):
+    def search_news(self, query, language='en', sort_by='publishedAt', page_size=5,
+                    timeout=None, raise_errors=False):
         """
         Search for news articles
         
@@ -60,6 +68,8 @@ class NewsFetcher:
             language (str): Language code (default: 'en')
             sort_by (str): Sort order (relevancy, popularity, publishedAt)
             page_size (int): Number of results to return
+            timeout (float): Request timeout in seconds (default: self.timeout)
+            raise_errors (bool): Re-raise request errors instead of returning []
             
         Returns:
             list: List of news articles
@@ -75,30 +85,164 @@ class NewsFetcher:
         }
         
         try:
-            response = requests.get(endpoint, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data['status'] == 'ok':
-                return self._format_articles(data['articles'])
-            else:
-                return []
+            return self._request(endpoint, params, timeout)
         except requests.exceptions.RequestException as e:
+            if raise_errors:
+                raise
             print(f"Error searching news: {e}")
             return []
     
+    def iter_search_news(self, query, language='en', sort_by='publishedAt', page_size=100,
+                         max_results=None, max_requests=None, timeout=None, raise_errors=False):
+        """
+        Stream every article matching a search, page by page
+        
+        Args:
+            query (str): Keywords or phrases to search for
+            language (str): Language code (default: 'en')
+            sort_by (str): Sort order (relevancy, popularity, publishedAt)
+            page_size (int): Articles per request (max: 100)
+            max_results (int): Stop after this many articles (default: all of totalResults)
+            max_requests (int): Stop after this many API requests, to protect the daily quota
+            timeout (float): Timeout per request in seconds (default: self.timeout)
+            raise_errors (bool): Re-raise request errors instead of ending the stream
+            
+        Yields:
+            Article: One article at a time, in API order
+        """
+        params = {'q': query, 'language': language, 'sortBy': sort_by}
+        return self._iter_pages(f'{self.base_url}/everything', params, page_size,
+                                max_results, max_requests, timeout, raise_errors)
+    
+    def iter_top_headlines(self, query=None, category=None, country='us', page_size=100,
+                           max_results=None, max_requests=None, timeout=None, raise_errors=False):
+        """
+        Stream every current top headline, page by page
+        
+        Takes the same filters as get_top_headlines and the same limits as
+        iter_search_news.
+        
+        Yields:
+            Article: One article at a time, in API order
+        """
+        params = {'country': country}
+        if query:
+            params['q'] = query
+        if category:
+            params['category'] = category
+        return self._iter_pages(f'{self.base_url}/top-headlines', params, page_size,
+                                max_results, max_requests, timeout, raise_errors)
+    
+    def _iter_pages(self, endpoint, params, page_size, max_results, max_requests, timeout, raise_errors):
+        """
+        Walk the page parameter, requesting page N+1 while page N is consumed
+        
+        Only one request is ever in flight ahead of the consumer, so memory stays
+        at about two pages however many results there are. Closing the generator
+        (or breaking out of the loop) cancels the prefetch.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        page_size = max(1, min(page_size, 100))
+        timeout = timeout if timeout is not None else self.timeout
+        session = requests.Session()
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='news-page')
+        
+        def get_page(page):
+            response = session.get(endpoint, params={**params, 'apiKey': self.api_key,
+                                                     'pageSize': page_size, 'page': page},
+                                   timeout=timeout)
+            # 426: the plan's maximum number of results for this search was reached
+            if response.status_code == 426:
+                return [], 0
+            response.raise_for_status()
+            data = response.json()
+            if data.get('status') != 'ok':
+                return [], 0
+            return data.get('articles') or [], data.get('totalResults', 0)
+        
+        page = 1
+        requests_made = 1
+        pending = executor.submit(get_page, page)
+        yielded = 0
+        try:
+            while pending is not None:
+                try:
+                    raw_articles, total_results = pending.result()
+                except requests.exceptions.RequestException as e:
+                    if raise_errors:
+                        raise
+                    print(f"Error fetching page {page} of news: {e}")
+                    return
+                
+                limit = total_results if max_results is None else min(total_results, max_results)
+                pending = None
+                if (raw_articles and page * page_size < limit
+                        and (max_requests is None or requests_made < max_requests)):
+                    page += 1
+                    requests_made += 1
+                    pending = executor.submit(get_page, page)
+                
+                for raw in raw_articles:
+                    if yielded >= limit:
+                        return
+                    yield Article.from_newsapi(raw)
+                    yielded += 1
+        finally:
+            if pending is not None:
+                pending.cancel()
+            executor.shutdown(wait=False)
+            session.close()
+    
+    def warm_up(self):
+        """Import requests ahead of the first fetch"""
+        requests.load()
+    
+    def get_cached(self, query=None):
+        """
+        Return previously fetched articles without touching the network
+        
+        Args:
+            query (str): Search query to look up; only results fetched for
+                this query are served
+                
+        Returns:
+            tuple: (articles, age_seconds) - ([], None) if nothing is cached
+        """
+        if not query:
+            return [], None
+        with self._cache_lock:
+            matches = [
+                entry for key, entry in self._cache.items()
+                if dict(key[1]).get('q', '').lower() == query.lower()
+            ]
+        if not matches:
+            return [], None
+        fetched_at, articles = max(matches, key=lambda entry: entry[0])
+        return articles, time.time() - fetched_at
+    
+    def _request(self, endpoint, params, timeout=None):
+        """GET an endpoint, format the articles and remember them for get_cached"""
+        response = requests.get(endpoint, params=params,
+                                timeout=timeout if timeout is not None else self.timeout)
+        response.raise_for_status()
+        data = response.json()
+        
+        if data['status'] != 'ok':
+            return []
+        
+        articles = self._format_articles(data['articles'])
+        if articles:
+            cache_key = (endpoint, tuple(sorted(
+                (k, v) for k, v in params.items() if k != 'apiKey'
+            )))
+            with self._cache_lock:
+                self._cache[cache_key] = (time.time(), articles)
+                if len(self._cache) > self._cache_size:
+                    oldest = min(self._cache, key=lambda key: self._cache[key][0])
+                    del self._cache[oldest]
+        return articles
+    
     def _format_articles(self, articles):
-        """Format articles for better readability"""
-        formatted = []
-        for article in articles:
-            formatted.append({
-                'title': article.get('title', 'No title'),
-                'description': article.get('description', 'No description'),
-                'content': article.get('content', 'No content'),
-                'source': article.get('source', {}).get('name', 'Unknown'),
-                'author': article.get('author', 'Unknown'),
-                'url': article.get('url', ''),
-                'publishedAt': article.get('publishedAt', ''),
-                'urlToImage': article.get('urlToImage', '')
-            })
-        return formatted
+        """Format articles into compact Article records"""
+        return [Article.from_newsapi(article) for article in articles]
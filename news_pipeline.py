@@ -0,0 +1,274 @@
+import time
+from collections import Counter
+from conversation_state import article_key
+from latency_budget import LatencyBudget
+from quality_filter import QualityFilter
+
+
+class NewsPipeline:
+    """Runs one chat turn (theme -> fetch -> filter -> answer) within a latency budget"""
+
+    def __init__(self, news_fetcher, summarizer, fake_detector, semantic_index=None, story_tracker=None,
+                 quality_filter=None):
+        """
+        Args:
+            news_fetcher (NewsFetcher): Remote news source
+            summarizer (LLMSummarizer): Theme extraction and answers
+            fake_detector (FakeNewsDetector): Fake news filter
+            semantic_index (SemanticIndex): Optional local index; every fetched
+                article is added to it, and it serves offline turns and failed fetches
+            story_tracker (StoryTracker): Optional; fetched articles are matched
+                against watched topics
+            quality_filter (QualityFilter): Drops removed, empty, too short,
+                boilerplate and foreign-language articles right after fetching
+                (default: English-only QualityFilter)
+        """
+        self.news_fetcher = news_fetcher
+        self.summarizer = summarizer
+        self.fake_detector = fake_detector
+        self.semantic_index = semantic_index
+        self.story_tracker = story_tracker
+        self.quality_filter = quality_filter or QualityFilter()
+        self._extractive = None
+
+    @property
+    def extractive(self):
+        """Local extractive summarizer, shared with the LLM summarizer when it has one"""
+        if self._extractive is None:
+            self._extractive = getattr(self.summarizer, 'extractive', None)
+            if self._extractive is None:
+                from extractive_summarizer import ExtractiveSummarizer
+                self._extractive = ExtractiveSummarizer()
+        return self._extractive
+
+    def run(self, user_query, num_articles=5, country='us', budget_seconds=15.0, mode='llm',
+            offline=False, conversation=None):
+        """
+        Answer a user query, degrading each stage instead of blowing the budget
+
+        Args:
+            user_query (str): User's question
+            num_articles (int): Number of articles to use for the answer
+            country (str): Country code for the top-headlines fallback
+            budget_seconds (float): End-to-end latency budget for the turn
+            mode (str): 'llm' for an AI answer, 'extractive' for a fast local answer
+            offline (bool): Retrieve articles from the local semantic index only
+            conversation (ConversationState): Earlier turns of this chat; follow-up
+                questions reuse its theme and screened articles and only fetch
+                articles for the new aspect of the question
+
+        Returns:
+            dict: answer, articles, theme, fake_filtered, low_quality_filtered
+                  (reason -> count), follow_up (reused / new article counts, or
+                  None for a new topic) and metadata (metadata['degradations']
+                  lists every stage that fell back)
+        """
+        budget = LatencyBudget(budget_seconds)
+        low_quality = Counter()
+        follow_up = conversation.follow_up(user_query) if conversation is not None and not offline else None
+
+        if follow_up is not None:
+            # Same story: no theme extraction, and only the new aspect is fetched and screened
+            theme = follow_up['theme']
+            fresh = []
+            if follow_up['new_terms']:
+                fresh = self._fetch_increment(theme, conversation, num_articles, budget, low_quality)
+            screened, fake_count = self._filter_articles(fresh, budget) if fresh else ([], 0)
+            ranked = conversation.rank(user_query, screened + conversation.articles)
+            follow_up = {'reused_articles': len(ranked) - len(screened), 'new_articles': len(screened)}
+        else:
+            if offline:
+                theme = self.summarizer.keywords_from_query(user_query)
+                articles = self._retrieve_local(user_query, num_articles * 2, budget)
+            else:
+                if mode == 'extractive':
+                    # Fast local mode makes no LLM calls at all
+                    theme = self.summarizer.keywords_from_query(user_query)
+                else:
+                    theme = self._extract_theme(user_query, budget)
+                articles = self._fetch_articles(user_query, theme, num_articles, country, budget, low_quality)
+            screened, fake_count = self._filter_articles(articles, budget)
+            ranked = screened
+        real_articles = ranked[:num_articles]
+        answer = self._answer(user_query, real_articles, budget, mode)
+
+        if conversation is not None and real_articles:
+            if follow_up is None:
+                conversation.clear()
+                conversation.update(user_query, theme, screened, answer)
+            else:
+                conversation.update(user_query, conversation.theme, screened, answer)
+
+        return {
+            'answer': answer,
+            'articles': real_articles,
+            'theme': theme,
+            'fake_filtered': fake_count,
+            'low_quality_filtered': dict(low_quality),
+            'follow_up': follow_up,
+            'metadata': budget.metadata()
+        }
+
+    def _extract_theme(self, user_query, budget):
+        """LLM keyword extraction, degraded to keywords from the raw query"""
+        started = time.monotonic()
+        timeout = budget.stage_timeout('theme')
+        try:
+            if timeout <= 0:
+                budget.degrade('theme', 'budget exhausted')
+                return self.summarizer.keywords_from_query(user_query)
+            return self.summarizer.extract_theme(user_query, timeout=timeout, raise_errors=True)
+        except Exception as e:
+            budget.degrade('theme', _failure_reason(e))
+            return self.summarizer.keywords_from_query(user_query)
+        finally:
+            budget.record('theme', time.monotonic() - started)
+
+    def _fetch_articles(self, user_query, theme, num_articles, country, budget, low_quality=None):
+        """Search, then top headlines; degraded to cached or stale articles"""
+        started = time.monotonic()
+        # One fetch slice for both requests: the headline fallback only gets what the search left
+        deadline = started + budget.stage_timeout('fetch')
+        try:
+            for fetch in (
+                lambda timeout: self.news_fetcher.search_news(
+                    query=theme, page_size=num_articles * 2,  # Fetch more to account for filtering
+                    timeout=timeout, raise_errors=True),
+                lambda timeout: self.news_fetcher.get_top_headlines(
+                    query=theme, country=country, page_size=num_articles * 2,
+                    timeout=timeout, raise_errors=True)
+            ):
+                timeout = min(deadline - time.monotonic(), budget.remaining())
+                if timeout <= 0:
+                    return self._cached_articles(user_query, theme, num_articles, budget, 'budget exhausted',
+                                                 low_quality)
+                try:
+                    articles = fetch(timeout)
+                except Exception as e:
+                    return self._cached_articles(user_query, theme, num_articles, budget,
+                                                 _failure_reason(e), low_quality)
+                articles = self._drop_low_quality(articles, low_quality)
+                if articles:
+                    self._ingest(articles)
+                    return articles
+            return []
+        finally:
+            budget.record('fetch', time.monotonic() - started)
+
+    def _fetch_increment(self, theme, conversation, num_articles, budget, low_quality=None):
+        """Articles for a follow-up's new aspect that the conversation doesn't have yet"""
+        started = time.monotonic()
+        try:
+            timeout = budget.stage_timeout('fetch')
+            if timeout <= 0:
+                budget.degrade('fetch', 'budget exhausted; answered from earlier articles')
+                return []
+            try:
+                articles = self.news_fetcher.search_news(query=theme, page_size=num_articles,
+                                                         timeout=timeout, raise_errors=True)
+            except Exception as e:
+                budget.degrade('fetch', f"{_failure_reason(e)}; answered from earlier articles")
+                return []
+            known = conversation.known_keys()
+            articles = [article for article in articles if article_key(article) not in known]
+            articles = self._drop_low_quality(articles, low_quality)
+            if articles:
+                self._ingest(articles)
+            return articles
+        finally:
+            budget.record('fetch', time.monotonic() - started)
+
+    def _drop_low_quality(self, articles, low_quality=None):
+        """Quality pre-filter, so junk is never indexed, scored or sent to the LLM"""
+        if not articles:
+            return articles
+        try:
+            kept, dropped = self.quality_filter.filter(articles)
+        except Exception as e:
+            print(f"Error in article quality filter: {e}")
+            return articles
+        if low_quality is not None:
+            low_quality.update(reason for _, reason in dropped)
+        return kept
+
+    def _cached_articles(self, user_query, theme, num_articles, budget, reason, low_quality=None):
+        """Degraded fetch: articles cached for the theme, else the local index (quality-filtered too)"""
+        articles, age = self.news_fetcher.get_cached(theme)
+        articles = self._drop_low_quality(articles, low_quality)
+        if articles:
+            budget.degrade('fetch', f"{reason}; served cached articles ({age:.0f}s old)")
+            return articles
+        if self.semantic_index is not None:
+            articles = [article for article, _ in self.semantic_index.search(user_query, k=num_articles * 2)]
+            articles = self._drop_low_quality(articles, low_quality)
+            if articles:
+                budget.degrade('fetch', f"{reason}; served {len(articles)} articles from the local index")
+                return articles
+        budget.degrade('fetch', f"{reason}; no cached articles")
+        return []
+
+    def _retrieve_local(self, user_query, k, budget):
+        """Semantic search over previously ingested articles (no network)"""
+        started = time.monotonic()
+        try:
+            if self.semantic_index is None:
+                return []
+            return [article for article, _ in self.semantic_index.search(user_query, k=k)]
+        finally:
+            budget.record('fetch', time.monotonic() - started)
+
+    def _ingest(self, articles):
+        """Hand freshly fetched articles to the local index and the story tracker"""
+        if self.semantic_index is not None:
+            try:
+                self.semantic_index.add(articles)
+            except Exception as e:
+                print(f"Error adding articles to the semantic index: {e}")
+        if self.story_tracker is not None:
+            try:
+                self.story_tracker.process(articles)
+            except Exception as e:
+                print(f"Error matching articles against watched topics: {e}")
+
+    def _filter_articles(self, articles, budget):
+        """Fake news filtering; skipped when the budget is already spent"""
+        started = time.monotonic()
+        try:
+            if budget.stage_timeout('filter') <= 0:
+                budget.degrade('filter', 'budget exhausted; articles not screened')
+                return articles, 0
+            real_articles, fake_count, _ = self.fake_detector.filter_fake_articles(articles)
+            return real_articles, fake_count
+        except Exception as e:
+            budget.degrade('filter', f"{_failure_reason(e)}; articles not screened")
+            return articles, 0
+        finally:
+            budget.record('filter', time.monotonic() - started)
+
+    def _answer(self, user_query, articles, budget, mode='llm'):
+        """LLM answer, degraded to an extractive summary of the articles"""
+        started = time.monotonic()
+        try:
+            if mode == 'extractive' or not articles:
+                return self.extractive.answer_from_news(user_query, articles)
+            timeout = budget.stage_timeout('answer')
+            if timeout <= 0:
+                budget.degrade('answer', 'budget exhausted')
+                return self.extractive.answer_from_news(user_query, articles)
+            return self.summarizer.answer_from_news(user_query, articles,
+                                                    timeout=timeout, raise_errors=True)
+        except Exception as e:
+            budget.degrade('answer', _failure_reason(e))
+            return self.extractive.answer_from_news(user_query, articles)
+        finally:
+            budget.record('answer', time.monotonic() - started)
+
+
+def _failure_reason(error):
+    """Short reason for the degradation log"""
+    name = type(error).__name__
+    if 'Timeout' in name:
+        return 'timed out'
+    if 'RateLimit' in name:
+        return 'rate limited'
+    return f"failed ({name})"
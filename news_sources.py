@@ -0,0 +1,409 @@
+import html
+import json
+import os
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from article import Article
+from lazy_imports import requests
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+DC = '{http://purl.org/dc/elements/1.1/}'
+MEDIA = '{http://search.yahoo.com/mrss/}'
+
+
+def normalize_article(raw):
+    """
+    Normalize a raw article dict into the _format_articles schema
+
+    Accepts NewsAPI-style dicts (source as {'name': ...}) and already formatted
+    dicts (source as a string).
+    """
+    if isinstance(raw, Article):
+        return raw
+    if isinstance(raw.get('source'), str):
+        raw = {**raw, 'source': {'name': raw['source']}}
+    return Article.from_newsapi(raw)
+
+
+def matches_query(article, query):
+    """True if every query word appears in the title or description"""
+    if not query:
+        return True
+    text = f"{article.get('title') or ''} {article.get('description') or ''}".lower()
+    return all(word in text for word in re.findall(r"\w+", query.lower()))
+
+
+def _plain_text(markup):
+    """Strip HTML tags and entities from feed text"""
+    if not markup:
+        return ''
+    text = re.sub(r'<[^>]+>', ' ', html.unescape(markup))
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def _iso_date(value):
+    """RFC 822 (RSS) or ISO 8601 (Atom) date as NewsAPI's ISO 8601 UTC string"""
+    if not value:
+        return ''
+    value = value.strip()
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return value
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class NewsSource:
+    """Interface for news source adapters"""
+
+    name = 'source'
+
+    def fetch(self, query=None, limit=20, timeout=None, **filters):
+        """
+        Fetch articles
+
+        Args:
+            query (str): Keywords to search for (None for latest articles)
+            limit (int): Maximum number of articles
+            timeout (float): Time limit in seconds, where the source supports it
+            **filters: Source-specific options such as category, country or
+                       headlines=True (top stories rather than a search);
+                       sources that don't support them ignore them
+
+        Returns:
+            list: Article records in the _format_articles schema
+        """
+        raise NotImplementedError
+
+
+class NewsAPISource(NewsSource):
+    """
+    NewsAPI /everything for queries, /top-headlines for headlines=True, a
+    category, or no query
+
+    An empty search is returned as is; the caller decides whether to spend
+    another request on top headlines.
+    """
+
+    name = 'newsapi'
+
+    def __init__(self, news_fetcher=None, country='us'):
+        if news_fetcher is None:
+            from news_fetcher import NewsFetcher
+            news_fetcher = NewsFetcher()
+        self.news_fetcher = news_fetcher
+        self.country = country
+
+    def fetch(self, query=None, limit=20, timeout=None, category=None, country=None, headlines=False,
+              **filters):
+        page_size = min(limit, 100)
+        if query and not category and not headlines:
+            return self.news_fetcher.search_news(query, page_size=page_size, timeout=timeout,
+                                                 raise_errors=True)
+        return self.news_fetcher.get_top_headlines(query=query, category=category,
+                                                   country=country or self.country, page_size=page_size,
+                                                   timeout=timeout, raise_errors=True)
+
+
+class RSSSource(NewsSource):
+    """
+    RSS 2.0 or Atom feed from a URL or a local file
+
+    The feed is parsed incrementally with iterparse straight from the response
+    stream, and each item is discarded once converted, so large feeds are never
+    held in memory as a whole tree.
+    """
+
+    def __init__(self, location, name=None):
+        """
+        Args:
+            location (str): http(s) URL or path of the feed
+            name (str): Source name used when items don't carry one
+        """
+        self.location = location
+        if name is None:
+            host = re.match(r'https?://(?:www\.)?([^/]+)', location)
+            name = host.group(1) if host else os.path.basename(location)
+        self.name = name
+
+    def fetch(self, query=None, limit=20, timeout=None, **filters):
+        if re.match(r'https?://', self.location):
+            with requests.get(self.location, stream=True, timeout=timeout or 10) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                return self._parse(response.raw, query, limit)
+        with open(self.location, 'rb') as f:
+            return self._parse(f, query, limit)
+
+    def _parse(self, stream, query, limit):
+        articles = []
+        # The feed's own <title> ends before the first item or entry does
+        feed_title = None
+        for event, element in ET.iterparse(stream, events=('end',)):
+            tag = element.tag
+            if tag in ('title', ATOM + 'title') and feed_title is None:
+                feed_title = (element.text or '').strip()
+            if tag == 'item':
+                article = self._rss_item(element, feed_title)
+            elif tag == ATOM + 'entry':
+                article = self._atom_entry(element, feed_title)
+            else:
+                continue
+            element.clear()
+            if matches_query(article, query):
+                articles.append(article)
+                if len(articles) >= limit:
+                    break
+        return articles
+
+    def _rss_item(self, item, feed_title):
+        media = item.find(MEDIA + 'content')
+        enclosure = item.find('enclosure')
+        image = media.get('url') if media is not None else (
+            enclosure.get('url') if enclosure is not None else '')
+        description = _plain_text(item.findtext('description'))
+        return Article(
+            title=_plain_text(item.findtext('title')) or 'No title',
+            description=description or 'No description',
+            content=_plain_text(item.findtext('{http://purl.org/rss/1.0/modules/content/}encoded'))
+            or description or 'No content',
+            source=item.findtext('source') or feed_title or self.name,
+            author=item.findtext(DC + 'creator') or item.findtext('author') or 'Unknown',
+            url=(item.findtext('link') or '').strip(),
+            publishedAt=_iso_date(item.findtext('pubDate') or item.findtext(DC + 'date')),
+            urlToImage=image
+        )
+
+    def _atom_entry(self, entry, feed_title):
+        url = ''
+        for link in entry.findall(ATOM + 'link'):
+            if link.get('rel', 'alternate') == 'alternate':
+                url = link.get('href', '')
+                break
+        summary = _plain_text(entry.findtext(ATOM + 'summary'))
+        content = _plain_text(entry.findtext(ATOM + 'content'))
+        return Article(
+            title=_plain_text(entry.findtext(ATOM + 'title')) or 'No title',
+            description=summary or content or 'No description',
+            content=content or summary or 'No content',
+            source=feed_title or self.name,
+            author=entry.findtext(f'{ATOM}author/{ATOM}name') or 'Unknown',
+            url=url,
+            publishedAt=_iso_date(entry.findtext(ATOM + 'published') or entry.findtext(ATOM + 'updated')),
+            urlToImage=''
+        )
+
+
+class JSONLSource(NewsSource):
+    """Local JSON Lines feed, one article per line (NewsAPI or formatted schema)"""
+
+    def __init__(self, path, name=None):
+        self.path = path
+        self.name = name or os.path.basename(path)
+
+    def fetch(self, query=None, limit=20, timeout=None, **filters):
+        articles = []
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                article = normalize_article(json.loads(line))
+                if matches_query(article, query):
+                    articles.append(article)
+                    if len(articles) >= limit:
+                        break
+        return articles
+
+
+class NewsAggregator:
+    """
+    Queries several news sources concurrently and merges their articles
+
+    Offers the same search_news / get_top_headlines / get_cached interface as
+    NewsFetcher, so the chat pipeline can use it in its place.
+    """
+
+    def __init__(self, sources, max_workers=None, timeout=10, concurrent_fetches=8):
+        """
+        Args:
+            sources (list): NewsSource adapters
+            max_workers (int): Worker threads (default: one per source for each of
+                concurrent_fetches callers)
+            timeout (float): Default time limit for a whole aggregated fetch
+            concurrent_fetches (int): Aggregated fetches expected at once; the
+                aggregator is shared by every chat session and the story tracker
+        """
+        self.sources = list(sources)
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or max(1, len(self.sources)) * concurrent_fetches,
+            thread_name_prefix='news-source')
+        self._stats = {source.name: {'calls': 0, 'errors': 0, 'timeouts': 0, 'busy': 0, 'articles': 0,
+                                     'total_seconds': 0.0, 'last_seconds': None, 'last_error': None}
+                       for source in self.sources}
+        self._stats_lock = threading.Lock()
+        # Shared by every session, so results are only ever served for the query that fetched them
+        self._cache = {}
+        self._cache_size = 50
+        self._cache_lock = threading.Lock()
+
+    def fetch(self, query=None, limit=20, timeout=None, raise_errors=False, **filters):
+        """
+        Fetch from every source at once and merge the results
+
+        Articles are de-duplicated by URL and by title, then sorted newest first.
+        A source only gets the time left when a worker picks it up, so waiting
+        for a free worker never extends the fetch; sources that never got a
+        worker count as 'busy' rather than 'timeouts'.
+
+        Args:
+            query (str): Keywords (None for latest articles)
+            limit (int): Maximum number of merged articles
+            timeout (float): Time limit for the whole fetch; slower sources are skipped
+            raise_errors (bool): Raise if every source failed
+            **filters: Passed to every source (e.g. category, country)
+
+        Returns:
+            list: Merged Article records
+        """
+        timeout = timeout if timeout is not None else self.timeout
+        deadline = time.monotonic() + timeout
+        futures = [(source, self._executor.submit(self._fetch_one, source, query, limit, deadline, filters))
+                   for source in self.sources]
+        done, _ = wait([future for _, future in futures], timeout=timeout)
+
+        # Results stay in source order, so duplicates keep the first configured source's copy
+        results = []
+        errors = []
+        for source, future in futures:
+            if future not in done:
+                # Still queued: every worker was busy with other callers' fetches
+                busy = future.cancel()
+                with self._stats_lock:
+                    self._stats[source.name]['busy' if busy else 'timeouts'] += 1
+                errors.append(TimeoutError(f"{source.name} {'had no free worker' if busy else 'did not answer'} "
+                                           f"within {timeout}s"))
+                continue
+            articles, error = future.result()
+            if error is None:
+                results.append(articles)
+            else:
+                errors.append(error)
+
+        if not results and errors and raise_errors:
+            raise errors[0]
+
+        merged = self.merge(results, limit)
+        if merged and query and not filters:
+            with self._cache_lock:
+                self._cache[query.lower()] = (time.time(), merged)
+                if len(self._cache) > self._cache_size:
+                    oldest = min(self._cache, key=lambda key: self._cache[key][0])
+                    del self._cache[oldest]
+        return merged
+
+    def _fetch_one(self, source, query, limit, deadline, filters):
+        started = time.monotonic()
+        articles, error = [], None
+        try:
+            timeout = deadline - started
+            if timeout <= 0:
+                raise TimeoutError(f"{source.name} waited for a worker past the deadline")
+            articles = [normalize_article(a) for a in source.fetch(query=query, limit=limit, timeout=timeout, **filters)]
+        except Exception as e:
+            error = e
+            print(f"Error fetching from {source.name}: {e}")
+        elapsed = time.monotonic() - started
+        with self._stats_lock:
+            stats = self._stats[source.name]
+            stats['calls'] += 1
+            stats['total_seconds'] += elapsed
+            stats['last_seconds'] = elapsed
+            stats['articles'] += len(articles)
+            if error is not None:
+                stats['errors'] += 1
+                stats['last_error'] = str(error)
+        return articles, error
+
+    @staticmethod
+    def merge(results, limit):
+        """De-duplicate by URL and normalized title, newest first"""
+        merged = []
+        seen = set()
+        for articles in results:
+            for article in articles:
+                title_key = re.sub(r'\W+', ' ', (article.title or '').lower()).strip()
+                keys = {article.url, title_key} - {'', None}
+                if keys & seen:
+                    continue
+                seen |= keys
+                merged.append(article)
+        merged.sort(key=lambda article: article.publishedAt or '', reverse=True)
+        return merged[:limit]
+
+    def stats(self):
+        """
+        Per-source latency and error statistics
+
+        Returns:
+            dict: source name -> calls, errors, timeouts, busy (no free worker), articles,
+                  avg/last seconds, last error
+        """
+        with self._stats_lock:
+            report = {}
+            for name, stats in self._stats.items():
+                report[name] = dict(stats)
+                report[name]['avg_seconds'] = (stats['total_seconds'] / stats['calls']) if stats['calls'] else None
+            return report
+
+    # NewsFetcher-compatible interface used by NewsPipeline
+
+    def search_news(self, query, language='en', sort_by='publishedAt', page_size=5,
+                    timeout=None, raise_errors=False):
+        return self.fetch(query=query, limit=page_size, timeout=timeout, raise_errors=raise_errors)
+
+    def get_top_headlines(self, query=None, category=None, country='us', page_size=5,
+                          timeout=None, raise_errors=False):
+        filters = {'country': country, 'headlines': True}
+        if category:
+            filters['category'] = category
+        return self.fetch(query=query, limit=page_size, timeout=timeout, raise_errors=raise_errors, **filters)
+
+    def get_cached(self, query=None):
+        with self._cache_lock:
+            entry = self._cache.get(query.lower()) if query else None
+        if entry is None:
+            return [], None
+        fetched_at, articles = entry
+        return articles, time.time() - fetched_at
+
+    def warm_up(self):
+        for source in self.sources:
+            if hasattr(source, 'news_fetcher'):
+                source.news_fetcher.warm_up()
+
+
+def sources_from_env(news_fetcher=None):
+    """
+    News sources configured through the environment
+
+    NewsAPI is always included; RSS_FEEDS adds comma-separated RSS/Atom feed URLs
+    or paths and LOCAL_FEED_PATH adds a JSON Lines feed.
+
+    Returns:
+        list: NewsSource adapters
+    """
+    sources = [NewsAPISource(news_fetcher)]
+    for location in filter(None, (f.strip() for f in os.getenv('RSS_FEEDS', '').split(','))):
+        sources.append(RSSSource(location))
+    if os.getenv('LOCAL_FEED_PATH'):
+        sources.append(JSONLSource(os.getenv('LOCAL_FEED_PATH')))
+    return sources
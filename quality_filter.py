@@ -0,0 +1,278 @@
+import re
+import threading
+from collections import Counter
+import numpy as np
+
+# A few sentences of news prose per language; the language ID model is the
+# byte trigram distribution of each sample
+LANGUAGE_SAMPLES = {
+    'en': "The government said on Tuesday that the new policy would take effect next month. "
+          "Officials confirmed the report after the meeting with business leaders and workers. "
+          "Prices have risen faster than expected, and the central bank is watching the market closely. "
+          "Scientists say the study shows that the climate is changing more quickly than they thought. "
+          "The company announced its results for the year, which were better than analysts had forecast. "
+          "Stocks slipped as investors weighed the latest jobs data and rising interest rates. "
+          "Thousands of people were forced to leave their homes when the wildfire spread overnight. "
+          "The team won the championship with a late goal, ending a long run without a trophy. "
+          "Lawmakers are divided over whether to extend subsidies for electric vehicles and batteries. "
+          "Researchers discovered a new species in the rainforest during an expedition last summer. "
+          "The storm made landfall with strong winds and heavy rain, cutting power to millions of homes. "
+          "A court blocked the rule nationwide, saying the agency had overstepped its authority. "
+          "Workers at the warehouse voted to join a union after months of campaigning over pay. "
+          "The prime minister faces a confidence vote in parliament after several ministers resigned. "
+          "Tech giants unveiled new phones, chips and software at their annual launch events. "
+          "Sales growth slowed despite price cuts, and profits fell short of what markets had hoped. "
+          "Doctors warn of rising cases of measles and flu as hospitals struggle with staff shortages. "
+          "The satellite was launched from Florida and will study the surface of the moon and Mars.",
+    'es': "El gobierno dijo el martes que la nueva política entrará en vigor el próximo mes. "
+          "Los funcionarios confirmaron el informe después de la reunión con los empresarios y trabajadores. "
+          "Los precios han subido más rápido de lo esperado y el banco central vigila el mercado. "
+          "Los científicos dicen que el estudio muestra que el clima está cambiando más rápido de lo que pensaban. "
+          "El presidente anunció nuevas medidas contra la inflación y la selección ganó el campeonato. "
+          "Miles de personas tuvieron que abandonar sus casas por el incendio durante la noche.",
+    'fr': "Le gouvernement a déclaré mardi que la nouvelle politique entrera en vigueur le mois prochain. "
+          "Les responsables ont confirmé le rapport après la réunion avec les chefs d'entreprise et les salariés. "
+          "Les prix ont augmenté plus vite que prévu et la banque centrale surveille le marché de près. "
+          "Les scientifiques disent que l'étude montre que le climat change plus vite qu'ils ne le pensaient. "
+          "Les agriculteurs manifestent à Paris contre les nouvelles normes et le budget de l'année prochaine. "
+          "Des milliers de personnes ont dû quitter leur maison à cause de l'incendie pendant la nuit.",
+    'de': "Die Regierung sagte am Dienstag, dass die neue Politik im nächsten Monat in Kraft treten werde. "
+          "Die Beamten bestätigten den Bericht nach dem Treffen mit Unternehmern und Arbeitnehmern. "
+          "Die Preise sind schneller gestiegen als erwartet, und die Zentralbank beobachtet den Markt genau. "
+          "Wissenschaftler sagen, die Studie zeige, dass sich das Klima schneller verändert als gedacht. "
+          "Die Bahn streikt erneut in ganz Deutschland, und die Bundesregierung einigt sich auf den Haushalt. "
+          "Tausende Menschen mussten wegen des Feuers in der Nacht ihre Häuser verlassen.",
+    'it': "Il governo ha detto martedì che la nuova politica entrerà in vigore il mese prossimo. "
+          "I funzionari hanno confermato il rapporto dopo la riunione con gli imprenditori e i lavoratori. "
+          "I prezzi sono saliti più velocemente del previsto e la banca centrale osserva il mercato da vicino. "
+          "Gli scienziati dicono che lo studio mostra che il clima sta cambiando più in fretta del previsto. "
+          "Il governo approva la riforma della giustizia e la squadra vince il derby della città. "
+          "Migliaia di persone hanno dovuto lasciare le loro case a causa dell'incendio durante la notte.",
+    'pt': "O governo disse na terça-feira que a nova política entrará em vigor no próximo mês. "
+          "Os funcionários confirmaram o relatório depois da reunião com os empresários e os trabalhadores. "
+          "Os preços subiram mais rápido do que o esperado e o banco central observa o mercado de perto. "
+          "Os cientistas dizem que o estudo mostra que o clima está mudando mais rápido do que pensavam. "
+          "O Brasil registra recorde de exportações e o presidente anuncia novas medidas econômicas. "
+          "Milhares de pessoas tiveram que deixar suas casas por causa do incêndio durante a noite.",
+    'nl': "De regering zei dinsdag dat het nieuwe beleid volgende maand van kracht wordt. "
+          "De ambtenaren bevestigden het rapport na de vergadering met ondernemers en werknemers. "
+          "De prijzen zijn sneller gestegen dan verwacht en de centrale bank houdt de markt nauwlettend in de gaten. "
+          "Wetenschappers zeggen dat het onderzoek laat zien dat het klimaat sneller verandert dan gedacht. "
+          "Het kabinet kondigt nieuwe maatregelen aan tegen de woningnood en de stijgende energieprijzen. "
+          "Duizenden mensen moesten hun huizen verlaten vanwege de brand die 's nachts uitbrak.",
+}
+
+# Phrases that mark scraped page furniture rather than article text (matched lowercase).
+# News can quote them too, so a description only counts as boilerplate when they
+# make up most of it (see QualityFilter.filter)
+BOILERPLATE = re.compile(
+    r"\b(?:subscribe (?:now|today|to (?:read|continue))|sign up for (?:our|the) newsletter|"
+    r"click here|enable javascript|javascript is (?:disabled|required)|accept (?:all )?cookies|"
+    r"we use cookies|this content is (?:not available|for subscribers)|log ?in to continue|"
+    r"continue reading|access denied|page not found|404 not found|(?:complete|solve) the captcha|"
+    r"verify (?:that )?you are (?:a )?human)\b")
+
+# Feed descriptions often end in a link label ("... Continue reading..."); it is stripped, not judged
+_TRAILER = re.compile(r"\s*\b(?:continue reading|read more)\W*$")
+
+_PLACEHOLDERS = {'', 'no title', 'no description', 'no content', 'none', 'null'}
+_TRUNCATION = re.compile(r"\s*(?:…|\.\.\.)?\s*\[\+\d+ chars\]")
+
+
+class QualityFilter:
+    """
+    Drops articles that are not worth scoring, indexing or sending to the LLM
+
+    Reasons: removed by the publisher ("[Removed]"), empty, written in another
+    language, too short, or boilerplate page text. The batch is joined into one
+    string so the boilerplate regex runs once, and language ID is a naive Bayes
+    model over hashed UTF-8 byte trigrams computed for the whole batch with
+    numpy, fitted on the samples in LANGUAGE_SAMPLES.
+    """
+
+    REASONS = ('removed', 'empty', 'language', 'too_short', 'boilerplate')
+    TABLE_BITS = 18
+
+    def __init__(self, language='en', min_words=6, min_trigrams=20, margin=0.2, max_chars=300,
+                 max_foreign_script=0.3):
+        """
+        Args:
+            language (str): Language to keep (a LANGUAGE_SAMPLES key), None to keep all
+            min_words (int): Minimum words in title + description
+            min_trigrams (int): Known trigrams needed before the language is judged;
+                shorter texts get the benefit of the doubt
+            margin (float): Average log-likelihood per trigram by which another
+                language must beat the wanted one
+            max_chars (int): Characters of each article used for language ID
+            max_foreign_script (float): Largest share of non-Latin characters kept
+        """
+        if language is not None and language not in LANGUAGE_SAMPLES:
+            raise ValueError(f"Unknown language '{language}', expected one of {sorted(LANGUAGE_SAMPLES)}")
+        self.language = language
+        self.min_words = min_words
+        self.min_trigrams = min_trigrams
+        self.margin = margin
+        self.max_chars = max_chars
+        self.max_foreign_script = max_foreign_script
+        self.languages = list(LANGUAGE_SAMPLES)
+        self._weights = None
+        self._lock = threading.Lock()
+        self._counts = Counter()
+
+    def warm_up(self):
+        """Fit the language model ahead of the first batch"""
+        self._language_model()
+
+    def _trigram_buckets(self, data):
+        """Hashed trigram bucket of every byte position (the last two are padding)"""
+        codes = data.astype(np.uint32)
+        trigrams = (codes[:-2] << 16) | (codes[1:-1] << 8) | codes[2:]
+        return ((trigrams * np.uint32(2654435761)) >> np.uint32(32 - self.TABLE_BITS)).astype(np.int64)
+
+    def _language_model(self):
+        with self._lock:
+            if self._weights is None:
+                size = 1 << self.TABLE_BITS
+                counts = np.zeros((size, len(self.languages)), dtype=np.float64)
+                for column, language in enumerate(self.languages):
+                    data = np.frombuffer(LANGUAGE_SAMPLES[language].lower().encode('utf-8'), dtype=np.uint8)
+                    counts[:, column] = np.bincount(self._trigram_buckets(data), minlength=size)
+                # Laplace-smoothed log P(trigram | language) over the trigrams seen in any
+                # sample; trigrams seen in none carry no evidence
+                known = counts.sum(axis=1) > 0
+                smoothed = counts[known] + 1.0
+                weights = np.zeros_like(counts, dtype=np.float32)
+                weights[known] = np.log(smoothed / smoothed.sum(axis=0))
+                self._known = known
+                self._weights = weights
+        return self._weights
+
+    def _byte_stats(self, joined, count):
+        """Per-text language scores, known trigram counts and non-Latin character share"""
+        weights = self._language_model()
+        data = np.frombuffer(joined.encode('utf-8'), dtype=np.uint8)
+        # Text i spans the bytes between the (i-1)th and ith newline
+        doc = np.zeros(len(data), dtype=np.int64)
+        doc[1:] = np.cumsum(data[:-1] == 10)
+
+        buckets = self._trigram_buckets(data)
+        start_doc = doc[:-2]
+        # Drop trigrams that straddle two texts
+        valid = start_doc == doc[2:]
+        buckets, start_doc = buckets[valid], start_doc[valid]
+        known = self._known[buckets]
+        buckets, start_doc = buckets[known], start_doc[known]
+
+        scores = np.empty((count, len(self.languages)), dtype=np.float64)
+        for column in range(len(self.languages)):
+            scores[:, column] = np.bincount(start_doc, weights=weights[buckets, column], minlength=count)
+        known_counts = np.bincount(start_doc, minlength=count)
+
+        # UTF-8 lead bytes of Greek, Cyrillic, Hebrew, Arabic, Indic, CJK, ... (not Latin or punctuation)
+        foreign = ((data >= 0xCD) & (data <= 0xDF)) | ((data >= 0xE3) & (data <= 0xED)) | (data >= 0xF0)
+        characters = (data < 0x80) | (data >= 0xC0)
+        foreign_share = (np.bincount(doc, weights=foreign, minlength=count)
+                         / np.maximum(np.bincount(doc, weights=characters, minlength=count), 1))
+        return scores, known_counts, foreign_share
+
+    def detect_languages(self, texts):
+        """
+        Most likely language of each text
+
+        Returns:
+            list: Language code per text, or None where there is too little known text
+        """
+        if not texts:
+            return []
+        joined = "\n".join(text[:self.max_chars].replace("\n", " ").lower() for text in texts)
+        scores, known, _ = self._byte_stats(joined, len(texts))
+        best = scores.argmax(axis=1)
+        return [self.languages[b] if k >= self.min_trigrams else None for b, k in zip(best, known)]
+
+    def filter(self, articles):
+        """
+        Split articles into those worth keeping and those dropped
+
+        Args:
+            articles (list): Articles with title and description
+
+        Returns:
+            tuple: (kept_articles, dropped) where dropped is a list of (article, reason)
+        """
+        if not articles:
+            return [], []
+        count = len(articles)
+        removed = np.zeros(count, dtype=bool)
+        empty = np.zeros(count, dtype=bool)
+        texts = []
+        title_lengths = []
+        for i, article in enumerate(articles):
+            title = (article.get('title') or '').strip()
+            description = (article.get('description') or '').strip()
+            if '[Removed]' in (title, description) or article.get('url') == 'https://removed.com':
+                removed[i] = True
+            if title.lower() in _PLACEHOLDERS:
+                empty[i] = True
+            if description.lower() in _PLACEHOLDERS:
+                description = ''
+            text = f"{title} {description}".lower()
+            if '[+' in text:
+                text = _TRUNCATION.sub('', text)
+            if 'continue reading' in text or 'read more' in text:
+                text = _TRAILER.sub('', text)
+            text = text[:self.max_chars].replace("\n", " ")
+            texts.append(text)
+            title_lengths.append(min(len(title.lower()), len(text)))
+
+        words = np.fromiter((len(text.split()) for text in texts), dtype=np.int32, count=count)
+        joined = "\n".join(texts)
+
+        # One regex pass over the whole batch, mapped back to texts by offset. A
+        # description is boilerplate when page-furniture phrases cover a third of it or
+        # it has two of them; a single phrase quoted in a story is kept
+        boilerplate = np.zeros(count, dtype=bool)
+        ends = np.cumsum(np.fromiter((len(text) + 1 for text in texts), dtype=np.int64, count=count))
+        hits = np.zeros(count, dtype=np.int32)
+        hit_chars = np.zeros(count, dtype=np.int64)
+        for match in BOILERPLATE.finditer(joined):
+            i = np.searchsorted(ends, match.start(), side='right')
+            if match.start() - (ends[i] - len(texts[i]) - 1) > title_lengths[i]:
+                hits[i] += 1
+                hit_chars[i] += match.end() - match.start()
+        if hits.any():
+            lengths = np.fromiter((len(text) - tl - 1 for text, tl in zip(texts, title_lengths)),
+                                  dtype=np.int64, count=count)
+            boilerplate = (hits >= 2) | ((hits > 0) & (hit_chars * 3 >= lengths))
+
+        foreign = np.zeros(count, dtype=bool)
+        if self.language is not None:
+            scores, known, foreign_share = self._byte_stats(joined, count)
+            wanted = scores[:, self.languages.index(self.language)]
+            lead = (scores.max(axis=1) - wanted) / np.maximum(known, 1)
+            foreign = (foreign_share > self.max_foreign_script) | (
+                (known >= self.min_trigrams) & (lead > self.margin))
+
+        reason_masks = (('removed', removed), ('empty', empty), ('language', foreign),
+                        ('too_short', words < self.min_words), ('boilerplate', boilerplate))
+        reasons = [None] * count
+        for reason, mask in reason_masks:
+            for i in np.flatnonzero(mask):
+                reasons[i] = reasons[i] or reason
+
+        kept = [article for article, reason in zip(articles, reasons) if reason is None]
+        dropped = [(article, reason) for article, reason in zip(articles, reasons) if reason is not None]
+        with self._lock:
+            self._counts['checked'] += count
+            self._counts['kept'] += len(kept)
+            self._counts.update(reason for _, reason in dropped)
+        return kept, dropped
+
+    def stats(self):
+        """
+        Totals since start
+
+        Returns:
+            dict: checked, kept and the count dropped for each reason
+        """
+        with self._lock:
+            return {key: self._counts.get(key, 0) for key in ('checked', 'kept') + self.REASONS}
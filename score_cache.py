@@ -0,0 +1,124 @@
+import hashlib
+import sqlite3
+import threading
+import time
+
+
+def file_fingerprint(*paths):
+    """
+    Content hash of one or more files, used as the model version
+
+    Args:
+        *paths: Files to hash (e.g. model.pkl and vector.pkl)
+
+    Returns:
+        str: Hex digest that changes whenever any of the files changes
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        digest.update(b'\0')
+    return digest.hexdigest()[:16]
+
+
+class ScoreCache:
+    """
+    Persistent fake-news score cache shared across processes
+
+    Backed by SQLite in WAL mode so several Streamlit sessions and workers can
+    read and write the same file. Keys are content hashes of the preprocessed
+    text; entries from other model versions are ignored and pruned on open.
+    """
+
+    # SQLite limits the number of bound parameters per statement
+    BATCH = 500
+
+    def __init__(self, path, model_version):
+        """
+        Args:
+            path (str): SQLite database file
+            model_version (str): Version of the model and vectorizer producing the scores
+        """
+        self.path = str(path)
+        self.model_version = model_version
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS scores ("
+            " key TEXT PRIMARY KEY,"
+            " version TEXT NOT NULL,"
+            " is_fake INTEGER NOT NULL,"
+            " confidence REAL NOT NULL,"
+            " created REAL NOT NULL)"
+        )
+        # Scores from an older model are never valid again
+        with self._conn:
+            self._conn.execute("DELETE FROM scores WHERE version != ?", (model_version,))
+
+    def key(self, processed_text):
+        """Cache key for preprocessed text under the current model version"""
+        return hashlib.sha256(f"{self.model_version}\0{processed_text}".encode('utf-8')).hexdigest()
+
+    def get_many(self, keys):
+        """
+        Look up several scores at once
+
+        Args:
+            keys (list): Cache keys from key()
+
+        Returns:
+            dict: key -> (is_fake, confidence) for the keys that were found
+        """
+        found = {}
+        keys = list(dict.fromkeys(keys))
+        with self._lock:
+            for start in range(0, len(keys), self.BATCH):
+                chunk = keys[start:start + self.BATCH]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, is_fake, confidence FROM scores "
+                    f"WHERE version = ? AND key IN ({placeholders})",
+                    [self.model_version, *chunk]
+                ).fetchall()
+                for key, is_fake, confidence in rows:
+                    found[key] = (bool(is_fake), confidence)
+        return found
+
+    def put_many(self, scores):
+        """
+        Store several scores at once
+
+        Args:
+            scores (dict): key -> (is_fake, confidence)
+        """
+        if not scores:
+            return
+        now = time.time()
+        rows = [(key, self.model_version, int(bool(is_fake)), float(confidence), now)
+                for key, (is_fake, confidence) in scores.items()]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO scores (key, version, is_fake, confidence, created) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    def put(self, key, is_fake, confidence):
+        self.put_many({key: (is_fake, confidence)})
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM scores WHERE version = ?", (self.model_version,)
+            ).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
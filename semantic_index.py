@@ -0,0 +1,292 @@
+import json
+import os
+import threading
+from pathlib import Path
+import numpy as np
+from article import Article
+from lazy_imports import sklearn_text
+
+
+class HashingEmbedder:
+    """
+    CPU-only text embeddings: hashed word and character n-grams
+
+    Signed feature hashing is a random projection of the bag-of-ngrams, so
+    texts that share words or word pieces ("election"/"elections",
+    "battery plant"/"battery plants") land close together in cosine space.
+    """
+
+    def __init__(self, dim=512, char_weight=0.5):
+        """
+        Args:
+            dim (int): Embedding size
+            char_weight (float): Weight of character n-grams relative to words
+        """
+        self.dim = dim
+        self.char_weight = char_weight
+        self._words = None
+        self._chars = None
+
+    def _build(self):
+        self._words = sklearn_text.HashingVectorizer(n_features=self.dim, ngram_range=(1, 2), stop_words='english',
+                                        alternate_sign=True, norm='l2')
+        self._chars = sklearn_text.HashingVectorizer(n_features=self.dim, analyzer='char_wb', ngram_range=(3, 5),
+                                        alternate_sign=True, norm='l2')
+
+    def embed(self, texts):
+        """
+        Args:
+            texts (list): Texts to embed
+
+        Returns:
+            numpy.ndarray: float32 matrix (len(texts), dim) with unit-length rows
+        """
+        if self._words is None:
+            self._build()
+        matrix = self._words.transform(texts) + self.char_weight * self._chars.transform(texts)
+        vectors = matrix.toarray().astype(np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+class SemanticIndex:
+    """
+    Local semantic search over ingested articles
+
+    Embeddings live in a memory-mapped float32 matrix on disk and articles in an
+    append-only JSONL file next to it, so the index survives restarts and grows
+    incrementally. Small corpora are searched brute force; above
+    `ivf_threshold` articles an inverted-file (IVF) index over k-means clusters
+    narrows the search to the closest clusters.
+    """
+
+    def __init__(self, index_dir=None, dim=512, ivf_threshold=20000, nprobe=8):
+        """
+        Args:
+            index_dir (str): Directory for the index files (default: SEMANTIC_INDEX_DIR
+                or 'news_index' next to this file)
+            dim (int): Embedding size (must match an existing index)
+            ivf_threshold (int): Corpus size above which the IVF index is used
+            nprobe (int): Clusters searched per query with the IVF index
+        """
+        self.index_dir = Path(index_dir or os.getenv('SEMANTIC_INDEX_DIR')
+                              or Path(__file__).parent / "news_index")
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = self.index_dir / "vectors.f32"
+        self.articles_path = self.index_dir / "articles.jsonl"
+        self.meta_path = self.index_dir / "meta.json"
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+
+        meta = {'dim': dim, 'count': 0}
+        if self.meta_path.exists():
+            meta = json.loads(self.meta_path.read_text())
+        self.dim = meta['dim']
+        self.count = meta['count']
+        self.embedder = HashingEmbedder(self.dim)
+
+        # Articles and vectors are read on the first add() or search()
+        self.articles = None
+        self._keys = {}
+        self._vectors = None
+        self._capacity = 0
+        self._ivf = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """Read the article file and map the vectors"""
+        articles = []
+        if self.articles_path.exists():
+            with open(self.articles_path, encoding='utf-8') as f:
+                for line in f:
+                    article = Article.from_dict(json.loads(line))
+                    self._keys[article.key] = len(articles)
+                    articles.append(article)
+        # meta.json is written last, so its count is what a completed add() left behind
+        self.count = min(self.count, len(articles))
+        if len(articles) > self.count:
+            for article in articles[self.count:]:
+                del self._keys[article.key]
+            del articles[self.count:]
+            with open(self.articles_path, 'w', encoding='utf-8') as f:
+                for article in articles:
+                    f.write(json.dumps(article.to_dict()) + "\n")
+        self._open_vectors(max(self.count, 1024))
+        self.articles = articles
+
+    def warm_up(self):
+        """Load the index and the embedder ahead of the first query"""
+        with self._lock:
+            if self.articles is None:
+                self._load()
+        self.embedder.embed(["warm up"])
+
+    def _open_vectors(self, capacity):
+        """(Re)map the vector file with room for `capacity` rows"""
+        if self._vectors is not None:
+            self._vectors.flush()
+            del self._vectors
+        size = capacity * self.dim * 4
+        with open(self.vectors_path, 'ab') as f:
+            if f.tell() < size:
+                f.truncate(size)
+        self._capacity = capacity
+        self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode='r+',
+                                  shape=(capacity, self.dim))
+
+    def __len__(self):
+        return self.count
+
+    @staticmethod
+    def _text(article):
+        return " ".join(part for part in (article.get('title'), article.get('description'))
+                        if part and part not in ('No title', 'No description'))
+
+    def add(self, articles):
+        """
+        Append articles not yet in the index
+
+        Args:
+            articles (list): Articles (dicts or Article records)
+
+        Returns:
+            int: Number of articles added
+        """
+        with self._lock:
+            if self.articles is None:
+                self._load()
+            return self._add(articles)
+
+    def _add(self, articles):
+        new = []
+        new_keys = set()
+        for article in articles:
+            if not isinstance(article, Article):
+                article = Article.from_dict(article)
+            if article.key in self._keys or article.key in new_keys or not self._text(article):
+                continue
+            new_keys.add(article.key)
+            new.append(article)
+        if not new:
+            return 0
+
+        vectors = self.embedder.embed([self._text(article) for article in new])
+        start, end = self.count, self.count + len(new)
+        if end > self._capacity:
+            self._open_vectors(max(end, self._capacity * 2))
+        self._vectors[start:end] = vectors
+        self._vectors.flush()
+
+        with open(self.articles_path, 'a', encoding='utf-8') as f:
+            for offset, article in enumerate(new):
+                f.write(json.dumps(article.to_dict()) + "\n")
+                self._keys[article.key] = start + offset
+        self.articles.extend(new)
+        self.count = end
+        self.meta_path.write_text(json.dumps({'dim': self.dim, 'count': self.count}))
+
+        if self._ivf is not None:
+            self._ivf.add(vectors, start)
+        return len(new)
+
+    def search(self, query, k=5, min_score=0.05):
+        """
+        Find the articles most similar to a query
+
+        Args:
+            query (str): Free-text query
+            k (int): Number of results
+            min_score (float): Drop results below this cosine similarity
+
+        Returns:
+            list: (article, score) tuples, best first
+        """
+        if not self.count or not query:
+            return []
+        query_vector = self.embedder.embed([query])[0]
+        if not query_vector.any():
+            return []
+
+        with self._lock:
+            if self.articles is None:
+                self._load()
+            if not self.count:
+                return []
+            if self.count > self.ivf_threshold:
+                ids, scores = self._ivf_index().search(self._vectors, query_vector, k, self.nprobe)
+            else:
+                ids, scores = top_k(self._vectors[:self.count] @ query_vector, k)
+
+        return [(self.articles[i], float(score)) for i, score in zip(ids, scores) if score >= min_score]
+
+    def _ivf_index(self):
+        """Build the IVF index on first use; retrain once the corpus has doubled"""
+        if self._ivf is None or self.count > 2 * self._ivf.trained_on:
+            self._ivf = IVFIndex.train(self._vectors[:self.count])
+        return self._ivf
+
+
+def top_k(scores, k):
+    """Indices and values of the k largest scores, best first"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.float32)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    order = candidates[np.argsort(-scores[candidates], kind='stable')]
+    return order, scores[order]
+
+
+class IVFIndex:
+    """Inverted-file index: spherical k-means clusters with a posting list of row ids each"""
+
+    def __init__(self, centroids, assignments, trained_on):
+        self.centroids = centroids
+        self.trained_on = trained_on
+        self.lists = [list(np.flatnonzero(assignments == c)) for c in range(len(centroids))]
+
+    @classmethod
+    def train(cls, vectors, n_clusters=None, iterations=10, sample_size=50000, seed=0):
+        """
+        Cluster the vectors and assign every row to its nearest centroid
+
+        Args:
+            vectors (numpy.ndarray): Unit-length rows to index
+            n_clusters (int): Number of clusters (default: about sqrt(n))
+            iterations (int): k-means iterations
+            sample_size (int): Rows used to fit the centroids
+        """
+        n = len(vectors)
+        n_clusters = n_clusters or max(1, int(np.sqrt(n)))
+        rng = np.random.default_rng(seed)
+        sample = vectors[rng.choice(n, size=min(n, sample_size), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=n_clusters, replace=False)].copy()
+
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(n_clusters):
+                members = sample[labels == c]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    norm = np.linalg.norm(centroid)
+                    if norm:
+                        centroids[c] = centroid / norm
+
+        assignments = np.concatenate([
+            np.argmax(vectors[start:start + 65536] @ centroids.T, axis=1)
+            for start in range(0, n, 65536)
+        ])
+        return cls(centroids, assignments, n)
+
+    def add(self, vectors, start):
+        """Assign newly appended rows to their nearest clusters"""
+        for offset, label in enumerate(np.argmax(vectors @ self.centroids.T, axis=1)):
+            self.lists[label].append(start + offset)
+
+    def search(self, vectors, query_vector, k, nprobe):
+        probe = top_k(self.centroids @ query_vector, nprobe)[0]
+        ids = np.fromiter((i for c in probe for i in self.lists[c]), dtype=np.int64)
+        if not len(ids):
+            return ids, np.array([], dtype=np.float32)
+        ids.sort()
+        local, scores = top_k(vectors[ids] @ query_vector, k)
+        return ids[local], scores
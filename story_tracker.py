@@ -0,0 +1,312 @@
+import itertools
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+
+# Words ignored when turning a topic or an article into match terms
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'in', 'is', 'it',
+    'its', 'of', 'on', 'or', 'that', 'the', 'to', 'was', 'were', 'will', 'with', 'news',
+    'latest', 'about', 'new', 'update', 'updates'
+}
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:['\-][a-z0-9]+)*")
+
+
+def normalize_terms(text):
+    """
+    Lowercase word terms with stop words removed and plurals folded
+
+    Args:
+        text (str): Topic or article text
+
+    Returns:
+        set: Normalized terms
+    """
+    terms = set()
+    for token in _TOKEN.findall((text or "").lower()):
+        if token.endswith("'s"):
+            token = token[:-2]
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        terms.add(token)
+    return terms
+
+
+class Watchlist:
+    """
+    Registered topics, indexed for one-pass matching
+
+    Each watch is a set of terms that must all appear in an article. A watch is
+    filed in the inverted index under only its rarest term, so an article only
+    checks the watches anchored on its own words; the number of other watches
+    does not matter.
+    """
+
+    def __init__(self):
+        self.watches = {}
+        self._postings = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+
+    def add(self, user_id, topic):
+        """
+        Register a topic for a user
+
+        Args:
+            user_id (str): Who to notify
+            topic (str): Topic to follow, e.g. "Tesla stock"
+
+        Returns:
+            int: Watch id, or None if the topic has no usable terms
+        """
+        terms = frozenset(normalize_terms(topic))
+        if not terms:
+            return None
+        with self._lock:
+            # Anchor on the term with the fewest watches so postings stay short;
+            # among equals, longer words tend to be rarer in articles
+            anchor = min(terms, key=lambda t: (len(self._postings.get(t, ())), -len(t), t))
+            watch_id = next(self._ids)
+            self.watches[watch_id] = {'id': watch_id, 'user_id': user_id, 'topic': topic,
+                                      'terms': terms, 'anchor': anchor}
+            self._postings.setdefault(anchor, set()).add(watch_id)
+            return watch_id
+
+    def remove(self, watch_id):
+        with self._lock:
+            watch = self.watches.pop(watch_id, None)
+            if watch is None:
+                return False
+            postings = self._postings[watch['anchor']]
+            postings.discard(watch_id)
+            if not postings:
+                del self._postings[watch['anchor']]
+            return True
+
+    def for_user(self, user_id):
+        with self._lock:
+            return [w for w in self.watches.values() if w['user_id'] == user_id]
+
+    def match(self, terms):
+        """
+        Watches whose terms all appear in a set of article terms
+
+        Args:
+            terms (set): normalize_terms() of the article
+
+        Returns:
+            list: Matching watch dicts
+        """
+        matches = []
+        with self._lock:
+            postings = self._postings
+            watches = self.watches
+            for term in terms:
+                for watch_id in postings.get(term, ()):
+                    watch = watches[watch_id]
+                    if watch['terms'] <= terms:
+                        matches.append(watch)
+        return matches
+
+    def __len__(self):
+        return len(self.watches)
+
+
+class NotificationQueue:
+    """Per-user queues of story alerts"""
+
+    def __init__(self, max_per_user=100):
+        self.max_per_user = max_per_user
+        self._queues = {}
+        self._lock = threading.Lock()
+
+    def push(self, notification):
+        with self._lock:
+            queue = self._queues.setdefault(notification['user_id'], deque(maxlen=self.max_per_user))
+            queue.append(notification)
+
+    def drain(self, user_id):
+        """Remove and return every pending notification for a user, oldest first"""
+        with self._lock:
+            queue = self._queues.pop(user_id, None)
+        return list(queue) if queue else []
+
+    def pending(self, user_id):
+        with self._lock:
+            return len(self._queues.get(user_id, ()))
+
+    def discard(self, user_id):
+        with self._lock:
+            self._queues.pop(user_id, None)
+
+
+class StoryTracker:
+    """Matches newly ingested articles against every watched topic and queues alerts"""
+
+    # NewsAPI categories polled by the background worker
+    CATEGORIES = ('general', 'business', 'technology', 'science', 'health', 'sports', 'entertainment')
+
+    def __init__(self, watchlist=None, notifications=None, seen_limit=100000, max_requests_per_day=24,
+                 session_ttl=3600):
+        """
+        Args:
+            watchlist (Watchlist): Registered topics (default: a new, empty one)
+            notifications (NotificationQueue): Where alerts go (default: a new one)
+            seen_limit (int): Articles remembered so repeats are not alerted twice
+            max_requests_per_day (int): Headline requests the worker may make in
+                any 24 hours; it shares the NewsAPI quota with chat
+            session_ttl (float): Seconds after a user was last seen before their
+                watches and pending alerts are dropped
+        """
+        self.watchlist = watchlist or Watchlist()
+        self.notifications = notifications or NotificationQueue()
+        self.seen_limit = seen_limit
+        self.max_requests_per_day = max_requests_per_day
+        self.session_ttl = session_ttl
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+        self._worker = None
+        self._stop = threading.Event()
+        self._requests = deque()
+        self._next_category = 0
+        self._last_seen = {}
+
+    def follow(self, user_id, topic):
+        self.touch(user_id)
+        return self.watchlist.add(user_id, topic)
+
+    def touch(self, user_id):
+        """Mark a user's session as active, keeping their watches alive"""
+        with self._lock:
+            self._last_seen[user_id] = time.monotonic()
+
+    def expire_sessions(self):
+        """
+        Drop the watches and alerts of users not seen for session_ttl seconds
+
+        Returns:
+            int: Number of watches removed
+        """
+        cutoff = time.monotonic() - self.session_ttl
+        with self._lock:
+            gone = {user_id for user_id, seen in self._last_seen.items() if seen < cutoff}
+            for user_id in gone:
+                del self._last_seen[user_id]
+        removed = 0
+        for watch in list(self.watchlist.watches.values()):
+            if watch['user_id'] in gone:
+                removed += self.watchlist.remove(watch['id'])
+        for user_id in gone:
+            self.notifications.discard(user_id)
+        return removed
+
+    def unfollow(self, watch_id):
+        return self.watchlist.remove(watch_id)
+
+    def process(self, articles):
+        """
+        Match a batch of articles against all watches in one pass
+
+        Args:
+            articles (list): Newly ingested articles
+
+        Returns:
+            int: Number of notifications queued
+        """
+        queued = 0
+        for article in articles:
+            key = article.get('url') or f"{article.get('source')}|{article.get('title')}"
+            with self._lock:
+                if key in self._seen:
+                    continue
+                self._seen[key] = True
+                if len(self._seen) > self.seen_limit:
+                    self._seen.popitem(last=False)
+
+            terms = normalize_terms(f"{article.get('title') or ''} {article.get('description') or ''}")
+            if not terms:
+                continue
+            for watch in self.watchlist.match(terms):
+                self.notifications.push({
+                    'watch_id': watch['id'],
+                    'user_id': watch['user_id'],
+                    'topic': watch['topic'],
+                    'article': article,
+                    'matched_at': datetime.now()
+                })
+                queued += 1
+        return queued
+
+    def poll(self, news_fetcher, page_size=100, max_requests=None):
+        """
+        Fetch the latest headlines and process them
+
+        Nothing is fetched while nobody watches a topic. Categories are taken in
+        turn, so each poll continues where the last one stopped, and no more
+        than max_requests_per_day requests are made in any 24 hours.
+
+        Args:
+            news_fetcher (NewsFetcher): Source of new articles
+            page_size (int): Articles per category request
+            max_requests (int): Categories fetched by this poll (default: all)
+
+        Returns:
+            int: Number of notifications queued
+        """
+        self.expire_sessions()
+        if len(self.watchlist) == 0:
+            return 0
+
+        queued = 0
+        for _ in range(min(max_requests or len(self.CATEGORIES), len(self.CATEGORIES))):
+            with self._lock:
+                now = time.monotonic()
+                while self._requests and now - self._requests[0] > 86400:
+                    self._requests.popleft()
+                if len(self._requests) >= self.max_requests_per_day:
+                    break
+                self._requests.append(now)
+                category = self.CATEGORIES[self._next_category]
+                self._next_category = (self._next_category + 1) % len(self.CATEGORIES)
+            articles = news_fetcher.get_top_headlines(category=category, page_size=page_size)
+            queued += self.process(articles)
+        return queued
+
+    def start(self, news_fetcher, poll_interval=900):
+        """
+        Run poll() in a background worker thread until stop() is called
+
+        Args:
+            news_fetcher (NewsFetcher): Source of new articles
+            poll_interval (float): Seconds between polls; stretched so the
+                worker's requests spread evenly over max_requests_per_day
+        """
+        if self._worker is not None and self._worker.is_alive():
+            return self._worker
+        self._stop.clear()
+        per_poll = max(1, min(len(self.CATEGORIES), int(self.max_requests_per_day * poll_interval / 86400)))
+        poll_interval = max(poll_interval, 86400 * per_poll / self.max_requests_per_day)
+
+        def run():
+            while not self._stop.is_set():
+                started = time.monotonic()
+                try:
+                    self.poll(news_fetcher, max_requests=per_poll)
+                except Exception as e:
+                    print(f"Error polling news for watched topics: {e}")
+                self._stop.wait(max(0.0, poll_interval - (time.monotonic() - started)))
+
+        self._worker = threading.Thread(target=run, name="story-tracker", daemon=True)
+        self._worker.start()
+        return self._worker
+
+    def stop(self):
+        self._stop.set()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
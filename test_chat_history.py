@@ -0,0 +1,71 @@
+"""
+Tests for the compact Article record and the bounded chat history
+"""
+
+import gc
+import os
+import time
+from datetime import datetime
+from article import Article
+from chat_history import ChatHistory
+from news_fetcher import NewsFetcher
+
+
+def make_article(i, source="Reuters"):
+    return Article(title=f"Title {i}", description=f"Description {i}", content="Body",
+                   source=source, author="Reporter", url=f"https://example.com/{i}",
+                   publishedAt="2024-01-01", urlToImage="")
+
+
+def test_article_supports_dict_access():
+    article = make_article(1)
+    assert article['title'] == "Title 1"
+    assert article.get('published_at', 'Unknown') == 'Unknown'
+    assert dict(article) == article.to_dict()
+    assert Article.from_dict(article.to_dict()) == article
+
+
+def test_format_articles_interns_sources():
+    raw = [{'title': 't', 'source': {'name': ''.join(['Reu', 'ters'])}, 'url': 'u1'},
+           {'title': 't', 'source': {'name': ''.join(['Reut', 'ers'])}, 'url': 'u2'}]
+    first, second = NewsFetcher()._format_articles(raw)
+    assert first.source is second.source
+    assert first['description'] == 'No description'
+
+
+def test_history_stores_articles_once_and_spills(tmp_path):
+    history = ChatHistory(max_messages=4, spill_dir=str(tmp_path))
+    for turn in range(5):
+        history.append({'role': 'user', 'content': f"q{turn}", 'timestamp': datetime.now()})
+        history.append({'role': 'assistant', 'content': f"a{turn}", 'timestamp': datetime.now(),
+                        'articles': [make_article(0), make_article(turn)]})
+
+    assert len(history) == 10
+    assert history.spilled_count == 6
+    assert history.article_count() == 3  # shared article 0 plus turns 3 and 4
+    assert [m['content'] for m in history] == ["q3", "a3", "q4", "a4"]
+
+    spilled = history.load_spilled()
+    assert [m['content'] for m in spilled] == ["q0", "a0", "q1", "a1", "q2", "a2"]
+    assert spilled[1]['articles'][1] == make_article(0)
+    assert isinstance(spilled[0]['timestamp'], datetime)
+
+    history.clear()
+    assert not history
+    assert not list(tmp_path.iterdir())
+
+
+def test_spill_files_of_ended_sessions_are_removed(tmp_path):
+    abandoned = tmp_path / "chat_history_old.jsonl"
+    abandoned.write_text("{}\n")
+    os.utime(abandoned, (time.time() - 7200, time.time() - 7200))
+
+    history = ChatHistory(max_messages=1, spill_dir=str(tmp_path), max_spill_age=3600)
+    history.append({'role': 'user', 'content': "q0"})
+    history.append({'role': 'user', 'content': "q1"})
+    assert [p.name for p in tmp_path.iterdir()] == [os.path.basename(history.spill_path)]
+
+    # A session that goes away takes its spill file with it
+    del history
+    gc.collect()
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,69 @@
+"""
+Tests for local follow-up detection between chat turns
+"""
+
+from conversation_state import ConversationState
+
+ARTICLES = [
+    {'title': 'EV subsidies extended in Germany', 'description': 'Electric car buyers keep the bonus for another year.',
+     'url': 'https://example.com/ev-1'},
+    {'title': 'Battery prices fall', 'description': 'Cheaper batteries bring electric vehicle prices down.',
+     'url': 'https://example.com/ev-2'},
+]
+
+
+def conversation():
+    state = ConversationState()
+    state.update("What's happening with electric vehicles?", "electric vehicles", ARTICLES, "answer")
+    return state
+
+
+def test_follow_ups_reuse_the_theme():
+    state = conversation()
+    assert state.follow_up("What about electric cars in Europe?") == {'theme': "electric vehicles europe",
+                                                                       'new_terms': ['europe']}
+    # New words keep the order they were asked in
+    assert state.follow_up("Electric vehicles at the Super Bowl?")['theme'] == "electric vehicles super bowl"
+    assert state.follow_up("Tell me more")['new_terms'] == []
+    assert state.follow_up("Is it safe?") is not None
+    assert state.follow_up("Are the EV subsidies being extended?") is not None
+
+
+def test_new_topics_are_not_follow_ups():
+    state = conversation()
+    assert state.follow_up("How is the stock market doing today?") is None
+    assert state.follow_up("Any news on the lunar rover mission?") is None
+    assert ConversationState().follow_up("Tell me more") is None
+
+
+def test_openers_alone_do_not_make_new_words_a_follow_up():
+    state = conversation()
+    for question in ("Why is bitcoin crashing?", "Explain the Gaza ceasefire", "And the Super Bowl?",
+                     "So who won the election?", "What about Europe?", "How are their sales in Europe?"):
+        assert state.follow_up(question) is None, question
+
+
+def test_filler_words_do_not_name_the_topic():
+    state = ConversationState()
+    state.update("Any news on electric vehicles today?", "electric vehicles", ARTICLES, "answer")
+    assert 'today' not in state.topic_terms
+    for question in ("What happened in Gaza today?", "What's going on with bitcoin today?",
+                     "Is bitcoin up today?"):
+        assert state.follow_up(question) is None, question
+    assert state.follow_up("What about electric vehicles today?") == {'theme': "electric vehicles",
+                                                                       'new_terms': []}
+
+
+def test_stale_context_is_not_reused():
+    state = conversation()
+    state.updated_at -= state.max_age + 1
+    assert state.follow_up("Tell me more") is None
+
+
+def test_update_keeps_newest_articles_first_without_duplicates():
+    state = conversation()
+    fresh = {'title': 'Charging network grows', 'description': '', 'url': 'https://example.com/ev-3'}
+    state.update("What about charging?", state.theme, [fresh, ARTICLES[0]], "answer")
+    assert [a['url'] for a in state.articles] == ['https://example.com/ev-3', 'https://example.com/ev-1',
+                                                  'https://example.com/ev-2']
+    assert state.rank("battery prices", state.articles)[0] == ARTICLES[1]
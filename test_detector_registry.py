@@ -0,0 +1,67 @@
+"""
+Tests for versioned fake-news models, the cascade and shadow scoring
+Tiny models are trained into a temporary registry
+"""
+
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from detector_registry import CascadeDetector, DetectorRegistry, ShadowDetector
+
+def train(registry, corpus, name, version, vectorizer, threshold=None):
+    texts, labels = [t for t, _ in corpus], [label for _, label in corpus]
+    vectors = vectorizer.fit_transform(texts)
+    registry.save(name, version, LogisticRegression(C=100).fit(vectors, labels), vectorizer, threshold=threshold)
+
+
+def make_registry(tmp_path, corpus):
+    registry = DetectorRegistry(tmp_path / "models", detector_options={'use_cache': False})
+    train(registry, corpus, "hashing", "v1", HashingVectorizer(n_features=2 ** 12, alternate_sign=False))
+    train(registry, corpus, "tfidf", "v2", TfidfVectorizer(), threshold=0.6)
+    train(registry, corpus, "tfidf", "v10", TfidfVectorizer(ngram_range=(1, 2)))
+    return registry
+
+
+def test_registry_lists_and_loads_versions(tmp_path, labelled_headlines):
+    registry = make_registry(tmp_path, labelled_headlines)
+    assert registry.names() == ["hashing", "tfidf"]
+    assert registry.versions("tfidf") == ["legacy", "v2", "v10"]
+    assert registry.get("tfidf").name == "tfidf:v10"
+    assert registry.get("tfidf:v2").threshold == 0.6
+    assert registry.get("tfidf:v2") is registry.get("tfidf:v2")
+    assert registry.get("hashing").is_fake("shocking miracle cure revealed")
+
+
+def test_cascade_only_sends_uncertain_articles_to_the_expensive_model(tmp_path, labelled_headlines, predict_spy):
+    registry = make_registry(tmp_path, labelled_headlines)
+    cheap, expensive = registry.get("hashing"), registry.get("tfidf:v2")
+    texts = [t for t, _ in labelled_headlines] + ["parliament weather report tomorrow"]
+    cheap_scores = cheap.score_many(texts)
+    uncertain = [t for t, (_, p) in zip(texts, cheap_scores) if 0.2 < p < 0.8]
+    assert 0 < len(uncertain) < len(texts)
+
+    calls = predict_spy(expensive)
+    cascade = CascadeDetector([(cheap, 0.2, 0.8), (expensive, None, None)])
+    scores = cascade.score_many(texts)
+
+    assert calls == [uncertain]
+    assert [s[0] for s in scores[:6]] == [bool(label) for _, label in labelled_headlines]
+    stats = cascade.stats()
+    assert [s['settled'] for s in stats] == [len(texts) - len(uncertain), len(uncertain)]
+    assert cascade.threshold == 0.6
+
+
+def test_shadow_returns_primary_scores_and_tracks_agreement(tmp_path, labelled_headlines):
+    registry = make_registry(tmp_path, labelled_headlines)
+    primary, candidate = registry.get("tfidf:v2"), registry.get("hashing")
+    shadow = ShadowDetector(primary, candidate)
+    texts = [t for t, _ in labelled_headlines]
+
+    assert shadow.score_many(texts) == primary.score_many(texts)
+    real, fake_count, _ = shadow.filter_fake_articles([{'title': t, 'description': ''} for t in texts],
+                                                      max_filter_percentage=100)
+    shadow.flush()
+
+    stats = shadow.stats()
+    assert fake_count == 3 and len(real) == 3
+    assert stats['compared'] == 2 * len(texts)
+    assert stats['agreement'] == 1 - (stats['primary_only_fake'] + stats['candidate_only_fake']) / stats['compared']
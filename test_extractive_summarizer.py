@@ -0,0 +1,74 @@
+"""
+Tests for the local extractive summarizer
+"""
+
+import json
+from pathlib import Path
+import pytest
+from extractive_summarizer import ExtractiveSummarizer
+
+TOPICS = {topic['topic']: topic for topic in
+          json.loads((Path(__file__).parent / "fixtures" / "news_topics.json").read_text())}
+ALL_ARTICLES = [article for topic in TOPICS.values() for article in topic['articles']]
+
+
+@pytest.mark.parametrize("method", ExtractiveSummarizer.METHODS)
+def test_both_methods_rank_the_off_topic_sentence_last(method):
+    sentences = [
+        "The rover drilled into the crater and found water ice near the pole.",
+        "Water ice in the crater could supply astronauts on the pole mission.",
+        "Astronauts may drink water mined from ice in the polar crater.",
+        "The football club signed a new striker on Friday afternoon.",
+    ]
+    scores, vectors = ExtractiveSummarizer(method=method).rank_sentences(sentences)
+    assert vectors.shape[0] == len(sentences)
+    assert scores.argmin() == 3
+
+
+@pytest.mark.parametrize("method", ExtractiveSummarizer.METHODS)
+def test_summary_comes_from_the_articles(method):
+    articles = TOPICS['lunar exploration']['articles']
+    picked = ExtractiveSummarizer(method=method).select_sentences(articles, num_sentences=3)
+    assert len(picked) == 3
+    sources = {article['source'] for article in articles}
+    assert all(source in sources for _, source in picked)
+    assert len({sentence for sentence, _ in picked}) == 3
+
+
+def test_redundancy_threshold_skips_near_duplicates():
+    articles = [
+        {'description': "The central bank kept interest rates on hold this week.", 'source': 'A'},
+        {'description': "The central bank kept interest rates on hold this week again.", 'source': 'B'},
+        {'description': "Storms flooded several coastal towns overnight.", 'source': 'C'},
+    ]
+    strict = [source for _, source in ExtractiveSummarizer().select_sentences(articles, num_sentences=3)]
+    assert sorted(strict) in (['A', 'C'], ['B', 'C'])
+    lenient = ExtractiveSummarizer(redundancy_threshold=1.0).select_sentences(articles, num_sentences=3)
+    assert len(lenient) == 3
+
+
+def test_query_biases_the_ranking():
+    summarizer = ExtractiveSummarizer()
+    sentence, _ = summarizer.select_sentences(ALL_ARTICLES, num_sentences=1, query="heat shield erosion")[0]
+    assert "heat shield" in sentence.lower()
+    sentence, _ = summarizer.select_sentences(ALL_ARTICLES, num_sentences=1, query="battery plants")[0]
+    assert "batter" in sentence.lower()
+
+
+def test_stop_word_only_sentences_are_ranked_equally():
+    scores, vectors = ExtractiveSummarizer().rank_sentences(["It is what it was.", "They were all there then."])
+    assert vectors is None
+    assert list(scores) == [1.0, 1.0]
+
+
+def test_answer_falls_back_to_headlines():
+    summarizer = ExtractiveSummarizer()
+    short = [{'title': 'Markets close higher', 'description': 'Stocks rose.', 'source': 'Wire'}]
+    assert summarizer.answer_from_news("markets", short).splitlines()[1:] == ["- Markets close higher (Wire)"]
+    assert "couldn't find" in summarizer.answer_from_news("markets", [{'description': 'Up.'}])
+    assert "couldn't find" in summarizer.answer_from_news("markets", [])
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        ExtractiveSummarizer(method='lexrank')
@@ -0,0 +1,81 @@
+"""
+Tests for fake news scoring and the persistent score cache
+A tiny model is trained in the test so results do not depend on the shipped pickles
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from fake_news_detector import FakeNewsDetector
+from micro_batcher import MicroBatcher
+from score_cache import ScoreCache
+
+ARTICLES = [
+    {'title': 'Shocking miracle cure', 'description': 'Doctors hate this weird trick'},
+    {'title': 'Central bank raises rates', 'description': 'Officials confirm the budget'},
+]
+
+
+def make_detector(tmp_path, corpus, spy, version="v1"):
+    detector = FakeNewsDetector(use_cache=False)
+    detector.vectorizer = TfidfVectorizer().fit([text for text, _ in corpus])
+    detector.model = LogisticRegression(C=100).fit(
+        detector.vectorizer.transform([text for text, _ in corpus]), [label for _, label in corpus])
+    detector.model_version = version
+    detector.cache = ScoreCache(tmp_path / "scores.sqlite3", version)
+    return detector, spy(detector)
+
+
+def test_filter_scores_in_one_batch_and_reuses_cache(tmp_path, labelled_headlines, predict_spy):
+    detector, calls = make_detector(tmp_path, labelled_headlines, predict_spy)
+    real, fake_count, filtered = detector.filter_fake_articles(ARTICLES, threshold=0.5,
+                                                               max_filter_percentage=100)
+    assert fake_count == 1
+    assert filtered == [ARTICLES[0]]
+    assert real == [ARTICLES[1]]
+    assert len(calls) == 1 and len(calls[0]) == 2
+
+    # A second detector (e.g. another process) finds the scores on disk
+    other, other_calls = make_detector(tmp_path, labelled_headlines, predict_spy)
+    assert other.filter_fake_articles(ARTICLES, threshold=0.5, max_filter_percentage=100)[1] == 1
+    assert other.is_fake("SHOCKING miracle cure!! Doctors hate this weird trick")
+    assert other_calls == []
+
+
+def test_cache_is_invalidated_when_model_changes(tmp_path, labelled_headlines, predict_spy):
+    detector, _ = make_detector(tmp_path, labelled_headlines, predict_spy, version="v1")
+    detector.filter_fake_articles(ARTICLES)
+    assert len(detector.cache) == 2
+
+    retrained, calls = make_detector(tmp_path, labelled_headlines, predict_spy, version="v2")
+    assert len(retrained.cache) == 0
+    retrained.get_confidence(ARTICLES[0]['title'])
+    assert len(calls) == 1
+
+
+def test_concurrent_callers_share_batches(tmp_path, labelled_headlines, predict_spy):
+    detector, calls = make_detector(tmp_path, labelled_headlines, predict_spy)
+    detector.cache = None
+    # A slow model call lets the other callers queue up behind the first batch
+    detector.batcher = MicroBatcher(lambda texts: time.sleep(0.02) or detector._predict(texts),
+                                    max_batch_size=16, max_wait_ms=50)
+    texts = [f"{labelled_headlines[i % len(labelled_headlines)][0]} {i}" for i in range(16)]
+    expected = detector._predict(texts)
+    calls.clear()
+    barrier = threading.Barrier(len(texts))
+
+    def score(text):
+        barrier.wait()
+        return detector.score_many([text])[0]
+
+    with ThreadPoolExecutor(len(texts)) as pool:
+        results = list(pool.map(score, texts))
+
+    assert results == expected
+    # Single-text callers were merged into fewer, larger model calls
+    assert sum(len(batch) for batch in calls) == 16
+    assert len(calls) < 16
+    assert detector.batcher.stats()['max_batch_size'] > 1
+    detector.batcher.close()
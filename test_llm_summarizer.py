@@ -0,0 +1,63 @@
+"""
+Tests for LLMSummarizer batch question answering
+The Groq client is replaced by a local stand-in that records each request
+"""
+
+import json
+import re
+from types import SimpleNamespace
+from llm_summarizer import LLMSummarizer
+
+ARTICLES = [
+    {'title': 'Rover finds ice', 'description': 'A lunar rover found water ice near the south pole.',
+     'source': 'Space Daily', 'publishedAt': '2024-01-01'},
+    {'title': 'Launch delayed', 'description': 'The crewed launch slipped a week due to weather.',
+     'source': 'Orbit News', 'publishedAt': '2024-01-02'},
+]
+
+
+class FakeClient:
+    def __init__(self, reply):
+        self.reply = reply
+        self.requests = []
+        self.chat = SimpleNamespace(completions=self)
+
+    def with_options(self, **kwargs):
+        return self
+
+    def create(self, **kwargs):
+        self.requests.append(kwargs)
+        prompt = kwargs['messages'][-1]['content']
+        count = len(re.findall(r"^\d+\. ", prompt.split("Questions:")[1], re.M))
+        content = self.reply(count)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def make_summarizer(monkeypatch, reply):
+    monkeypatch.setenv('GROQ_API_KEY', 'test-key')
+    summarizer = LLMSummarizer()
+    summarizer.client = FakeClient(reply)
+    return summarizer
+
+
+def test_answer_questions_shares_context_per_batch(monkeypatch):
+    summarizer = make_summarizer(
+        monkeypatch, lambda n: json.dumps({'answers': [f"answer {i}" for i in range(n)]}))
+    questions = [f"Question {i}?" for i in range(10)]
+
+    answers = summarizer.answer_questions(questions, ARTICLES, batch_size=8)
+
+    assert answers == [f"answer {i}" for i in range(8)] + ["answer 0", "answer 1"]
+    assert len(summarizer.client.requests) == 2
+    for request in summarizer.client.requests:
+        assert request['response_format'] == {"type": "json_object"}
+        assert request['messages'][-1]['content'].count("Rover finds ice") == 1
+
+
+def test_answer_questions_fills_missing_answers_locally(monkeypatch):
+    summarizer = make_summarizer(monkeypatch, lambda n: json.dumps({'answers': ["only one"]}))
+
+    answers = summarizer.answer_questions(["Where is the ice?", "Why the delay?"], ARTICLES)
+
+    assert answers[0] == "only one"
+    assert "weather" in answers[1]
@@ -0,0 +1,114 @@
+"""
+Tests for the paginated bulk fetch
+Runs without an API key: requests.Session.get is replaced by a fake NewsAPI
+"""
+
+import threading
+import pytest
+import requests
+from news_fetcher import NewsFetcher
+
+
+class FakeResponse:
+    def __init__(self, data, status_code=200):
+        self.data = data
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} error")
+
+    def json(self):
+        return self.data
+
+
+def fake_newsapi(monkeypatch, total_results, status_codes=None):
+    requested = []
+
+    def get(session, endpoint, params=None, timeout=None):
+        page, size = params['page'], params['pageSize']
+        requested.append(page)
+        status = (status_codes or {}).get(page, 200)
+        start = (page - 1) * size
+        articles = [{'title': f"Story {i}", 'source': {'name': "Wire"}, 'url': f"https://example.com/{i}"}
+                    for i in range(start, min(start + size, total_results))]
+        return FakeResponse({'status': 'ok', 'totalResults': total_results, 'articles': articles}, status)
+
+    monkeypatch.setattr(requests.Session, 'get', get)
+    return requested
+
+
+def test_streams_all_pages_up_to_total_results(monkeypatch):
+    requested = fake_newsapi(monkeypatch, total_results=25)
+    articles = list(NewsFetcher().iter_search_news("storm", page_size=10))
+    assert [a['title'] for a in articles] == [f"Story {i}" for i in range(25)]
+    assert requested == [1, 2, 3]
+
+
+def test_limits_and_early_stop(monkeypatch):
+    requested = fake_newsapi(monkeypatch, total_results=1000)
+    articles = list(NewsFetcher().iter_search_news("storm", page_size=10, max_results=15))
+    assert len(articles) == 15 and requested == [1, 2]
+
+    requested.clear()
+    assert len(list(NewsFetcher().iter_top_headlines(page_size=10, max_requests=3))) == 30
+
+    requested.clear()
+    stream = NewsFetcher().iter_search_news("storm", page_size=10)
+    first = next(stream)
+    stream.close()
+    assert first['title'] == "Story 0"
+    # At most the page being consumed and one prefetched page
+    assert len(requested) <= 2
+
+
+def test_plan_limit_ends_stream_and_errors_are_optional(monkeypatch):
+    fake_newsapi(monkeypatch, total_results=1000, status_codes={3: 426})
+    assert len(list(NewsFetcher().iter_search_news("storm", page_size=10))) == 20
+
+    fake_newsapi(monkeypatch, total_results=1000, status_codes={2: 429})
+    assert len(list(NewsFetcher().iter_search_news("storm", page_size=10))) == 10
+    with pytest.raises(requests.exceptions.HTTPError):
+        list(NewsFetcher().iter_search_news("storm", page_size=10, raise_errors=True))
+
+
+def test_cache_only_serves_the_same_query(monkeypatch):
+    def get(endpoint, params=None, timeout=None):
+        return FakeResponse({'status': 'ok', 'articles': [
+            {'title': f"{params['q']} story", 'description': '', 'url': f"https://example.com/{params['q']}",
+             'source': {'name': 'Wire'}, 'publishedAt': '2024-01-01'}]})
+
+    monkeypatch.setattr(requests, "get", get)
+    fetcher = NewsFetcher()
+    fetcher.search_news("Tesla")
+    articles, age = fetcher.get_cached("tesla")
+    assert [a['title'] for a in articles] == ["Tesla story"] and age is not None
+    assert fetcher.get_cached("Mars rover") == ([], None)
+    assert fetcher.get_cached() == ([], None)
+
+
+def test_cache_survives_concurrent_fetches(monkeypatch):
+    def get(endpoint, params=None, timeout=None):
+        return FakeResponse({'status': 'ok', 'articles': [
+            {'title': params['q'], 'description': '', 'url': f"https://example.com/{params['q']}",
+             'source': {'name': 'Wire'}, 'publishedAt': '2024-01-01'}]})
+
+    monkeypatch.setattr(requests, "get", get)
+    fetcher = NewsFetcher()
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(300):
+                fetcher.search_news(f"topic {n} {i}")
+                fetcher.get_cached(f"topic {n} {i // 2}")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(fetcher._cache) == fetcher._cache_size
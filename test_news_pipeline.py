@@ -0,0 +1,235 @@
+"""
+Tests for the deadline-aware chat pipeline
+Runs without API keys: the fetcher and summarizer are replaced by local stand-ins
+"""
+
+import time
+import requests
+from conversation_state import ConversationState
+from llm_summarizer import LLMSummarizer
+from news_fetcher import NewsFetcher
+from news_pipeline import NewsPipeline
+from extractive_summarizer import ExtractiveSummarizer
+from latency_budget import LatencyBudget
+from semantic_index import SemanticIndex
+
+ARTICLES = [
+    {'title': 'Rover finds ice', 'description': 'A lunar rover found water ice. More tests follow.',
+     'source': 'Space Daily', 'url': 'https://example.com/1', 'publishedAt': '2024-01-01'},
+    {'title': 'Launch delayed', 'description': 'The launch slipped a week due to weather.',
+     'source': 'Orbit News', 'url': 'https://example.com/2', 'publishedAt': '2024-01-02'},
+]
+
+
+class SlowSummarizer:
+    keywords_from_query = staticmethod(LLMSummarizer.keywords_from_query)
+
+    def extract_theme(self, user_query, timeout=None, raise_errors=False):
+        raise requests.exceptions.ReadTimeout("slow")
+
+    def answer_from_news(self, user_query, articles, timeout=None, raise_errors=False):
+        raise requests.exceptions.ReadTimeout("slow")
+
+
+class FastSummarizer(SlowSummarizer):
+    def extract_theme(self, user_query, timeout=None, raise_errors=False):
+        return "space exploration"
+
+    def answer_from_news(self, user_query, articles, timeout=None, raise_errors=False):
+        return "LLM answer"
+
+
+class Fetcher:
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    def search_news(self, query, page_size=5, timeout=None, raise_errors=False):
+        if self.fail:
+            raise requests.exceptions.ConnectTimeout("down")
+        return list(ARTICLES)
+
+    def get_top_headlines(self, **kwargs):
+        return []
+
+    def get_cached(self, query=None):
+        return list(ARTICLES), 120.0
+
+
+class Detector:
+    def filter_fake_articles(self, articles):
+        return articles, 0, []
+
+
+def test_no_degradation_on_fast_stages():
+    pipeline = NewsPipeline(Fetcher(), FastSummarizer(), Detector())
+    result = pipeline.run("What's new in space exploration?")
+    assert result['answer'] == "LLM answer"
+    assert result['theme'] == "space exploration"
+    assert result['metadata']['degradations'] == []
+
+
+def test_low_quality_articles_are_dropped_before_scoring():
+    class JunkFetcher(Fetcher):
+        def search_news(self, query, page_size=5, timeout=None, raise_errors=False):
+            return [{'title': '[Removed]', 'description': '[Removed]', 'source': '[Removed]',
+                     'url': 'https://removed.com'}] + list(ARTICLES)
+
+    class CountingDetector(Detector):
+        def filter_fake_articles(self, articles):
+            self.seen = list(articles)
+            return articles, 0, []
+
+    detector = CountingDetector()
+    result = NewsPipeline(JunkFetcher(), FastSummarizer(), detector).run("space news")
+    assert detector.seen == ARTICLES
+    assert result['low_quality_filtered'] == {'removed': 1}
+
+    class FailingJunkFetcher(JunkFetcher):
+        def search_news(self, query, page_size=5, timeout=None, raise_errors=False):
+            raise requests.exceptions.ConnectTimeout("down")
+
+        def get_cached(self, query=None):
+            return JunkFetcher.search_news(self, query), 60.0
+
+    result = NewsPipeline(FailingJunkFetcher(), FastSummarizer(), detector).run("space news")
+    assert detector.seen == ARTICLES
+    assert result['low_quality_filtered'] == {'removed': 1}
+
+
+def test_follow_up_reuses_articles_and_fetches_only_new_aspect():
+    europe = {'title': 'ESA rover mission', 'description': 'Europe plans its own rover for the lunar south pole.',
+              'source': 'Space Daily', 'url': 'https://example.com/3', 'publishedAt': '2024-01-03'}
+
+    class RecordingSummarizer(FastSummarizer):
+        themes = 0
+
+        def extract_theme(self, user_query, timeout=None, raise_errors=False):
+            self.themes += 1
+            return super().extract_theme(user_query, timeout, raise_errors)
+
+    class RecordingFetcher(Fetcher):
+        queries = []
+
+        def search_news(self, query, page_size=5, timeout=None, raise_errors=False):
+            self.queries.append(query)
+            return list(ARTICLES) + ([europe] if len(self.queries) > 1 else [])
+
+    summarizer, fetcher, conversation = RecordingSummarizer(), RecordingFetcher(), ConversationState()
+    pipeline = NewsPipeline(fetcher, summarizer, Detector())
+    first = pipeline.run("Any news on the lunar rover?", conversation=conversation)
+    assert first['follow_up'] is None
+
+    second = pipeline.run("What about the rover in Europe?", conversation=conversation)
+    assert summarizer.themes == 1
+    assert fetcher.queries[-1] == "space exploration europe"
+    assert second['follow_up'] == {'reused_articles': 2, 'new_articles': 1}
+    assert second['articles'][0] == europe
+
+    pipeline.run("Who won the football match yesterday?", conversation=conversation)
+    assert summarizer.themes == 2
+    assert conversation.queries == ["Who won the football match yesterday?"]
+
+
+def test_failed_fetch_falls_back_to_index_not_other_queries(tmp_path, monkeypatch):
+    tesla = {'title': 'Tesla cuts prices', 'description': 'Tesla lowered prices on its cars in several markets.',
+             'source': {'name': 'Auto Wire'}, 'url': 'https://example.com/tesla', 'publishedAt': '2024-01-01'}
+
+    def get(endpoint, params=None, timeout=None):
+        if params['q'] != "Tesla":
+            raise requests.exceptions.ConnectTimeout("down")
+        return type('Response', (), {'raise_for_status': lambda self: None,
+                                     'json': lambda self: {'status': 'ok', 'articles': [tesla]}})()
+
+    monkeypatch.setattr(requests, "get", get)
+    fetcher = NewsFetcher()
+    assert fetcher.search_news("Tesla")
+    index = SemanticIndex(tmp_path)
+    index.add(ARTICLES)
+
+    class MarsSummarizer(FastSummarizer):
+        def extract_theme(self, user_query, timeout=None, raise_errors=False):
+            return "Mars rover"
+
+    result = NewsPipeline(fetcher, MarsSummarizer(), Detector(), semantic_index=index).run(
+        "Tell me about the lunar rover ice")
+    assert result['articles'] and result['articles'][0]['title'] == 'Rover finds ice'
+    assert all('Tesla' not in article['title'] for article in result['articles'])
+    reasons = [d['reason'] for d in result['metadata']['degradations']]
+    assert any('local index' in reason for reason in reasons)
+
+
+def test_every_stage_degrades():
+    pipeline = NewsPipeline(Fetcher(fail=True), SlowSummarizer(), Detector())
+    result = pipeline.run("Tell me about the Mars rover")
+    stages = [d['stage'] for d in result['metadata']['degradations']]
+    assert stages == ['theme', 'fetch', 'answer']
+    assert result['theme'] == "Mars rover"
+    assert result['articles'] == ARTICLES
+    assert result['answer'] == ExtractiveSummarizer().answer_from_news(
+        "Tell me about the Mars rover", ARTICLES)
+
+
+def test_extractive_mode_skips_llm():
+    class NoLLMSummarizer(SlowSummarizer):
+        def extract_theme(self, user_query, timeout=None, raise_errors=False):
+            raise AssertionError("extract_theme called in extractive mode")
+
+        def answer_from_news(self, user_query, articles, timeout=None, raise_errors=False):
+            raise AssertionError("answer_from_news called in extractive mode")
+
+    pipeline = NewsPipeline(Fetcher(), NoLLMSummarizer(), Detector())
+    result = pipeline.run("Any news on the lunar rover?", mode='extractive')
+    assert result['metadata']['degradations'] == []
+    assert result['theme'] == "lunar rover"
+    assert "water ice" in result['answer']
+
+
+def test_exhausted_budget_skips_remote_calls():
+    budget = LatencyBudget(0.01)
+    time.sleep(0.02)
+    assert budget.expired()
+    assert budget.stage_timeout('answer') == 0.0
+
+    class OfflineFetcher(Fetcher):
+        def search_news(self, *args, **kwargs):
+            raise AssertionError("search_news called with no budget left")
+
+        def get_top_headlines(self, **kwargs):
+            raise AssertionError("get_top_headlines called with no budget left")
+
+    class OfflineSummarizer(SlowSummarizer):
+        def extract_theme(self, *args, **kwargs):
+            raise AssertionError("extract_theme called with no budget left")
+
+        def answer_from_news(self, *args, **kwargs):
+            raise AssertionError("answer_from_news called with no budget left")
+
+    result = NewsPipeline(OfflineFetcher(), OfflineSummarizer(), Detector()).run(
+        "Tell me about the Mars rover", budget_seconds=0)
+    reasons = {d['stage']: d['reason'] for d in result['metadata']['degradations']}
+    assert reasons['theme'] == 'budget exhausted'
+    assert reasons['fetch'].startswith('budget exhausted')
+    assert result['articles'] == ARTICLES
+
+
+def test_headline_fallback_gets_only_the_rest_of_the_fetch_slice():
+    class SlowEmptyFetcher(Fetcher):
+        timeouts = []
+
+        def search_news(self, query, page_size=5, timeout=None, raise_errors=False):
+            self.timeouts.append(timeout)
+            time.sleep(0.3)
+            return []
+
+        def get_top_headlines(self, timeout=None, **kwargs):
+            self.timeouts.append(timeout)
+            return list(ARTICLES)
+
+    fetcher = SlowEmptyFetcher()
+    NewsPipeline(fetcher, FastSummarizer(), Detector()).run("space news", budget_seconds=2.0)
+    search_timeout, headline_timeout = fetcher.timeouts
+    assert headline_timeout <= search_timeout - 0.3 + 0.05
+
+
+def test_keywords_from_query():
+    assert LLMSummarizer.keywords_from_query("What's happening with Tesla stock?") == "Tesla stock"
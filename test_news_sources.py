@@ -0,0 +1,149 @@
+"""
+Tests for the news source adapters and the concurrent aggregator
+"""
+
+import os
+import threading
+import time
+from news_sources import JSONLSource, NewsAggregator, NewsAPISource, NewsSource, RSSSource
+
+FEEDS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "feeds")
+
+
+def feed(name):
+    return os.path.join(FEEDS, name)
+
+
+def test_rss_and_atom_are_normalized():
+    rss = RSSSource(feed("world_rss.xml")).fetch()
+    atom = RSSSource(feed("science_atom.xml")).fetch()
+
+    assert len(rss) == 3 and len(atom) == 2
+    assert rss[0]['source'] == "World Wire"
+    assert rss[0]['publishedAt'] == "2024-07-10T06:00:00Z"
+    assert atom[0]['source'] == "Science Atom Feed"
+    assert all(a['url'] and a['title'] for a in rss + atom)
+
+
+def test_jsonl_accepts_both_schemas_and_filters_by_query():
+    articles = JSONLSource(feed("local_feed.jsonl")).fetch()
+    assert [a['source'] for a in articles] == ["Local Desk"] * 3
+
+    matched = JSONLSource(feed("local_feed.jsonl")).fetch(query="cooling centres")
+    assert [a['url'] for a in matched] == ["https://local.example.com/cooling"]
+
+
+class FailingSource(NewsSource):
+    name = 'broken'
+
+    def fetch(self, query=None, limit=20, timeout=None):
+        raise ConnectionError("feed unavailable")
+
+
+class SlowSource(NewsSource):
+    name = 'slow'
+
+    def fetch(self, query=None, limit=20, timeout=None):
+        time.sleep(1)
+        return []
+
+
+def test_aggregator_merges_deduplicates_and_survives_bad_sources():
+    aggregator = NewsAggregator([RSSSource(feed("world_rss.xml")), JSONLSource(feed("local_feed.jsonl")),
+                                 FailingSource(), SlowSource()])
+    started = time.monotonic()
+    articles = aggregator.fetch(limit=20, timeout=0.5)
+    assert time.monotonic() - started < 0.9
+
+    urls = [a['url'] for a in articles]
+    assert urls.count("https://example.com/heat/1") == 1
+    # The first configured source keeps its copy of a duplicate
+    assert next(a for a in articles if a['url'] == "https://example.com/heat/1")['source'] == "World Wire"
+    assert [a['publishedAt'] for a in articles] == sorted((a['publishedAt'] for a in articles), reverse=True)
+
+    stats = aggregator.stats()
+    assert stats['broken']['errors'] == 1
+    assert stats['slow']['timeouts'] == 1
+    assert stats['world_rss.xml']['articles'] == 3
+    # Only query results are cached, and only served for that query
+    assert aggregator.get_cached() == ([], None)
+    cooling = aggregator.search_news("cooling centres", page_size=5, timeout=0.5)
+    assert cooling and aggregator.get_cached("Cooling centres")[0] == cooling
+    assert aggregator.get_cached("mars rover") == ([], None)
+
+
+def test_concurrent_callers_do_not_queue_behind_each_other():
+    class OneSecondSource(NewsSource):
+        name = 'newsapi'
+
+        def fetch(self, query=None, limit=20, timeout=None, **filters):
+            time.sleep(1)
+            return [{'title': f"{query} story", 'url': f"https://example.com/{query}"}]
+
+    aggregator = NewsAggregator([OneSecondSource()])
+    results = {}
+    callers = [threading.Thread(target=lambda q=q: results.update({q: aggregator.search_news(q, timeout=1.5)}))
+               for q in ("alpha", "beta", "gamma")]
+    for caller in callers:
+        caller.start()
+    for caller in callers:
+        caller.join()
+    assert all(len(articles) == 1 for articles in results.values()) and len(results) == 3
+    assert aggregator.stats()['newsapi']['timeouts'] == 0
+
+
+def test_callers_beyond_the_pool_count_as_busy():
+    class HalfSecondSource(NewsSource):
+        name = 'slow'
+
+        def fetch(self, query=None, limit=20, timeout=None, **filters):
+            time.sleep(0.5)
+            return []
+
+    aggregator = NewsAggregator([HalfSecondSource()], max_workers=1)
+    first = threading.Thread(target=aggregator.fetch, kwargs={'query': 'a', 'timeout': 1})
+    first.start()
+    time.sleep(0.05)
+    assert aggregator.fetch(query='b', timeout=0.2) == []
+    first.join()
+    stats = aggregator.stats()['slow']
+    assert stats['busy'] == 1 and stats['timeouts'] == 0
+
+
+def test_newsapi_source_does_not_fall_back_to_headlines():
+    class Fetcher:
+        calls = []
+
+        def search_news(self, query, page_size=5, timeout=None, raise_errors=False):
+            self.calls.append('search')
+            return []
+
+        def get_top_headlines(self, query=None, category=None, country='us', page_size=5,
+                              timeout=None, raise_errors=False):
+            self.calls.append('headlines')
+            return []
+
+    fetcher = Fetcher()
+    assert NewsAPISource(fetcher).fetch("quiet topic") == []
+    assert fetcher.calls == ['search']
+
+
+def test_aggregator_headlines_reach_the_headlines_endpoint():
+    class Fetcher:
+        def __init__(self):
+            self.calls = []
+
+        def search_news(self, query, page_size=5, timeout=None, raise_errors=False):
+            self.calls.append(('search', query))
+            return []
+
+        def get_top_headlines(self, query=None, category=None, country='us', page_size=5,
+                              timeout=None, raise_errors=False):
+            self.calls.append(('headlines', query, country))
+            return []
+
+    fetcher = Fetcher()
+    aggregator = NewsAggregator([NewsAPISource(fetcher)])
+    aggregator.search_news("quiet topic", timeout=1)
+    aggregator.get_top_headlines(query="quiet topic", country='gb', timeout=1)
+    assert fetcher.calls == [('search', "quiet topic"), ('headlines', "quiet topic", 'gb')]
@@ -0,0 +1,67 @@
+"""
+Tests for the article quality pre-filter
+"""
+
+from quality_filter import QualityFilter
+
+GOOD = {'title': "Tesla stock jumps after earnings beat",
+        'description': "Shares rose 8% in early trading after the carmaker reported record deliveries."}
+
+
+def test_each_reason_is_detected_and_counted():
+    articles = [
+        GOOD,
+        {'title': '[Removed]', 'description': '[Removed]', 'url': 'https://removed.com'},
+        {'title': 'No title', 'description': 'No description'},
+        {'title': 'Fed holds rates', 'description': 'No description'},
+        {'title': 'Markets rally as inflation cools',
+         'description': 'Subscribe now to continue reading this story about markets today.'},
+        {'title': 'El gobierno anuncia nuevas medidas económicas',
+         'description': 'Los ministros aprobaron el plan el martes para reducir la inflación en el país.'},
+        {'title': '日本の首相が新しい経済政策を発表', 'description': '政府は火曜日に新たな景気対策を閣議決定した。'},
+    ]
+    quality = QualityFilter()
+    kept, dropped = quality.filter(articles)
+
+    assert kept == [GOOD]
+    assert [reason for _, reason in dropped] == ['removed', 'empty', 'too_short', 'boilerplate',
+                                                 'language', 'language']
+    assert quality.stats() == {'checked': 7, 'kept': 1, 'removed': 1, 'empty': 1, 'language': 2,
+                               'too_short': 1, 'boilerplate': 1}
+
+
+def test_quoted_phrases_and_read_more_links_are_not_boilerplate():
+    legit = [
+        {'title': "Heatwave grips southern Europe",
+         'description': "Spain and Italy issued red alerts as temperatures passed 44C on Tuesday. Continue reading..."},
+        {'title': "Cloudflare unveils CAPTCHA replacement",
+         'description': "The company says private access tokens will replace the captcha puzzles millions of users hate."},
+        {'title': "Security experts warn of phishing surge",
+         'description': "Researchers told staff to never click here links in unexpected emails after attacks on banks."},
+        {'title': "Outage leaves users locked out",
+         'description': "Customers saw access denied errors for hours before the bank restored its online services."},
+    ]
+    junk = [
+        {'title': 'Markets rally as inflation cools',
+         'description': 'Sign up for our newsletter to get the latest news delivered to your inbox.'},
+        {'title': 'Fed decision looms',
+         'description': 'We use cookies to improve your experience. By continuing you accept all cookies.'},
+    ]
+    kept, dropped = QualityFilter().filter(legit + junk)
+    assert kept == legit
+    assert [reason for _, reason in dropped] == ['boilerplate', 'boilerplate']
+
+
+def test_language_detection_and_opt_out():
+    quality = QualityFilter()
+    assert quality.detect_languages([
+        "The central bank said on Tuesday that interest rates would stay on hold for now.",
+        "Le gouvernement a annoncé mardi une nouvelle réforme des retraites pour l'année prochaine.",
+        "Die Regierung hat am Dienstag neue Steuern für das kommende Jahr angekündigt.",
+        "Short",
+    ]) == ['en', 'fr', 'de', None]
+
+    french = {'title': 'Le président annonce une réforme',
+              'description': "La réforme des retraites sera présentée au parlement la semaine prochaine."}
+    assert QualityFilter(language=None).filter([french, GOOD])[0] == [french, GOOD]
+    assert QualityFilter(language='fr').filter([french])[0] == [french]
@@ -0,0 +1,48 @@
+"""
+Tests for the local semantic article index
+"""
+
+import json
+import random
+from pathlib import Path
+from semantic_index import SemanticIndex
+
+TOPICS = json.loads((Path(__file__).parent / "fixtures" / "news_topics.json").read_text())
+ARTICLES = [article for topic in TOPICS for article in topic['articles']]
+
+
+def test_search_matches_different_phrasing(tmp_path):
+    index = SemanticIndex(tmp_path)
+    assert index.add(ARTICLES) == len(ARTICLES)
+    assert index.add(ARTICLES[:3]) == 0
+
+    results = index.search("battery factories delayed", k=3)
+    assert results[0][0]['title'] == "Automakers scale back battery plant plans"
+    assert results[0][1] > results[-1][1]
+
+
+def test_index_persists_and_appends(tmp_path):
+    SemanticIndex(tmp_path).add(ARTICLES[:4])
+
+    reopened = SemanticIndex(tmp_path)
+    assert len(reopened) == 4
+    reopened.add(ARTICLES[4:])
+    assert len(SemanticIndex(tmp_path)) == len(ARTICLES)
+    assert reopened.search("extreme temperatures in Europe", k=1)[0][0]['source'] == "World Weather"
+
+
+def test_ivf_search_agrees_with_brute_force(tmp_path):
+    rng = random.Random(0)
+    words = [f"word{i}" for i in range(500)]
+    articles = [{'title': " ".join(rng.choices(words, k=6)), 'description': " ".join(rng.choices(words, k=12)),
+                 'url': f"https://example.com/{i}"} for i in range(2000)]
+    index = SemanticIndex(tmp_path, ivf_threshold=500, nprobe=8)
+    index.add(articles[:1500])
+    index.search("warm up", k=1)  # trains the IVF index
+    index.add(articles[1500:])    # new rows go to existing clusters
+
+    queries = [articles[i]['title'] + " " + articles[i]['description'] for i in (3, 700, 1900)]
+    ivf = [index.search(q, k=1)[0][0]['url'] for q in queries]
+    index.ivf_threshold = len(articles)
+    brute = [index.search(q, k=1)[0][0]['url'] for q in queries]
+    assert ivf == brute == [articles[i]['url'] for i in (3, 700, 1900)]
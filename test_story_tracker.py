@@ -0,0 +1,86 @@
+"""
+Tests for watched topics and story alerts
+"""
+
+import time
+from story_tracker import StoryTracker, normalize_terms
+
+
+def article(i, title, description=""):
+    return {'title': title, 'description': description, 'url': f"https://example.com/{i}", 'source': "Wire"}
+
+
+def test_normalize_terms_folds_plurals_and_stopwords():
+    assert normalize_terms("The latest on Tesla's stocks") == {"tesla", "stock"}
+
+
+def test_all_topic_terms_must_match_once_per_article():
+    tracker = StoryTracker()
+    tesla = tracker.follow("alice", "Tesla stock")
+    tracker.follow("bob", "climate change")
+
+    queued = tracker.process([
+        article(1, "Tesla stock jumps after earnings"),
+        article(2, "Tesla unveils new roadster"),
+        article(1, "Tesla stock jumps after earnings"),  # already seen
+        article(3, "Leaders meet on climate", "Talks on how to slow climate change continue"),
+    ])
+
+    assert queued == 2
+    alerts = tracker.notifications.drain("alice")
+    assert [a['article']['url'] for a in alerts] == ["https://example.com/1"]
+    assert alerts[0]['watch_id'] == tesla
+    assert tracker.notifications.pending("bob") == 1
+    assert tracker.notifications.drain("alice") == []
+
+
+def test_unfollow_stops_alerts():
+    tracker = StoryTracker()
+    watch_id = tracker.follow("alice", "elections")
+    assert tracker.unfollow(watch_id)
+    assert tracker.process([article(1, "Elections held today")]) == 0
+    assert tracker.follow("alice", "the and of") is None
+
+
+class FakeFetcher:
+    def __init__(self):
+        self.categories = []
+
+    def get_top_headlines(self, category=None, page_size=100):
+        self.categories.append(category)
+        return [article(1, "Rocket launch delayed by weather")] if category == 'science' else []
+
+
+def test_poll_respects_watches_and_daily_quota():
+    fetcher = FakeFetcher()
+    tracker = StoryTracker(max_requests_per_day=10)
+    assert tracker.poll(fetcher) == 0 and fetcher.categories == []
+
+    tracker.follow("alice", "rocket launch")
+    tracker.poll(fetcher, max_requests=2)
+    tracker.poll(fetcher)
+    tracker.poll(fetcher)
+    assert fetcher.categories == list(StoryTracker.CATEGORIES) + list(StoryTracker.CATEGORIES[:3])
+
+
+def test_idle_sessions_expire():
+    tracker = StoryTracker(session_ttl=0.05)
+    tracker.follow("alice", "rocket launch")
+    tracker.follow("bob", "climate change")
+    tracker.process([article(1, "Rocket launch delayed by weather")])
+    time.sleep(0.1)
+    tracker.touch("bob")
+    assert tracker.expire_sessions() == 1
+    assert [w['user_id'] for w in tracker.watchlist.watches.values()] == ["bob"]
+    assert tracker.notifications.pending("alice") == 0
+
+
+def test_worker_polls_fetcher():
+    tracker = StoryTracker(max_requests_per_day=100000)
+    tracker.follow("alice", "rocket launch")
+    tracker.start(FakeFetcher(), poll_interval=60)
+    deadline = time.monotonic() + 5
+    while not tracker.notifications.pending("alice") and time.monotonic() < deadline:
+        time.sleep(0.01)
+    tracker.stop()
+    assert tracker.notifications.pending("alice") == 1
@@ -0,0 +1,108 @@
+"""
+Train a fake-news model and save it to the registry as a new version
+Reads labelled articles from CSV or JSON Lines, fits a hashing (cheap, for the
+first cascade stage) or TF-IDF vectorizer with logistic regression, reports
+held-out accuracy and stores the result with DetectorRegistry.save.
+
+Without labels, --teacher labels the articles with an existing model instead, so
+a cheap model can learn to mimic the current one from an archive written by
+archive_news.py.
+
+Usage:
+    python train_fake_news_model.py news.csv --label-column label --name hashing
+    python train_fake_news_model.py news_archive.jsonl --teacher tfidf:legacy --name hashing
+    FAKE_NEWS_MODELS="hashing@0.1-0.9,tfidf:legacy" streamlit run app.py
+"""
+
+import argparse
+import csv
+import json
+import random
+import sys
+from detector_registry import DetectorRegistry
+from fake_news_detector import ArticleScorer
+
+FAKE_LABELS = {'1', 'fake'}
+
+
+def read_articles(path):
+    """Rows of a CSV file or a JSON Lines file"""
+    with open(path, encoding='utf-8', newline='') as f:
+        if path.endswith(('.jsonl', '.json')):
+            return [json.loads(line) for line in f if line.strip()]
+        csv.field_size_limit(sys.maxsize)
+        return list(csv.DictReader(f))
+
+
+def make_vectorizer(kind):
+    from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+    if kind == 'hashing':
+        return HashingVectorizer(n_features=2 ** 18, ngram_range=(1, 2), alternate_sign=False, norm='l2')
+    return TfidfVectorizer(ngram_range=(1, 2), min_df=2, max_df=0.9, sublinear_tf=True)
+
+
+def next_version(registry, name):
+    numbers = [int(v[1:]) for v in registry.versions(name) if v[:1] == 'v' and v[1:].isdigit()]
+    return f"v{max(numbers) + 1}" if numbers else "v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('data', nargs='+', help="CSV or JSON Lines files of articles")
+    parser.add_argument('--text-columns', nargs='+', default=['title', 'description', 'text'],
+                        help="Columns joined into the scored text (missing ones are skipped)")
+    parser.add_argument('--label-column', default='label', help="Column marking fake articles (1 or 'fake')")
+    parser.add_argument('--teacher', help="Label with this registry model instead, e.g. tfidf:legacy")
+    parser.add_argument('--vectorizer', choices=['hashing', 'tfidf'], default='hashing')
+    parser.add_argument('--name', default=None, help="Model name (default: the vectorizer kind)")
+    parser.add_argument('--version', help="Version to save (default: next vN)")
+    parser.add_argument('--threshold', type=float, default=0.7, help="Filter threshold stored with the model")
+    parser.add_argument('--test-size', type=float, default=0.2)
+    parser.add_argument('--models-dir', help="Registry root (default: FAKE_NEWS_MODELS_DIR or 'fake news/models')")
+    args = parser.parse_args()
+
+    rows = [row for path in args.data for row in read_articles(path)]
+    # Same cleaning as scoring, so training and serving see identical text
+    scorer = ArticleScorer()
+    texts = [scorer.preprocess_text(" ".join(str(row.get(c) or '') for c in args.text_columns))
+             for row in rows]
+    registry = DetectorRegistry(args.models_dir, detector_options={'use_cache': False})
+
+    if args.teacher:
+        scores = registry.get(args.teacher).score_many(texts)
+        labelled = [(text, int(score[0])) for text, score in zip(texts, scores) if text and score is not None]
+    else:
+        labelled = [(text, int(str(row.get(args.label_column, '')).strip().lower() in FAKE_LABELS))
+                    for text, row in zip(texts, rows) if text and row.get(args.label_column) not in (None, '')]
+    if len({label for _, label in labelled}) < 2:
+        print(f"❌ Need both real and fake examples; got {len(labelled)} usable articles")
+        sys.exit(1)
+
+    random.Random(0).shuffle(labelled)
+    split = int(len(labelled) * (1 - args.test_size))
+    train, test = labelled[:split], labelled[split:]
+
+    from sklearn.linear_model import LogisticRegression
+
+    vectorizer = make_vectorizer(args.vectorizer)
+    vectors = vectorizer.fit_transform([text for text, _ in train])
+    model = LogisticRegression(max_iter=1000, class_weight='balanced').fit(vectors, [label for _, label in train])
+
+    accuracy = None
+    if test:
+        predictions = model.predict(vectorizer.transform([text for text, _ in test]))
+        accuracy = sum(int(p) == label for p, (_, label) in zip(predictions, test)) / len(test)
+
+    name = args.name or args.vectorizer
+    version = args.version or next_version(registry, name)
+    model_dir = registry.save(name, version, model, vectorizer, threshold=args.threshold,
+                              vectorizer_kind=args.vectorizer, trained_on=len(train),
+                              teacher=args.teacher, held_out_accuracy=accuracy)
+
+    agreement = "agreement with teacher" if args.teacher else "accuracy"
+    result = f"{accuracy:.1%} held-out {agreement}" if accuracy is not None else "no held-out set"
+    print(f"✅ Saved {name}:{version} to {model_dir} ({len(train)} articles, {result})")
+
+
+if __name__ == "__main__":
+    main()
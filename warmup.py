@@ -0,0 +1,27 @@
+import threading
+
+
+def warm_up_in_background(*components):
+    """
+    Load heavy dependencies for several components in a background thread
+
+    Each component's warm_up() is called in order, so the first real request
+    finds groq, scikit-learn and the pickled models already loaded. The UI stays
+    usable meanwhile; anything not warmed yet is still loaded on first use.
+
+    Args:
+        *components: Objects with a warm_up() method
+
+    Returns:
+        threading.Thread: The daemon thread doing the work
+    """
+    def run():
+        for component in components:
+            try:
+                component.warm_up()
+            except Exception as e:
+                print(f"Warm-up failed for {type(component).__name__}: {e}")
+
+    thread = threading.Thread(target=run, name="warm-up", daemon=True)
+    thread.start()
+    return thread